@@ -0,0 +1,71 @@
+"""Micro-benchmark: PEM parsing per call vs. pre-parsed issuer keys.
+
+Times the three hot paths that used to parse the issuer PEM on every call --
+SD-JWT issue, SD-JWT verify, and MEAL append -- once with a fresh PEM parse
+per operation (the old behaviour) and once with IssuerIdentity's cached key
+objects.
+
+Run:  cd services && python benchmarks/bench_issuer_keys.py [iterations]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pancake_services.common.db import Base, make_engine, make_session_factory  # noqa: E402
+from pancake_services.grants import sdjwt  # noqa: E402
+from pancake_services.grants.issuer import IssuerIdentity, generate_keypair_pem  # noqa: E402
+from pancake_services.grants.mealstore import MealStore  # noqa: E402
+
+GEOIDS = [f"{i:064x}" for i in range(3)]
+
+
+def _claims() -> dict:
+    now = int(time.time())
+    return {"iss": "did:web:bench", "sub": "a" * 64, "iat": now, "exp": now + 3600, "jti": "bench"}
+
+
+def _per_op_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int = 2000) -> None:
+    priv, pub = generate_keypair_pem()
+    issuer = IssuerIdentity("did:web:bench", "bench-1", priv, pub)
+    credential = sdjwt.issue(_claims(), GEOIDS, issuer.signing_key, issuer.kid)
+
+    engine = make_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = make_session_factory(engine)()
+
+    def append(identity: IssuerIdentity) -> None:
+        MealStore(identity).append_event(session, "bench", "bench.event", "acct", {"n": 1})
+
+    cases = {
+        "sdjwt.issue": (
+            lambda: sdjwt.issue(_claims(), GEOIDS, priv, issuer.kid),
+            lambda: sdjwt.issue(_claims(), GEOIDS, issuer.signing_key, issuer.kid),
+        ),
+        "sdjwt.verify": (
+            lambda: sdjwt.verify(credential, pub),
+            lambda: sdjwt.verify(credential, issuer.verification_key),
+        ),
+        # A copy of the identity has empty key caches, like the old per-request MealStore.
+        "MEAL append": (lambda: append(replace(issuer)), lambda: append(issuer)),
+    }
+    print(f"{'operation':<14} {'PEM per call':>14} {'cached key':>12} {'saved':>10}   ({iterations} iterations)")
+    for name, (pem, cached) in cases.items():
+        before, after = _per_op_us(pem, iterations), _per_op_us(cached, iterations)
+        print(f"{name:<14} {before:>11.1f} us {after:>9.1f} us {before - after:>7.1f} us")
+    session.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
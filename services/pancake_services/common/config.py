@@ -20,6 +20,18 @@ class Settings:
         )
     )
     hub_url: str = field(default_factory=lambda: os.environ.get("HUB_URL", ""))
+    # Revocation reports per hub request (1 = one POST /revocations each; larger
+    # values need a hub that serves POST /revocations/batch), poll interval and
+    # retry ceiling (seconds) for the background outbox dispatcher.
+    hub_report_batch_size: int = field(
+        default_factory=lambda: int(os.environ.get("HUB_REPORT_BATCH_SIZE", "1"))
+    )
+    hub_report_interval: float = field(
+        default_factory=lambda: float(os.environ.get("HUB_REPORT_INTERVAL", "1.0"))
+    )
+    hub_report_max_backoff: float = field(
+        default_factory=lambda: float(os.environ.get("HUB_REPORT_MAX_BACKOFF", "300"))
+    )
     status_list_uri: str = field(
         default_factory=lambda: os.environ.get(
             "STATUS_LIST_URI", "http://localhost:8100/grants/status-list"
@@ -32,6 +44,28 @@ class Settings:
     status_list_size: int = field(
         default_factory=lambda: int(os.environ.get("STATUS_LIST_SIZE", "65536"))
     )
+    # Status-list indices each worker reserves at a time (one short transaction per block).
+    status_index_block_size: int = field(
+        default_factory=lambda: int(os.environ.get("STATUS_INDEX_BLOCK_SIZE", "256"))
+    )
+    # Seconds a worker's block claim lasts without renewal; blocks of workers that
+    # died without releasing them are reclaimed after this.
+    status_index_lease_seconds: int = field(
+        default_factory=lambda: int(os.environ.get("STATUS_INDEX_LEASE_SECONDS", "900"))
+    )
+    # Status-list shards this issuer may fill before issuance stops. The default keeps
+    # issuance inside the one hub-assigned range; 0 opts in to unlimited rollover.
+    status_list_max_shards: int = field(
+        default_factory=lambda: int(os.environ.get("STATUS_LIST_MAX_SHARDS", "1"))
+    )
+    # Freshness window (seconds) advertised to verifiers polling GET /grants/status-list.
+    status_list_max_age: int = field(
+        default_factory=lambda: int(os.environ.get("STATUS_LIST_MAX_AGE", "60"))
+    )
+    # Largest delta GET /grants/status-list/changes returns before falling back to the full list.
+    status_list_max_delta: int = field(
+        default_factory=lambda: int(os.environ.get("STATUS_LIST_MAX_DELTA", "4096"))
+    )
     # When true, GET /bites for weather_* types requires a valid X-Field-Grant
     # covering the requested GeoID (consent-gated data plane). Off by default so
     # the demo degrades gracefully.
@@ -42,6 +76,22 @@ class Settings:
         in ("1", "true", "yes", "on")
     )
 
+    # Verified X-Field-Grant presentations kept in memory (0 disables the cache).
+    grant_cache_max_entries: int = field(
+        default_factory=lambda: int(os.environ.get("PANCAKE_GRANT_CACHE_ENTRIES", "1024"))
+    )
+    grant_cache_max_bytes: int = field(
+        default_factory=lambda: int(os.environ.get("PANCAKE_GRANT_CACHE_BYTES", str(64 * 1024 * 1024)))
+    )
+    # Worker processes for POST /grants/verify-batch (0 = one per CPU, 1 = in-process).
+    verify_batch_workers: int = field(
+        default_factory=lambda: int(os.environ.get("PANCAKE_VERIFY_WORKERS", "0"))
+    )
+    # Worker processes for MEAL chain verification in the audit API (0 = one per CPU, 1 = in-process).
+    audit_verify_workers: int = field(
+        default_factory=lambda: int(os.environ.get("PANCAKE_AUDIT_WORKERS", "0"))
+    )
+
 
 def load_settings() -> Settings:
     return Settings()
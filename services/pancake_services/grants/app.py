@@ -1,14 +1,55 @@
 """FastAPI application factory for the Pancake grants service."""
 from __future__ import annotations
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI
 
 from pancake_services import __version__
 from pancake_services.common.config import Settings, load_settings
 from pancake_services.common.db import Base, make_engine, make_session_factory
 from pancake_services.grants.auth import JWKSCache, get_current_user
+from pancake_services.grants.grant_cache import VerifiedGrantCache
+from pancake_services.grants.hub_outbox import HubReporter
 from pancake_services.grants.issuer import IssuerIdentity, load_issuer_identity
 from pancake_services.grants.models import User
+from pancake_services.grants.schema import upgrade_schema
+from pancake_services.grants.statuslist_service import StatusIndexAllocator, StatusListShards
+
+
+def _worker_pool(settings: Settings) -> ProcessPoolExecutor | None:
+    """One process pool for the app's CPU-bound batch work, sized for its largest user."""
+    workers = max(
+        settings.verify_batch_workers or os.cpu_count() or 1,
+        settings.audit_verify_workers or os.cpu_count() or 1,
+    )
+    if workers <= 1:
+        return None
+    # Never fork: the server (and the hub reporter) run threads, and a forked
+    # child can deadlock on a lock one of them held at the time.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Created once here, not per request: starting a pool costs full process
+    # startup. Before the reporter thread starts, so no thread of ours is running.
+    app.state.worker_pool = _worker_pool(app.state.settings)
+    reporter = app.state.hub_reporter
+    if reporter is not None:
+        reporter.start()
+    yield
+    if app.state.worker_pool is not None:
+        app.state.worker_pool.shutdown(wait=False, cancel_futures=True)
+        app.state.worker_pool = None
+    if reporter is not None:
+        reporter.stop()
+    # Unused status-list indices reserved by this worker go back to the pool.
+    app.state.index_allocator.release()
 
 
 def create_app(
@@ -27,10 +68,12 @@ def create_app(
             "FieldLists (Merkle ListIDs) + SD-JWT VC grant credentials + "
             "StatusList2021 revocation + MEAL audit ledger."
         ),
+        lifespan=_lifespan,
     )
 
     engine = make_engine(settings.database_url)
     Base.metadata.create_all(engine)
+    upgrade_schema(engine)
 
     app.state.settings = settings
     app.state.engine = engine
@@ -39,10 +82,43 @@ def create_app(
         settings.hub_jwks_url, settings.jwks_cache_ttl_seconds
     )
     app.state.issuer = issuer
+    # Parse the issuer keys once, at startup, instead of on the first request.
+    _ = issuer.signing_key, issuer.verification_key
+    app.state.grant_cache = VerifiedGrantCache(
+        settings.grant_cache_max_entries, settings.grant_cache_max_bytes
+    )
+    app.state.status_lists = StatusListShards(
+        settings.status_list_uri, settings.status_list_size, settings.status_list_index_start
+    )
+    app.state.index_allocator = StatusIndexAllocator(
+        app.state.session_factory,
+        settings.status_list_size,
+        settings.status_list_index_start,
+        settings.status_index_block_size,
+        settings.status_list_max_shards,
+        settings.status_index_lease_seconds,
+    )
+    # Set by the lifespan; without it (no lifespan run) batch work runs in-process.
+    app.state.worker_pool = None
+    app.state.hub_reporter = (
+        HubReporter(
+            app.state.session_factory,
+            settings.hub_url,
+            settings.hub_report_batch_size,
+            settings.hub_report_interval,
+            settings.hub_report_max_backoff,
+        )
+        if settings.hub_url
+        else None
+    )
 
     @app.get("/healthz", tags=["health"])
     def healthz():
-        return {"status": "ok", "service": "pancake-grants", "version": __version__}
+        health = {"status": "ok", "service": "pancake-grants", "version": __version__}
+        if app.state.hub_reporter is not None:
+            health["hub_report_backlog"] = app.state.hub_reporter.backlog()
+            health["hub_report_failed"] = app.state.hub_reporter.failed()
+        return health
 
     @app.get("/healthz/me", tags=["health"])
     def healthz_me(user: User = Depends(get_current_user)):
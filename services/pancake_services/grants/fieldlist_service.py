@@ -0,0 +1,122 @@
+"""FieldList storage helpers shared by the fieldlist and grant routers.
+
+Members carry their Merkle leaf position, written with the list, so a
+GeoID's leaf is one indexed lookup; the tree's levels are persisted on the
+FieldList row (``merkle.MerkleTree.to_bytes``), and proofs slice just the
+nodes they need out of them.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import LargeBinary, func, select
+from sqlalchemy.orm import Session
+
+from pancake_services.grants import merkle
+from pancake_services.grants.models import FieldList, FieldListMember
+
+_SLICES_PER_QUERY = 500  # stays under SQLite's default 2000-column limit
+
+
+def member_rows(geoids: list[str]) -> list[FieldListMember]:
+    """Member rows for the sorted leaves ``geoids``, with their leaf positions."""
+    return [FieldListMember(geoid=g, position=i) for i, g in enumerate(geoids)]
+
+
+def _backfill_positions(db: Session, fieldlist: FieldList) -> list[str]:
+    """Store leaf positions on members written without them; returns the sorted GeoIDs."""
+    members = sorted(
+        db.execute(select(FieldListMember).where(FieldListMember.fieldlist_id == fieldlist.id)).scalars(),
+        key=lambda m: m.geoid,
+    )
+    for position, member in enumerate(members):
+        member.position = position
+    return [m.geoid for m in members]
+
+
+def stored_tree(db: Session, fieldlist: FieldList) -> merkle.MerkleTree:
+    """Restore the list's persisted Merkle levels, building (and storing) them if absent."""
+    rows = db.execute(
+        select(FieldListMember.geoid, FieldListMember.position)
+        .where(FieldListMember.fieldlist_id == fieldlist.id)
+        .order_by(FieldListMember.position)
+    ).all()
+    if any(position is None for _, position in rows):
+        members = _backfill_positions(db, fieldlist)
+    else:
+        members = [geoid for geoid, _ in rows]
+    if fieldlist.merkle_levels is not None:
+        return merkle.MerkleTree.from_bytes(members, fieldlist.merkle_levels)
+    tree = merkle.MerkleTree(members)
+    fieldlist.merkle_levels = tree.to_bytes()
+    return tree
+
+
+def member_position(db: Session, fieldlist: FieldList, geoid: str) -> int | None:
+    """Stored leaf position of ``geoid`` (one (fieldlist_id, geoid) index lookup), or None if absent."""
+    row = db.execute(
+        select(FieldListMember.position).where(
+            FieldListMember.fieldlist_id == fieldlist.id, FieldListMember.geoid == geoid
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    if row.position is None:
+        return _backfill_positions(db, fieldlist).index(geoid)
+    return row.position
+
+
+def member_positions(db: Session, fieldlist: FieldList, geoids: Iterable[str]) -> Dict[str, int]:
+    """Stored leaf positions of the members among ``geoids``; non-members are left out."""
+    wanted = set(geoids)
+    rows = db.execute(
+        select(FieldListMember.geoid, FieldListMember.position).where(
+            FieldListMember.fieldlist_id == fieldlist.id, FieldListMember.geoid.in_(wanted)
+        )
+    ).all()
+    if any(position is None for _, position in rows):
+        members = _backfill_positions(db, fieldlist)
+        return {g: i for i, g in enumerate(members) if g in wanted}
+    return dict(rows)
+
+
+def stored_slices(db: Session, fieldlist: FieldList, spans: list[tuple[int, int]]) -> list:
+    """(offset, length) byte slices of the persisted levels, without reading the whole blob.
+
+    Each slice is None when the list has no persisted levels yet.
+    """
+    slices: list = []
+    for i in range(0, len(spans), _SLICES_PER_QUERY):
+        columns = [
+            func.substr(FieldList.merkle_levels, offset + 1, length, type_=LargeBinary)
+            for offset, length in spans[i:i + _SLICES_PER_QUERY]
+        ]
+        row = db.execute(select(*columns).where(FieldList.id == fieldlist.id)).one()
+        slices.extend(None if value is None else bytes(value) for value in row)
+    return slices
+
+
+def multiproof(db: Session, fieldlist: FieldList, geoids: Iterable[str]) -> Dict[str, Any]:
+    """``merkle.MerkleTree.multiproof`` for ``geoids``, read from the persisted levels.
+
+    Looks up the members' stored positions and slices out only the proof
+    nodes, so the cost follows the proof size rather than the list size.
+    Raises ValueError for a GeoID that is not a member.
+    """
+    wanted = sorted(set(geoids))
+    if not wanted:
+        raise ValueError("a multiproof needs at least one GeoID")
+    positions = member_positions(db, fieldlist, wanted)
+    missing = [g for g in wanted if g not in positions]
+    if missing:
+        raise ValueError(f"GeoID not in list: {missing[0]}")
+    header = stored_slices(db, fieldlist, [(0, merkle.HEADER_SIZE)])[0]
+    if header is None:
+        # Stored before levels were persisted: build them once and keep them.
+        return stored_tree(db, fieldlist).multiproof(wanted)
+    count = merkle.leaf_count(header)
+    indices = sorted(positions.values())
+    path = merkle.multiproof_path(count, indices)
+    spans = [(merkle.node_offset(count, level, i), merkle.NODE_SIZE) for level, i in path]
+    nodes = stored_slices(db, fieldlist, spans) if spans else []
+    return {"leaf_count": count, "indices": indices, "nodes": [node.hex() for node in nodes]}
@@ -0,0 +1,114 @@
+"""Bounded LRU of verified grant credentials.
+
+Relying-party reads (``X-Field-Grant`` on ``GET /bites``) present the same
+credential over and over; re-running ``sdjwt.verify`` for each request costs
+a signature check plus one SHA-256 per disclosure. This cache remembers the
+outcome of a *successful* verification, keyed by the SHA-256 of the exact
+presentation (and, for targeted verification, the GeoIDs it was checked
+for), until the credential's ``exp``. Failures are never cached, and
+revocation is deliberately NOT part of the cached state: callers must still
+check the status list on every hit.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Iterable, Optional
+
+from pancake_services.grants.sdjwt import VerifiedGrant
+
+
+@dataclass(frozen=True)
+class CachedGrant:
+    grant: VerifiedGrant
+    geoids: FrozenSet[str]
+    exp: int
+    size: int  # bytes of the presentation, counted against max_bytes
+
+
+def _key(credential: str, scope: Optional[Iterable[str]]) -> bytes:
+    digest = hashlib.sha256(credential.encode("utf-8"))
+    if scope is not None:
+        # Targeted results never share a key with a full verification, even for an empty scope.
+        digest.update(b"\x01")
+        for geoid in sorted(scope):
+            digest.update(b"\x00" + geoid.encode("utf-8"))
+    return digest.digest()
+
+
+class VerifiedGrantCache:
+    """Thread-safe LRU bounded by entry count and by total presentation bytes."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[bytes, CachedGrant] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: bytes) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def get(
+        self, credential: str, now: Optional[int] = None, scope: Optional[Iterable[str]] = None
+    ) -> Optional[CachedGrant]:
+        now = now if now is not None else int(time.time())
+        key = _key(credential, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now > entry.exp:
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self, credential: str, grant: VerifiedGrant, scope: Optional[Iterable[str]] = None
+    ) -> CachedGrant:
+        """Cache ``grant``; ``scope`` names the GeoIDs a targeted verification covered
+        (None for a full verification)."""
+        entry = CachedGrant(
+            grant=grant,
+            geoids=grant.disclosed_geoid_set,
+            exp=int(grant.claims["exp"]),
+            size=len(credential),
+        )
+        if entry.size > self.max_bytes or self.max_entries <= 0:
+            return entry  # too large to cache; still usable by the caller
+        key = _key(credential, scope)
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+        return entry
+
+    def get_or_verify(
+        self,
+        credential: str,
+        verify: Callable[[str], VerifiedGrant],
+        scope: Optional[Iterable[str]] = None,
+        now: Optional[int] = None,
+    ) -> CachedGrant:
+        """Return the cached verification, or run ``verify`` (which raises on failure) and cache it.
+
+        Pass the GeoIDs as ``scope`` when ``verify`` only checks their
+        disclosures, so a result for one GeoID is never reused for another.
+        ``now`` (epoch seconds) overrides the wall clock for entry expiry.
+        """
+        scope = tuple(scope) if scope is not None else None
+        entry = self.get(credential, now=now, scope=scope)
+        if entry is not None:
+            return entry
+        return self.put(credential, verify(credential), scope)
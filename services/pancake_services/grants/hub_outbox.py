@@ -0,0 +1,164 @@
+"""Asynchronous revocation reporting to the hub registry (transactional outbox).
+
+``enqueue`` writes the report in the same transaction as the revocation, so
+a committed revocation is always eventually reported, and the revoke
+endpoint never waits on the hub. ``HubReporter`` drains the outbox from a
+background thread over one pooled HTTP client, backing off exponentially
+while the hub is failing. A report the hub rejects outright (a 4xx other
+than 408/429) is marked failed and not retried.
+
+Wire format: by default (``batch_size == 1``) each report is POSTed on its
+own to ``{HUB_URL}/revocations`` (the original contract). Batching is
+opt-in for hubs that serve ``{HUB_URL}/revocations/batch``, which takes up
+to ``batch_size`` reports as ``{"revocations": [...]}``.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from pancake_services.grants.models import HubOutbox
+
+logger = logging.getLogger("pancake.grants.hub_outbox")
+
+# 4xx responses worth retrying: the hub timed out or asked us to slow down.
+_RETRYABLE_CLIENT_ERRORS = frozenset({408, 429})
+
+
+def _rejected(error: httpx.HTTPError) -> bool:
+    """True when the hub refused the report itself, so retrying cannot help."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return False
+    status = error.response.status_code
+    return 400 <= status < 500 and status not in _RETRYABLE_CLIENT_ERRORS
+
+
+def enqueue(db: Session, reports: Iterable[Dict[str, Any]]) -> None:
+    """Queue revocation reports in the caller's transaction."""
+    db.add_all(HubOutbox(payload=report) for report in reports)
+
+
+class HubReporter:
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        hub_url: str,
+        batch_size: int = 1,
+        interval: float = 1.0,
+        max_backoff: float = 300.0,
+        client: Optional[httpx.Client] = None,
+    ):
+        self.session_factory = session_factory
+        self.hub_url = hub_url.rstrip("/")
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.client = client or httpx.Client(timeout=10)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def backlog(self) -> int:
+        """Reports not yet accepted by the hub and still being retried."""
+        with self.session_factory() as db:
+            return db.execute(
+                select(func.count()).select_from(HubOutbox).where(
+                    HubOutbox.sent_at.is_(None), HubOutbox.failed_at.is_(None)
+                )
+            ).scalar_one()
+
+    def failed(self) -> int:
+        """Reports the hub rejected; they need operator attention."""
+        with self.session_factory() as db:
+            return db.execute(
+                select(func.count()).select_from(HubOutbox).where(HubOutbox.failed_at.is_not(None))
+            ).scalar_one()
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.max_backoff, self.interval * 2 ** (attempts - 1)))
+
+    def _post(self, payloads: list) -> None:
+        if self.batch_size == 1:
+            for payload in payloads:
+                self.client.post(f"{self.hub_url}/revocations", json=payload).raise_for_status()
+        else:
+            self.client.post(
+                f"{self.hub_url}/revocations/batch", json={"revocations": payloads}
+            ).raise_for_status()
+
+    def drain_once(self, now: Optional[datetime] = None) -> int:
+        """Send one batch of due reports; returns how many the hub accepted."""
+        now = now or datetime.now(timezone.utc)
+        with self.session_factory() as db:
+            rows = db.execute(
+                select(HubOutbox)
+                .where(
+                    HubOutbox.sent_at.is_(None),
+                    HubOutbox.failed_at.is_(None),
+                    HubOutbox.next_attempt_at <= now,
+                )
+                .order_by(HubOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not rows:
+                return 0
+            try:
+                self._post([row.payload for row in rows])
+            except httpx.HTTPError as e:
+                rejected = _rejected(e)
+                for row in rows:
+                    row.attempts += 1
+                    row.last_error = str(e)[:500]
+                    if rejected:
+                        row.failed_at = now
+                    else:
+                        row.next_attempt_at = now + self.backoff(row.attempts)
+                db.commit()
+                if rejected:
+                    logger.error("hub rejected %d revocation report(s), not retrying: %s", len(rows), e)
+                else:
+                    logger.warning("hub revocation report failed (%d queued): %s", len(rows), e)
+                return 0
+            for row in rows:
+                row.sent_at = now
+            db.commit()
+            return len(rows)
+
+    # -- background thread --------------------------------------------------
+
+    def notify(self) -> None:
+        """Wake the dispatcher (new reports were committed)."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Cleared before draining, so a notify() that lands mid-drain triggers another pass.
+            self._wake.clear()
+            try:
+                sent = self.drain_once()
+            except Exception:  # keep the dispatcher alive across DB hiccups
+                logger.exception("hub outbox dispatch failed")
+                sent = 0
+            if sent < self.batch_size:
+                self._wake.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="hub-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.client.close()
@@ -10,9 +10,10 @@ from __future__ import annotations
 import base64
 import os
 from dataclasses import dataclass
+from functools import cached_property
 
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
 
 ENV_KEY = "PANCAKE_ISSUER_KEY"
 ENV_ISSUER_ID = "PANCAKE_ISSUER_ID"
@@ -29,6 +30,31 @@ class IssuerIdentity:
     private_key_pem: bytes
     public_key_pem: bytes
 
+    # Parsed once per identity (the app holds one for the process lifetime) and
+    # passed to sdjwt/MealStore instead of the PEM bytes.
+    @cached_property
+    def signing_key(self) -> Ed25519PrivateKey:
+        key = serialization.load_pem_private_key(self.private_key_pem, password=None)
+        if not isinstance(key, Ed25519PrivateKey):
+            raise ValueError("issuer private key is not an Ed25519 key")
+        return key
+
+    @cached_property
+    def verification_key(self) -> Ed25519PublicKey:
+        return public_key_from_pem(self.public_key_pem)
+
+
+def public_key_from_pem(pem: bytes) -> Ed25519PublicKey:
+    """Parse the issuer public key PEM.
+
+    Key objects do not pickle, so work sent to a process pool carries
+    ``public_key_pem`` and the worker parses it with this.
+    """
+    key = serialization.load_pem_public_key(pem)
+    if not isinstance(key, Ed25519PublicKey):
+        raise ValueError("issuer public key is not an Ed25519 key")
+    return key
+
 
 def _load_private_key(value: str) -> Ed25519PrivateKey:
     value = value.strip()
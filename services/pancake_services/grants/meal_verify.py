@@ -0,0 +1,192 @@
+"""Parallel MEAL chain verification: many chains, and long chains in segments.
+
+Each packet hash covers the *stored* hash of its predecessor, so a chain
+splits into independent segments -- a run of consecutive packets plus the
+stored hash of the packet before it. ``ChainVerifier`` reads every chain in
+keyset-paginated segments, checks them (content hash, packet hash, Ed25519
+signature) in a process pool, and folds the results back in chain order, so
+each chain gets the same verdict as ``MealStore.verify_chain``, including
+the first failing sequence number.
+
+Also a CLI for offline bulk audits of a whole ledger (always a full,
+read-only pass; needs only the issuer public key)::
+
+    python -m pancake_services.grants.meal_verify --database-url sqlite:///pancake.db \\
+        --public-key issuer_public.pem --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from pancake_services.grants.issuer import load_issuer_identity, public_key_from_pem
+from pancake_services.grants.mealstore import MealStore, PacketRow, check_packets, packet_chunks
+from pancake_services.grants.models import Meal
+
+# Packets per segment: large enough to amortize pickling and the per-segment
+# key parse, small enough to spread one long chain over several workers.
+SEGMENT_SIZE = 2048
+
+
+def _check_segment(
+    public_key_pem: bytes, rows: List[PacketRow], previous_hash: Optional[str], first_sequence: int
+) -> Optional[str]:
+    # Runs in a worker process.
+    return check_packets(public_key_from_pem(public_key_pem), rows, previous_hash, first_sequence)
+
+
+def _resolved(value: Optional[str]) -> Future:
+    """An already-completed future, for segments checked in-process."""
+    future: Future = Future()
+    future.set_result(value)
+    return future
+
+
+class ChainVerifier:
+    """Verify many MEAL chains with a process pool.
+
+    With ``store``, chains resume after its latest signed checkpoints like
+    ``MealStore.verify_chain``; without one, every chain is verified in full.
+    Either way nothing is written: checkpoints advance on the append path.
+    ``progress(meal_id, sequence, packet_count)`` is called as each
+    segment's result is folded in.
+
+    Pass a long-lived ``pool`` (the app's shared one) to avoid starting a
+    process pool per call; it is used but never shut down here.
+    """
+
+    def __init__(
+        self,
+        public_key_pem: bytes,
+        workers: int = 0,
+        segment_size: int = SEGMENT_SIZE,
+        store: Optional[MealStore] = None,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+        pool: Optional[Executor] = None,
+    ):
+        self.public_key_pem = public_key_pem
+        self.workers = workers or os.cpu_count() or 1
+        self.segment_size = segment_size
+        self.store = store
+        self.progress = progress
+        self.pool = pool
+
+    def verify_chains(
+        self, db: Session, meal_ids: Sequence[str], full: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """Verdict per chain, as ``MealStore.verify_chain`` would return it.
+
+        Segments are checked in-process when one worker is configured or all
+        pending packets fit in a single segment (a pool would only add startup
+        cost); otherwise at most ``2 * workers`` segments are in flight, on the
+        shared pool if one was given.
+        """
+        starts: Dict[str, Tuple[int, Optional[str]]] = {}
+        for meal_id in meal_ids:
+            checkpoint = None if full or self.store is None else self.store.resume_point(db, meal_id)
+            starts[meal_id] = (
+                (checkpoint.sequence_number, checkpoint.packet_hash) if checkpoint else (0, None)
+            )
+        counts: Dict[str, int] = dict(
+            db.execute(select(Meal.meal_id, Meal.packet_count).where(Meal.meal_id.in_(meal_ids))).all()
+        )
+        pending_packets = sum(max(counts.get(m, 0) - starts[m][0], 0) for m in meal_ids)
+        pool, own_pool = None, False
+        if self.workers > 1 and pending_packets > self.segment_size:
+            pool = self.pool
+            if pool is None:
+                segments = -(-pending_packets // self.segment_size)
+                pool, own_pool = ProcessPoolExecutor(max_workers=min(self.workers, segments)), True
+
+        verdicts: Dict[str, Dict[str, Any]] = {}
+        last: Dict[str, Tuple[int, Optional[str]]] = dict(starts)
+        # (meal_id, result, last sequence, last hash) per segment; result None closes the chain.
+        queue: Deque[Tuple[str, Optional[Future], int, Optional[str]]] = deque()
+
+        def fold() -> None:
+            meal_id, result, sequence, packet_hash = queue.popleft()
+            if meal_id in verdicts:
+                return  # already failed at an earlier segment
+            if result is not None:
+                error = result.result()
+                if error is not None:
+                    verdicts[meal_id] = {"valid": False, "error": error}
+                else:
+                    last[meal_id] = (sequence, packet_hash)
+                    if self.progress is not None:
+                        self.progress(meal_id, sequence, counts.get(meal_id, 0))
+                return
+            verdicts[meal_id] = {
+                "valid": True, "packet_count": last[meal_id][0], "resumed_from": starts[meal_id][0]
+            }
+
+        try:
+            for meal_id in meal_ids:
+                after, previous_hash = starts[meal_id]
+                for rows in packet_chunks(db, meal_id, after, self.segment_size):
+                    if meal_id in verdicts:
+                        break  # failed already: skip the rest of the chain
+                    args = (self.public_key_pem, rows, previous_hash, after + 1)
+                    result = pool.submit(_check_segment, *args) if pool else _resolved(_check_segment(*args))
+                    after, previous_hash = rows[-1].sequence_number, rows[-1].packet_hash
+                    queue.append((meal_id, result, after, previous_hash))
+                    while len(queue) > 2 * self.workers:
+                        fold()
+                queue.append((meal_id, None, after, previous_hash))
+            while queue:
+                fold()
+        finally:
+            if own_pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                for _, result, _, _ in queue:
+                    if result is not None:
+                        result.cancel()
+        return {meal_id: verdicts[meal_id] for meal_id in meal_ids}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from pancake_services.common.config import Settings
+    from pancake_services.common.db import make_engine, make_session_factory
+
+    parser = argparse.ArgumentParser(description="Verify every MEAL chain in a ledger (full, read-only).")
+    parser.add_argument("--database-url", default=None, help="defaults to DATABASE_URL")
+    parser.add_argument("--public-key", default=None,
+                        help="issuer public key PEM file (defaults to the key from PANCAKE_ISSUER_KEY)")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--meal", action="append", default=None, help="verify only this meal_id (repeatable)")
+    parser.add_argument("--progress", action="store_true", help="report per-chain progress on stderr")
+    args = parser.parse_args(argv)
+
+    if args.public_key:
+        with open(args.public_key, "rb") as f:
+            public_key_pem = f.read()
+    else:
+        public_key_pem = load_issuer_identity().public_key_pem
+    engine = make_engine(args.database_url or Settings().database_url)
+    session_factory = make_session_factory(engine)
+
+    def report(meal_id: str, sequence: int, total: int) -> None:
+        print(f"{meal_id}: {sequence}/{total}", file=sys.stderr)
+
+    verifier = ChainVerifier(public_key_pem, workers=args.workers, progress=report if args.progress else None)
+    with session_factory() as db:
+        meal_ids = args.meal or list(db.execute(select(Meal.meal_id).order_by(Meal.meal_id)).scalars())
+        verdicts = verifier.verify_chains(db, meal_ids, full=True)
+    for meal_id, verdict in verdicts.items():
+        print(json.dumps({"meal_id": meal_id, **verdict}))
+    invalid = sum(1 for v in verdicts.values() if not v["valid"])
+    print(f"{len(verdicts)} chains verified, {invalid} invalid", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
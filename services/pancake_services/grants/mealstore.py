@@ -4,23 +4,41 @@ Every consequential event in the grants service (fieldlist created, grant
 issued/retrieved/revoked) is appended as a packet to a per-ListID MEAL:
 hash-chained (SHA-256) and signed with the instance Ed25519 key. This
 closes finding PC-2026-0001 (unsigned packets, broken previous_packet_id).
+
+Chain verification streams packets in keyset-paginated chunks (only the
+previous hash is carried between them, so memory stays flat however long
+the chain) and resumes after the latest signed checkpoint (sequence number,
+packet hash, time): only packets appended since are rehashed and
+signature-checked. Auditors pass ``full=True`` to replay the whole chain
+regardless. Checkpoints are written on the append path: an append that
+takes a MEAL past a multiple of ``CHECKPOINT_INTERVAL`` packets first
+verifies the chain since the last checkpoint and, if it is intact, records
+a new one. Reads never write.
+
+Each MEAL also keeps a Merkle Mountain Range over its packet hashes (mmr.py):
+peaks and a signed root on the ``Meal`` row, internal nodes in
+``meal_mmr_nodes``. ``inclusion_proof`` proves one packet with O(log n)
+hashes; ``verify_packet_proof`` is the auditor-side check.
 """
 from __future__ import annotations
 
 import hashlib
 import json
+from collections import Counter
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from cryptography.exceptions import InvalidSignature
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
-from sqlalchemy import select
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from ulid import ULID
 
+from pancake_services.grants import mmr
 from pancake_services.grants.issuer import IssuerIdentity
-from pancake_services.grants.models import Meal, MealPacket
+from pancake_services.grants.models import Meal, MealCheckpoint, MealMmrNode, MealPacket, MealParticipant
 
 
 def _canonical(obj: Any) -> str:
@@ -54,13 +72,150 @@ def _packet_hash(
     return hashlib.sha256(canonical.encode()).hexdigest()
 
 
+class PacketRow(NamedTuple):
+    """The columns chain verification reads (plain tuple: picklable, no ORM state)."""
+
+    packet_id: str
+    meal_id: str
+    sequence_number: int
+    time_index: datetime
+    author: Dict[str, Any]
+    payload: Dict[str, Any]
+    content_hash: str
+    packet_hash: str
+    signature: Optional[str]
+
+
+PACKET_COLUMNS = tuple(getattr(MealPacket, name) for name in PacketRow._fields)
+
+# Packets read per query while verifying a chain.
+VERIFY_CHUNK = 1000
+
+# An append that takes a MEAL past a multiple of this many packets advances
+# its signed checkpoint, so a later verification replays at most about this
+# many packets (plus one append batch).
+CHECKPOINT_INTERVAL = 256
+
+
+def packet_chunks(
+    db: Session, meal_id: str, after: int = 0, size: int = VERIFY_CHUNK
+) -> Iterator[List[PacketRow]]:
+    """The chain's packets after sequence ``after``, ``size`` at a time (keyset pagination)."""
+    while True:
+        rows = [
+            PacketRow(*row)
+            for row in db.execute(
+                select(*PACKET_COLUMNS)
+                .where(MealPacket.meal_id == meal_id, MealPacket.sequence_number > after)
+                .order_by(MealPacket.sequence_number)
+                .limit(size)
+            )
+        ]
+        if not rows:
+            return
+        yield rows
+        after = rows[-1].sequence_number
+
+
+def check_packets(
+    public_key: Ed25519PublicKey,
+    rows: Iterable[PacketRow],
+    previous_hash: Optional[str],
+    first_sequence: int,
+) -> Optional[str]:
+    """Check consecutive packets starting at ``first_sequence``; the first error, or None.
+
+    ``previous_hash`` is the stored hash of the packet before the first row,
+    so any run of a chain can be checked on its own.
+    """
+    for i, packet in enumerate(rows, start=first_sequence):
+        if packet.sequence_number != i:
+            return f"sequence gap at packet {i}"
+        expected_content = _content_hash(packet.payload)
+        if packet.content_hash != expected_content:
+            return f"content hash mismatch at packet {i}"
+        time_index = packet.time_index
+        if time_index.tzinfo is None:
+            time_index = time_index.replace(tzinfo=timezone.utc)
+        expected_hash = _packet_hash(
+            packet.packet_id,
+            packet.meal_id,
+            packet.sequence_number,
+            time_index.isoformat(),
+            packet.author,
+            packet.content_hash,
+            previous_hash,
+        )
+        if packet.packet_hash != expected_hash:
+            return f"packet hash mismatch at packet {i}"
+        if not packet.signature:
+            return f"missing signature at packet {i}"
+        try:
+            public_key.verify(bytes.fromhex(packet.signature), bytes.fromhex(packet.packet_hash))
+        except InvalidSignature:
+            return f"invalid signature at packet {i}"
+        previous_hash = packet.packet_hash
+    return None
+
+
+def _checkpoint_digest(meal_id: str, sequence_number: int, packet_hash: str, verified_at: datetime) -> bytes:
+    if verified_at.tzinfo is None:
+        verified_at = verified_at.replace(tzinfo=timezone.utc)
+    canonical = _canonical(
+        {
+            "meal_id": meal_id,
+            "sequence_number": sequence_number,
+            "packet_hash": packet_hash,
+            "verified_at": verified_at.isoformat(),
+        }
+    )
+    return hashlib.sha256(canonical.encode()).digest()
+
+
+def mmr_root_digest(meal_id: str, leaf_count: int, mmr_root: str) -> bytes:
+    """What the instance key signs for a MEAL's MMR root."""
+    canonical = _canonical({"meal_id": meal_id, "leaf_count": leaf_count, "mmr_root": mmr_root})
+    return hashlib.sha256(canonical.encode()).digest()
+
+
+def verify_packet_proof(proof: Dict[str, Any], public_key: Ed25519PublicKey) -> bool:
+    """Auditor side: ``proof`` (from ``MealStore.inclusion_proof``) places its
+    ``packet_hash`` in a MEAL whose MMR root the issuer signed."""
+    try:
+        peaks = [bytes.fromhex(p) for p in proof["peaks"]]
+        root = bytes.fromhex(proof["mmr_root"])
+        included = mmr.verify_inclusion(
+            bytes.fromhex(proof["packet_hash"]),
+            int(proof["leaf_index"]),
+            int(proof["leaf_count"]),
+            proof["siblings"],
+            peaks,
+            root,
+        )
+        if not included:
+            return False
+        digest = mmr_root_digest(proof["meal_id"], int(proof["leaf_count"]), proof["mmr_root"])
+        public_key.verify(bytes.fromhex(proof["signature"]), digest)
+    except (KeyError, TypeError, ValueError, InvalidSignature):
+        return False
+    return True
+
+
+class MealEvent(NamedTuple):
+    """One event for ``MealStore.append_events``."""
+
+    meal_key: str
+    event_type: str
+    author_account: str
+    payload: Dict[str, Any]
+    geoid: Optional[str] = None
+    meal_type: str = "grant_lifecycle"
+
+
 class MealStore:
     def __init__(self, issuer: IssuerIdentity):
         self._issuer = issuer
-        self._signing_key = serialization.load_pem_private_key(
-            issuer.private_key_pem, password=None
-        )
-        assert isinstance(self._signing_key, Ed25519PrivateKey)
+        self._signing_key = issuer.signing_key
 
     # -- write path ---------------------------------------------------------
 
@@ -79,62 +234,237 @@ class MealStore:
         meal_key is a stable business key (we use the ListID); the MEAL row
         is created on first use.
         """
-        meal = db.execute(select(Meal).where(Meal.primary_geoid == meal_key)).scalar_one_or_none()
+        event = MealEvent(meal_key, event_type, author_account, payload, geoid, meal_type)
+        return self.append_events(db, [event])[0]
+
+    def append_events(self, db: Session, events: Iterable[MealEvent]) -> List[MealPacket]:
+        """Append ``events`` in order, as one batch.
+
+        The MEAL rows are read in one query and updated once each, packets
+        and participants are inserted in bulk, and each MEAL's MMR root is
+        signed once for the batch. A MEAL the batch takes past a multiple of
+        ``CHECKPOINT_INTERVAL`` packets is verified up to its current tip and
+        checkpointed first. Flushed, committed by the caller.
+        """
+        events = list(events)
+        if not events:
+            return []
+        batch_sizes = Counter(e.meal_key for e in events)
+        meals = {
+            meal.primary_geoid: meal
+            for meal in db.execute(
+                select(Meal).where(Meal.primary_geoid.in_({e.meal_key for e in events}))
+            ).scalars()
+        }
         now = datetime.now(timezone.utc)
-        if meal is None:
-            meal = Meal(
-                meal_id=str(ULID()),
-                meal_type=meal_type,
-                primary_geoid=meal_key,
-                participant_agents=[],
-                packet_count=0,
-            )
-            db.add(meal)
-            db.flush()
+        time_index = now.isoformat()
+        peaks: Dict[str, List[bytes]] = {}
+        participants: Dict[Tuple[str, str], datetime] = {}
+        packets: List[MealPacket] = []
+        nodes: List[MealMmrNode] = []
 
-        participants = list(meal.participant_agents or [])
-        if author_account not in [p.get("agent_id") for p in participants]:
-            participants.append(
-                {"agent_id": author_account, "agent_type": "human", "joined_at": now.isoformat()}
+        for event in events:
+            meal = meals.get(event.meal_key)
+            if meal is None:
+                meal = Meal(
+                    meal_id=str(ULID()),
+                    meal_type=event.meal_type,
+                    primary_geoid=event.meal_key,
+                    packet_count=0,
+                )
+                db.add(meal)
+                meals[event.meal_key] = meal
+            if meal.meal_id not in peaks:
+                peaks[meal.meal_id] = self._mmr_peaks(db, meal)
+                if meal.packet_count and meal.last_packet_id is None:
+                    meal.last_packet_id = self._last_packet_id(db, meal)  # written before it was stored
+                count = meal.packet_count
+                if count and (count + batch_sizes[event.meal_key]) // CHECKPOINT_INTERVAL > (
+                    count // CHECKPOINT_INTERVAL
+                ):
+                    self.verify_chain(db, meal.meal_id)
+            participants.setdefault((meal.meal_id, event.author_account), now)
+
+            sequence_number = meal.packet_count + 1
+            packet_id = str(ULID())
+            author = {"agent_id": event.author_account, "agent_type": "human"}
+            body = {"event_type": event.event_type, **event.payload}
+            content_hash = _content_hash(body)
+            previous_hash = meal.last_packet_hash
+            packet_hash = _packet_hash(
+                packet_id, meal.meal_id, sequence_number, time_index, author, content_hash, previous_hash
+            )
+            signature = self._signing_key.sign(bytes.fromhex(packet_hash)).hex()
+            peaks[meal.meal_id], created = mmr.append(
+                peaks[meal.meal_id], meal.packet_count, bytes.fromhex(packet_hash)
+            )
+            nodes.extend(
+                MealMmrNode(meal_id=meal.meal_id, height=h, node_index=i, hash=node.hex())
+                for h, i, node in created
+            )
+            packets.append(
+                MealPacket(
+                    packet_id=packet_id,
+                    meal_id=meal.meal_id,
+                    packet_type="sip",
+                    sequence_number=sequence_number,
+                    previous_packet_id=meal.last_packet_id,
+                    previous_packet_hash=previous_hash,
+                    time_index=now,
+                    geoid=event.geoid,
+                    author=author,
+                    payload=body,
+                    content_hash=content_hash,
+                    packet_hash=packet_hash,
+                    signature=signature,
+                )
             )
-            meal.participant_agents = participants
 
-        sequence_number = meal.packet_count + 1
-        packet_id = str(ULID())
-        time_index = now.isoformat()
-        author = {"agent_id": author_account, "agent_type": "human"}
-        body = {"event_type": event_type, **payload}
-        content_hash = _content_hash(body)
-        previous_hash = meal.last_packet_hash
-        packet_hash = _packet_hash(
-            packet_id, meal.meal_id, sequence_number, time_index, author, content_hash, previous_hash
+            meal.packet_count = sequence_number
+            meal.last_packet_hash = packet_hash
+            meal.last_packet_id = packet_id
+            meal.last_updated_time = now
+            if sequence_number == 1:
+                meal.root_hash = packet_hash
+
+        for meal in meals.values():
+            if meal.meal_id in peaks:
+                self._set_mmr(meal, peaks[meal.meal_id], meal.packet_count)
+        db.add_all(packets)
+        db.add_all(nodes)
+        db.flush()
+        self.add_participants(db, participants)
+        return packets
+
+    @staticmethod
+    def add_participants(db: Session, participants: Dict[Tuple[str, str], datetime]) -> None:
+        """Insert (meal, agent) pairs not yet registered; existing ones are left as they are."""
+        rows = [
+            {"meal_id": meal_id, "agent_id": agent_id, "agent_type": "human", "joined_at": joined_at}
+            for (meal_id, agent_id), joined_at in participants.items()
+        ]
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+            db.execute(
+                insert(MealParticipant)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["meal_id", "agent_id"])
+            )
+            return
+        known = set(
+            db.execute(
+                select(MealParticipant.meal_id, MealParticipant.agent_id).where(
+                    MealParticipant.meal_id.in_({meal_id for meal_id, _ in participants})
+                )
+            ).tuples()
         )
-        signature = self._signing_key.sign(bytes.fromhex(packet_hash)).hex()
-
-        packet = MealPacket(
-            packet_id=packet_id,
-            meal_id=meal.meal_id,
-            packet_type="sip",
-            sequence_number=sequence_number,
-            previous_packet_id=self._last_packet_id(db, meal) if meal.packet_count else None,
-            previous_packet_hash=previous_hash,
-            time_index=now,
-            geoid=geoid,
-            author=author,
-            payload=body,
-            content_hash=content_hash,
-            packet_hash=packet_hash,
-            signature=signature,
+        db.add_all(MealParticipant(**row) for row in rows if (row["meal_id"], row["agent_id"]) not in known)
+        db.flush()
+
+    # -- Merkle Mountain Range ----------------------------------------------
+
+    def _mmr_peaks(self, db: Session, meal: Meal) -> List[bytes]:
+        if meal.mmr_peaks is None and meal.packet_count:
+            self._rebuild_mmr(db, meal)
+        return [bytes.fromhex(p) for p in meal.mmr_peaks or []]
+
+    def _set_mmr(self, meal: Meal, peaks: List[bytes], leaf_count: int) -> None:
+        meal.mmr_peaks = [p.hex() for p in peaks]
+        meal.mmr_root = mmr.root(peaks, leaf_count).hex() if peaks else None
+        meal.mmr_root_signature = (
+            self._signing_key.sign(mmr_root_digest(meal.meal_id, leaf_count, meal.mmr_root)).hex()
+            if peaks
+            else None
         )
-        db.add(packet)
 
-        meal.packet_count = sequence_number
-        meal.last_packet_hash = packet_hash
-        meal.last_updated_time = now
-        if sequence_number == 1:
-            meal.root_hash = packet_hash
+    @staticmethod
+    def _mmr_from_packets(db: Session, meal_id: str) -> Tuple[List[bytes], int, Dict[Tuple[int, int], bytes]]:
+        """(peaks, leaf count, internal nodes) of a MEAL's MMR, recomputed from its packets."""
+        peaks: List[bytes] = []
+        nodes: Dict[Tuple[int, int], bytes] = {}
+        count = 0
+        for rows in packet_chunks(db, meal_id):
+            for row in rows:
+                peaks, created = mmr.append(peaks, count, bytes.fromhex(row.packet_hash))
+                nodes.update(((h, i), node) for h, i, node in created)
+                count += 1
+        return peaks, count, nodes
+
+    def _rebuild_mmr(self, db: Session, meal: Meal) -> None:
+        """Backfill the MMR of a MEAL written before it was maintained (append path)."""
+        peaks, count, nodes = self._mmr_from_packets(db, meal.meal_id)
+        db.execute(delete(MealMmrNode).where(MealMmrNode.meal_id == meal.meal_id))
+        db.add_all(
+            MealMmrNode(meal_id=meal.meal_id, height=h, node_index=i, hash=node.hex())
+            for (h, i), node in nodes.items()
+        )
+        self._set_mmr(meal, peaks, count)
         db.flush()
-        return packet
+
+    def inclusion_proof(self, db: Session, packet_id: str) -> Optional[Dict[str, Any]]:
+        """O(log n) proof that ``packet_id`` is in its MEAL, against the signed MMR root.
+
+        None if the packet does not exist. Read-only: a MEAL whose MMR was
+        never stored (written before it was maintained) gets its proof from
+        an MMR recomputed in memory, signed for this response; the next
+        append to it stores the MMR.
+        """
+        packet = db.execute(
+            select(MealPacket.meal_id, MealPacket.sequence_number, MealPacket.packet_hash).where(
+                MealPacket.packet_id == packet_id
+            )
+        ).one_or_none()
+        if packet is None:
+            return None
+        meal = db.execute(select(Meal).where(Meal.meal_id == packet.meal_id)).scalar_one()
+        stored = meal.mmr_peaks is not None and (
+            len(meal.mmr_peaks) == len(mmr.peak_heights(meal.packet_count))
+        )
+        if stored:
+            leaf_count, peaks = meal.packet_count, list(meal.mmr_peaks)
+            mmr_root, signature = meal.mmr_root, meal.mmr_root_signature
+        else:
+            built_peaks, leaf_count, built = self._mmr_from_packets(db, meal.meal_id)
+            peaks = [p.hex() for p in built_peaks]
+            mmr_root = mmr.root(built_peaks, leaf_count).hex()
+            signature = self._signing_key.sign(mmr_root_digest(meal.meal_id, leaf_count, mmr_root)).hex()
+        leaf_index = packet.sequence_number - 1
+        _, path = mmr.proof_path(leaf_count, leaf_index)
+
+        nodes: Dict[Tuple[int, int], str] = {}
+        if path:
+            leaf_sibling = path[0][1]
+            nodes[(0, leaf_sibling)] = db.execute(
+                select(MealPacket.packet_hash).where(
+                    MealPacket.meal_id == meal.meal_id, MealPacket.sequence_number == leaf_sibling + 1
+                )
+            ).scalar_one()
+        if len(path) > 1 and not stored:
+            nodes.update({(h, i): built[(h, i)].hex() for h, i, _ in path[1:]})
+        elif len(path) > 1:
+            rows = db.execute(
+                select(MealMmrNode.height, MealMmrNode.node_index, MealMmrNode.hash).where(
+                    MealMmrNode.meal_id == meal.meal_id,
+                    or_(*(
+                        and_(MealMmrNode.height == h, MealMmrNode.node_index == i) for h, i, _ in path[1:]
+                    )),
+                )
+            )
+            nodes.update({(h, i): node for h, i, node in rows})
+        return {
+            "packet_id": packet_id,
+            "meal_id": meal.meal_id,
+            "sequence_number": packet.sequence_number,
+            "packet_hash": packet.packet_hash,
+            "leaf_index": leaf_index,
+            "leaf_count": leaf_count,
+            "siblings": [{"sibling": nodes[(h, i)], "position": position} for h, i, position in path],
+            "peaks": peaks,
+            "mmr_root": mmr_root,
+            "signature": signature,
+            "kid": self._issuer.kid,
+        }
 
     @staticmethod
     def _last_packet_id(db: Session, meal: Meal) -> Optional[str]:
@@ -148,45 +478,82 @@ class MealStore:
 
     # -- verify path --------------------------------------------------------
 
-    def verify_chain(self, db: Session, meal_id: str) -> Dict[str, Any]:
-        """Recompute the hash chain and check every packet signature."""
-        packets: List[MealPacket] = list(
-            db.execute(
-                select(MealPacket)
-                .where(MealPacket.meal_id == meal_id)
-                .order_by(MealPacket.sequence_number)
-            ).scalars()
+    def resume_point(self, db: Session, meal_id: str) -> Optional[MealCheckpoint]:
+        """Latest checkpoint that is validly signed and still matches its anchor packet."""
+        checkpoint = db.execute(
+            select(MealCheckpoint)
+            .where(MealCheckpoint.meal_id == meal_id)
+            .order_by(MealCheckpoint.sequence_number.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        if checkpoint is None:
+            return None
+        digest = _checkpoint_digest(
+            meal_id, checkpoint.sequence_number, checkpoint.packet_hash, checkpoint.verified_at
         )
-        public_key = serialization.load_pem_public_key(self._issuer.public_key_pem)
-        assert isinstance(public_key, Ed25519PublicKey)
-
-        previous_hash: Optional[str] = None
-        for i, packet in enumerate(packets):
-            if packet.sequence_number != i + 1:
-                return {"valid": False, "error": f"sequence gap at packet {i + 1}"}
-            expected_content = _content_hash(packet.payload)
-            if packet.content_hash != expected_content:
-                return {"valid": False, "error": f"content hash mismatch at packet {i + 1}"}
-            time_index = packet.time_index
-            if time_index.tzinfo is None:
-                time_index = time_index.replace(tzinfo=timezone.utc)
-            expected_hash = _packet_hash(
-                packet.packet_id,
-                packet.meal_id,
-                packet.sequence_number,
-                time_index.isoformat(),
-                packet.author,
-                packet.content_hash,
-                previous_hash,
+        try:
+            self._issuer.verification_key.verify(bytes.fromhex(checkpoint.signature), digest)
+        except (InvalidSignature, ValueError):
+            return None  # unusable (e.g. signed by a rotated key): verify from packet 1
+        anchor = db.execute(
+            select(MealPacket.packet_hash).where(
+                MealPacket.meal_id == meal_id,
+                MealPacket.sequence_number == checkpoint.sequence_number,
             )
-            if packet.packet_hash != expected_hash:
-                return {"valid": False, "error": f"packet hash mismatch at packet {i + 1}"}
-            if not packet.signature:
-                return {"valid": False, "error": f"missing signature at packet {i + 1}"}
-            try:
-                public_key.verify(bytes.fromhex(packet.signature), bytes.fromhex(packet.packet_hash))
-            except InvalidSignature:
-                return {"valid": False, "error": f"invalid signature at packet {i + 1}"}
-            previous_hash = packet.packet_hash
-
-        return {"valid": True, "packet_count": len(packets)}
+        ).scalar_one_or_none()
+        return checkpoint if anchor == checkpoint.packet_hash else None
+
+    def checkpoint(self, db: Session, meal_id: str, sequence_number: int, packet_hash: str) -> None:
+        """Record (or, after a full re-verification, re-sign) the checkpoint at ``sequence_number``."""
+        checkpoint = db.execute(
+            select(MealCheckpoint).where(
+                MealCheckpoint.meal_id == meal_id, MealCheckpoint.sequence_number == sequence_number
+            )
+        ).scalar_one_or_none()
+        if checkpoint is None:
+            checkpoint = MealCheckpoint(meal_id=meal_id, sequence_number=sequence_number)
+            db.add(checkpoint)
+        checkpoint.packet_hash = packet_hash
+        checkpoint.verified_at = datetime.now(timezone.utc)
+        digest = _checkpoint_digest(meal_id, sequence_number, packet_hash, checkpoint.verified_at)
+        checkpoint.signature = self._signing_key.sign(digest).hex()
+        db.flush()
+
+    def verify_chain(
+        self,
+        db: Session,
+        meal_id: str,
+        full: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+        chunk_size: int = VERIFY_CHUNK,
+    ) -> Dict[str, Any]:
+        """Recompute the hash chain and check every packet signature.
+
+        Resumes after the latest signed checkpoint unless ``full``; a clean
+        pass that reached new packets records a fresh checkpoint (flushed,
+        committed by the caller). The append path uses it for that; read
+        endpoints verify with the read-only ``meal_verify.ChainVerifier``.
+        ``resumed_from`` in the result is the sequence number verification
+        started after (0 for a full pass).
+        ``progress(sequence, packet_count)`` is called after each chunk.
+        """
+        checkpoint = None if full else self.resume_point(db, meal_id)
+        base = checkpoint.sequence_number if checkpoint is not None else 0
+        previous_hash = checkpoint.packet_hash if checkpoint is not None else None
+        total = 0
+        if progress is not None:
+            total = db.execute(select(Meal.packet_count).where(Meal.meal_id == meal_id)).scalar() or 0
+        public_key = self._issuer.verification_key
+
+        sequence = base
+        for rows in packet_chunks(db, meal_id, base, chunk_size):
+            error = check_packets(public_key, rows, previous_hash, sequence + 1)
+            if error is not None:
+                return {"valid": False, "error": error}
+            sequence, previous_hash = rows[-1].sequence_number, rows[-1].packet_hash
+            if progress is not None:
+                progress(sequence, total)
+
+        if sequence > base:
+            self.checkpoint(db, meal_id, sequence, previous_hash)
+        return {"valid": True, "packet_count": sequence, "resumed_from": base}
@@ -4,11 +4,31 @@ A FieldList's identifier (ListID) is the hex Merkle root over its member
 GeoIDs: leaves are SHA-256 of the UTF-8 GeoID strings in lexicographic
 order, parents are SHA-256(left || right), and an odd node is promoted
 unchanged to the next level.
+
+``MerkleTree`` keeps every level in memory (and serializes them for the
+``fieldlists.merkle_levels`` column) so membership edits reuse the stored
+leaf digests and the parents left of the first edited position.
+
+``parallel_merkle_root`` and ``merkle_root_from_file`` build the same root
+for very large lists by hashing power-of-two-aligned chunks of leaves in a
+process pool: with odd-node promotion, the first ``log2(chunk_size)``
+levels never pair nodes across chunk boundaries, so each chunk reduces to
+its own subtree root and only those roots are combined at the top.
 """
 from __future__ import annotations
 
 import hashlib
-from typing import Dict, List
+import os
+import struct
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+NODE_SIZE = 32  # SHA-256 digest length
+DEFAULT_CHUNK_SIZE = 1 << 16  # leaves per parallel subtree; must be a power of two
+_COUNT = struct.Struct(">I")  # leaf-count header of the serialized levels
+HEADER_SIZE = _COUNT.size
 
 
 def _sha256(data: bytes) -> bytes:
@@ -22,19 +42,225 @@ def canonical_members(geoids: List[str]) -> List[str]:
     return sorted(set(geoids))
 
 
+def _parent_level(level: List[bytes]) -> List[bytes]:
+    nxt = []
+    for i in range(0, len(level) - 1, 2):
+        nxt.append(_sha256(level[i] + level[i + 1]))
+    if len(level) % 2 == 1:
+        nxt.append(level[-1])  # odd node promoted unchanged
+    return nxt
+
+
 def _levels(members: List[str]) -> List[List[bytes]]:
     """Build all tree levels, leaves first."""
     level = [_sha256(g.encode("utf-8")) for g in members]
     levels = [level]
     while len(level) > 1:
-        nxt = []
-        for i in range(0, len(level) - 1, 2):
+        level = _parent_level(level)
+        levels.append(level)
+    return levels
+
+
+def _level_sizes(leaf_count: int) -> List[int]:
+    """Node count of every level for a tree with ``leaf_count`` leaves, leaves first."""
+    sizes = [leaf_count]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def leaf_count(data: bytes) -> int:
+    """Leaf count from the header of ``MerkleTree.to_bytes()`` output."""
+    return _COUNT.unpack_from(data)[0]
+
+
+def node_offset(leaf_count: int, level: int, index: int) -> int:
+    """Byte offset of node ``index`` of ``level`` within ``MerkleTree.to_bytes()`` output."""
+    return HEADER_SIZE + (sum(_level_sizes(leaf_count)[:level]) + index) * NODE_SIZE
+
+
+def proof_path(leaf_count: int, index: int) -> List[Tuple[int, int, str]]:
+    """(level, sibling index, sibling position) of every proof step for leaf ``index``.
+
+    Depends only on the tree shape, so callers holding serialized levels can
+    slice out just these nodes instead of restoring the whole tree.
+    """
+    path: List[Tuple[int, int, str]] = []
+    for level, size in enumerate(_level_sizes(leaf_count)[:-1]):
+        if index % 2 == 1:
+            path.append((level, index - 1, "left"))
+        elif index + 1 < size:
+            path.append((level, index + 1, "right"))
+        # else: unpaired node promoted, no step at this level.
+        index //= 2
+    return path
+
+
+def multiproof_path(leaf_count: int, indices: Sequence[int]) -> List[Tuple[int, int]]:
+    """(level, index) of every node a multiproof for the sorted leaf ``indices`` carries.
+
+    Siblings derivable from the proven leaves are omitted, so upper levels
+    shared by several leaves are sent once. The order is the order in which
+    ``verify_multiproof`` consumes them.
+    """
+    path: List[Tuple[int, int]] = []
+    known = list(indices)
+    for level, size in enumerate(_level_sizes(leaf_count)[:-1]):
+        parents: List[int] = []
+        k = 0
+        while k < len(known):
+            i = known[k]
+            if i % 2 == 1:
+                path.append((level, i - 1))
+            elif k + 1 < len(known) and known[k + 1] == i + 1:
+                k += 1  # both children proven
+            elif i + 1 < size:
+                path.append((level, i + 1))
+            parents.append(i // 2)
+            k += 1
+        known = parents
+    return path
+
+
+def _rebuild_from(levels: List[List[bytes]], start: int) -> List[List[bytes]]:
+    """Recompute the parents above leaf position ``start`` and everything right of it.
+
+    ``levels[0]`` must already hold the edited leaves and every leaf left of
+    ``start`` must be unchanged. Parents whose children both sit left of the
+    edit are reused as-is; the rest of each level is re-paired, which keeps
+    odd-node promotion identical to ``_levels``.
+    """
+    level = levels[0]
+    rebuilt = [level]
+    depth = 0
+    while len(level) > 1:
+        start //= 2
+        previous = levels[depth + 1] if depth + 1 < len(levels) else []
+        nxt = previous[:start]
+        for i in range(2 * start, len(level) - 1, 2):
             nxt.append(_sha256(level[i] + level[i + 1]))
         if len(level) % 2 == 1:
             nxt.append(level[-1])  # odd node promoted unchanged
-        levels.append(nxt)
+        rebuilt.append(nxt)
         level = nxt
-    return levels
+        depth += 1
+    return rebuilt
+
+
+class MerkleTree:
+    """A ListID tree that can absorb membership edits without rehashing the whole list.
+
+    Leaves stay in canonical order, so inserting or removing a GeoID shifts
+    every leaf to its right and changes their pairing: an edit at leaf
+    position ``i`` costs ``n - i`` parent hashes, and no leaf is ever rehashed
+    except the inserted ones.
+    """
+
+    def __init__(self, geoids: Iterable[str]):
+        self.members = canonical_members(list(geoids))
+        self.levels = _levels(self.members)
+
+    @classmethod
+    def from_bytes(cls, members: Sequence[str], data: bytes) -> "MerkleTree":
+        """Restore a tree from sorted ``members`` and ``to_bytes()`` output (no hashing)."""
+        count = leaf_count(data)
+        if count != len(members):
+            raise ValueError(f"serialized tree has {count} leaves, expected {len(members)}")
+        tree = cls.__new__(cls)
+        tree.members = list(members)
+        tree.levels = []
+        offset = HEADER_SIZE
+        for size in _level_sizes(count):
+            end = offset + size * NODE_SIZE
+            tree.levels.append([data[i:i + NODE_SIZE] for i in range(offset, end, NODE_SIZE)])
+            offset = end
+        if offset != len(data):
+            raise ValueError("serialized tree has trailing bytes")
+        return tree
+
+    def copy(self) -> "MerkleTree":
+        tree = MerkleTree.__new__(MerkleTree)
+        tree.members = list(self.members)
+        tree.levels = [list(level) for level in self.levels]
+        return tree
+
+    def to_bytes(self) -> bytes:
+        """Compact form: 4-byte big-endian leaf count, then every level's nodes, leaves first."""
+        return _COUNT.pack(len(self.members)) + b"".join(b"".join(level) for level in self.levels)
+
+    @property
+    def list_id(self) -> str:
+        return self.levels[-1][0].hex()
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __contains__(self, geoid: object) -> bool:
+        i = bisect_left(self.members, geoid)
+        return i < len(self.members) and self.members[i] == geoid
+
+    def index(self, geoid: str) -> int:
+        """Leaf position of ``geoid`` (binary search over the sorted members)."""
+        i = bisect_left(self.members, geoid)
+        if i == len(self.members) or self.members[i] != geoid:
+            raise ValueError(f"GeoID not in list: {geoid}")
+        return i
+
+    def inclusion_proof(self, geoid: str) -> List[Dict[str, str]]:
+        return [
+            {"sibling": self.levels[level][i].hex(), "position": position}
+            for level, i, position in proof_path(len(self.members), self.index(geoid))
+        ]
+
+    def multiproof(self, geoids: Iterable[str]) -> Dict[str, Any]:
+        """One proof for several members: {leaf_count, indices, nodes}.
+
+        ``indices`` are the leaf positions of the sorted, deduplicated
+        ``geoids``; ``nodes`` are the hex siblings from ``multiproof_path``.
+        """
+        indices = sorted({self.index(g) for g in geoids})
+        if not indices:
+            raise ValueError("a multiproof needs at least one GeoID")
+        nodes = [self.levels[level][i].hex() for level, i in multiproof_path(len(self), indices)]
+        return {"leaf_count": len(self), "indices": indices, "nodes": nodes}
+
+    def update(
+        self, add: Iterable[str] = (), remove: Iterable[str] = ()
+    ) -> Tuple[List[str], List[str]]:
+        """Apply a membership edit in place; returns the (added, removed) GeoIDs.
+
+        Adding an existing member is a no-op (duplicates are removed by the
+        canonical ordering rule). Removing a non-member, naming a GeoID in
+        both sets, or emptying the list raises ValueError and leaves the tree
+        untouched.
+        """
+        add_set, remove_set = set(add), set(remove)
+        if add_set & remove_set:
+            raise ValueError("a GeoID cannot be both added and removed")
+        missing = sorted(g for g in remove_set if g not in self)
+        if missing:
+            raise ValueError(f"GeoID not in list: {missing[0]}")
+        added = sorted(g for g in add_set if g not in self)
+        removed = sorted(remove_set)
+        if len(self.members) + len(added) - len(removed) < 1:
+            raise ValueError("a FieldList must contain at least one GeoID")
+        if not added and not removed:
+            return [], []
+
+        leaves = self.levels[0]
+        for geoid in reversed(removed):
+            i = bisect_left(self.members, geoid)
+            del self.members[i]
+            del leaves[i]
+        for geoid in added:
+            i = bisect_left(self.members, geoid)
+            self.members.insert(i, geoid)
+            leaves.insert(i, _sha256(geoid.encode("utf-8")))
+
+        # Every leaf before the smallest edited GeoID kept its position.
+        start = bisect_left(self.members, min(added + removed))
+        self.levels = _rebuild_from(self.levels, start)
+        return added, removed
 
 
 def merkle_root(geoids: List[str]) -> str:
@@ -43,26 +269,91 @@ def merkle_root(geoids: List[str]) -> str:
     return _levels(members)[-1][0].hex()
 
 
+def _subtree_root(members: List[str]) -> bytes:
+    """Root of one aligned chunk of sorted members (process-pool worker)."""
+    return _levels(members)[-1][0]
+
+
+def _root_from_nodes(level: List[bytes]) -> bytes:
+    while len(level) > 1:
+        level = _parent_level(level)
+    return level[0]
+
+
+def _chunk_roots(chunks: Iterable[List[str]], workers: Optional[int]) -> List[bytes]:
+    """Subtree roots of consecutive chunks, in order.
+
+    At most ``2 * workers`` chunks are in flight, so a lazy ``chunks``
+    iterable is never materialized. ``workers=1`` hashes in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [_subtree_root(chunk) for chunk in chunks]
+    roots: List[bytes] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_subtree_root, chunk))
+            if len(pending) >= 2 * workers:
+                roots.append(pending.popleft().result())
+        roots.extend(future.result() for future in pending)
+    return roots
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    if chunk_size < 1 or chunk_size & (chunk_size - 1):
+        raise ValueError("chunk_size must be a power of two")
+
+
+def parallel_merkle_root(
+    geoids: List[str], workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> str:
+    """``merkle_root`` with the leaf chunks hashed across a process pool."""
+    _check_chunk_size(chunk_size)
+    members = canonical_members(geoids)
+    if len(members) <= chunk_size:
+        return _subtree_root(members).hex()
+    chunks = (members[i:i + chunk_size] for i in range(0, len(members), chunk_size))
+    return _root_from_nodes(_chunk_roots(chunks, workers)).hex()
+
+
+def _sorted_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    previous: Optional[str] = None
+    for line in lines:
+        geoid = line.strip()
+        if not geoid or geoid == previous:
+            continue  # blank line or duplicate
+        if previous is not None and geoid < previous:
+            raise ValueError(f"GeoIDs are not in sorted order at {geoid!r}")
+        chunk.append(geoid)
+        previous = geoid
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if previous is None:
+        raise ValueError("a FieldList must contain at least one GeoID")
+    if chunk:
+        yield chunk
+
+
+def merkle_root_from_file(
+    path: str, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> str:
+    """Streaming ListID over a file of GeoIDs, one per line, already in canonical order.
+
+    The file must be sorted byte-wise (e.g. ``LC_ALL=C sort -u``); only the
+    in-flight chunks and one digest per chunk are held in memory.
+    """
+    _check_chunk_size(chunk_size)
+    with open(path, encoding="utf-8") as lines:
+        roots = _chunk_roots(_sorted_chunks(lines, chunk_size), workers)
+    return _root_from_nodes(roots).hex()
+
+
 def inclusion_proof(geoids: List[str], geoid: str) -> List[Dict[str, str]]:
     """Build an inclusion proof (list of {sibling, position} steps) for one GeoID."""
-    members = canonical_members(geoids)
-    if geoid not in members:
-        raise ValueError(f"GeoID not in list: {geoid}")
-    levels = _levels(members)
-    index = members.index(geoid)
-    proof: List[Dict[str, str]] = []
-    for level in levels[:-1]:
-        pair_start = index - (index % 2)
-        if pair_start + 1 < len(level):
-            if index % 2 == 0:
-                proof.append({"sibling": level[index + 1].hex(), "position": "right"})
-            else:
-                proof.append({"sibling": level[index - 1].hex(), "position": "left"})
-            index = pair_start // 2
-        else:
-            # Unpaired node promoted: no step at this level.
-            index = index // 2
-    return proof
+    return MerkleTree(geoids).inclusion_proof(geoid)
 
 
 def verify_inclusion(geoid: str, proof: List[Dict[str, str]], list_id: str) -> bool:
@@ -77,3 +368,89 @@ def verify_inclusion(geoid: str, proof: List[Dict[str, str]], list_id: str) -> b
         else:
             return False
     return node.hex() == list_id
+
+
+def verify_multiproof(geoids: List[str], proof: Dict[str, Any], list_id: str) -> bool:
+    """Verify a multiproof: every GeoID in ``geoids`` is a member of ``list_id``."""
+    try:
+        count = int(proof["leaf_count"])
+        indices = [int(i) for i in proof["indices"]]
+        nodes = iter([bytes.fromhex(n) for n in proof["nodes"]])
+    except (KeyError, TypeError, ValueError):
+        return False
+    members = sorted(set(geoids))
+    if not members or len(members) != len(indices):
+        return False
+    if indices[0] < 0 or indices[-1] >= count or any(b <= a for a, b in zip(indices, indices[1:])):
+        return False
+
+    known = [_sha256(g.encode("utf-8")) for g in members]
+    for size in _level_sizes(count)[:-1]:
+        parent_indices: List[int] = []
+        parents: List[bytes] = []
+        k = 0
+        while k < len(indices):
+            i, node = indices[k], known[k]
+            if i % 2 == 1:
+                sibling = next(nodes, None)
+                if sibling is None:
+                    return False
+                node = _sha256(sibling + node)
+            elif k + 1 < len(indices) and indices[k + 1] == i + 1:
+                k += 1
+                node = _sha256(node + known[k])
+            elif i + 1 < size:
+                sibling = next(nodes, None)
+                if sibling is None:
+                    return False
+                node = _sha256(node + sibling)
+            # else: unpaired node promoted unchanged.
+            parent_indices.append(i // 2)
+            parents.append(node)
+            k += 1
+        indices, known = parent_indices, parents
+    if next(nodes, None) is not None:
+        return False  # unused nodes: the proof does not match this tree shape
+    return known[0].hex() == list_id
+
+
+def consistency_proof(old_geoids: List[str], new_geoids: List[str]) -> Dict[str, Any]:
+    """Prove the new list is a superset of the old one: {old/new list_id and count, added}.
+
+    The proof is sized by the diff. Raises ValueError when a member was removed.
+    """
+    old, new = canonical_members(old_geoids), canonical_members(new_geoids)
+    removed = set(old) - set(new)
+    if removed:
+        raise ValueError(f"GeoID removed: {min(removed)}")
+    return {
+        "old_list_id": merkle_root(old),
+        "new_list_id": merkle_root(new),
+        "old_count": len(old),
+        "new_count": len(new),
+        "added": sorted(set(new) - set(old)),
+    }
+
+
+def verify_consistency(old_tree: MerkleTree, proof: Dict[str, Any], new_list_id: str) -> bool:
+    """Verify that ``new_list_id`` is ``old_tree``'s members plus ``proof["added"]``.
+
+    Uses the incremental update on a copy, so only the added leaves are hashed;
+    a syncing verifier can apply ``old_tree.update(add=proof["added"])`` itself.
+    """
+    try:
+        added = [str(g) for g in proof["added"]]
+        claimed = (
+            proof["old_list_id"], proof["new_list_id"], int(proof["old_count"]), int(proof["new_count"])
+        )
+    except (KeyError, TypeError, ValueError):
+        return False
+    if claimed != (old_tree.list_id, new_list_id, len(old_tree), len(old_tree) + len(added)):
+        return False
+    if any(g in old_tree for g in added) or len(set(added)) != len(added):
+        return False
+    if not added:
+        return old_tree.list_id == new_list_id
+    tree = old_tree.copy()
+    tree.update(add=added)
+    return tree.list_id == new_list_id
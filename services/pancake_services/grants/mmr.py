@@ -0,0 +1,111 @@
+"""Merkle Mountain Range over MEAL packet hashes.
+
+An append-only accumulator kept next to each MEAL's ``previous_packet_hash``
+chain, so one packet can be proven part of a MEAL with O(log n) hashes
+instead of the whole chain up to it.
+
+* Leaves are the packets' ``packet_hash`` bytes, in sequence order; parents
+  are ``SHA-256(left || right)`` (as in merkle.py).
+* A MEAL of ``n`` packets is a row of perfect binary trees ("mountains"),
+  one per set bit of ``n``, largest first. Their roots are the **peaks**.
+* The node at height ``h`` and index ``j`` covers leaves
+  ``[j * 2**h, (j + 1) * 2**h)``; leaf ``i``'s ancestor at height ``h`` has
+  index ``i >> h``.
+* The **root** bags the peaks right to left and binds the leaf count:
+  ``SHA-256(uint64_be(n) || bag)``, where ``bag`` starts at the last peak and
+  folds each earlier peak ``p`` in as ``SHA-256(p || bag)``.
+
+Appending a leaf merges equal-height peaks, creating at most ``log2(n)``
+internal nodes (one on average).
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+_COUNT = struct.Struct(">Q")
+
+
+def _sha256(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def peak_heights(leaf_count: int) -> List[int]:
+    """Mountain heights for ``leaf_count`` leaves, left (tallest) to right."""
+    return [h for h in range(leaf_count.bit_length() - 1, -1, -1) if leaf_count >> h & 1]
+
+
+def append(
+    peaks: Sequence[bytes], leaf_count: int, leaf: bytes
+) -> Tuple[List[bytes], List[Tuple[int, int, bytes]]]:
+    """Add ``leaf`` as leaf number ``leaf_count``.
+
+    Returns the new peaks and the internal nodes created, as
+    ``(height, index, hash)``.
+    """
+    peaks = list(peaks)
+    created: List[Tuple[int, int, bytes]] = []
+    node, height = leaf, 0
+    while leaf_count >> height & 1:
+        node = _sha256(peaks.pop() + node)
+        height += 1
+        created.append((height, leaf_count >> height, node))
+    peaks.append(node)
+    return peaks, created
+
+
+def root(peaks: Sequence[bytes], leaf_count: int) -> bytes:
+    if not peaks:
+        raise ValueError("an empty MMR has no root")
+    bag = peaks[-1]
+    for peak in reversed(peaks[:-1]):
+        bag = _sha256(peak + bag)
+    return _sha256(_COUNT.pack(leaf_count) + bag)
+
+
+def proof_path(leaf_count: int, leaf_index: int) -> Tuple[int, List[Tuple[int, int, str]]]:
+    """Where leaf ``leaf_index`` sits: its mountain's position among the peaks,
+    and the siblings on its path to that peak as ``(height, index, position)``.
+
+    ``position`` is the side the sibling takes in the concatenation.
+    """
+    if not 0 <= leaf_index < leaf_count:
+        raise IndexError(f"leaf {leaf_index} outside MMR of {leaf_count}")
+    start = 0
+    for mountain, height in enumerate(peak_heights(leaf_count)):
+        if leaf_index < start + (1 << height):
+            break
+        start += 1 << height
+    path = []
+    for h in range(height):
+        index = leaf_index >> h
+        path.append((h, index ^ 1, "left" if index & 1 else "right"))
+    return mountain, path
+
+
+def verify_inclusion(
+    leaf: bytes,
+    leaf_index: int,
+    leaf_count: int,
+    siblings: Sequence[Dict[str, str]],
+    peaks: Sequence[bytes],
+    expected_root: bytes,
+) -> bool:
+    """Check a leaf against a root: path to its peak, then the peaks to the root."""
+    try:
+        mountain, path = proof_path(leaf_count, leaf_index)
+    except IndexError:
+        return False
+    if len(siblings) != len(path) or len(peaks) != len(peak_heights(leaf_count)):
+        return False
+    node = leaf
+    for step, (_, _, position) in zip(siblings, path):
+        if step.get("position") != position:
+            return False
+        try:
+            sibling = bytes.fromhex(step["sibling"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        node = _sha256(node + sibling) if position == "right" else _sha256(sibling + node)
+    return node == peaks[mountain] and root(peaks, leaf_count) == expected_root
@@ -12,7 +12,9 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -50,6 +52,15 @@ class FieldList(Base):
     name: Mapped[str] = mapped_column(String(256))
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    # merkle.MerkleTree.to_bytes(); deferred so list lookups never pull the blob.
+    merkle_levels: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    # A PATCH adds a new version row and leaves this one (and its members) in
+    # place, so grants bound to this ListID keep their membership.
+    # origin_list_id is the first version's ListID: the key shared by every
+    # version and by the list's MEAL history. superseded_by is the ListID of
+    # the next version (None for the current one).
+    origin_list_id: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
+    superseded_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     owner: Mapped[User] = relationship(back_populates="fieldlists")
     members: Mapped[list["FieldListMember"]] = relationship(
@@ -60,22 +71,52 @@ class FieldList(Base):
     def geoids(self) -> list[str]:
         return sorted(m.geoid for m in self.members)
 
+    @property
+    def lineage_id(self) -> str:
+        return self.origin_list_id or self.list_id
+
 
 class FieldListMember(Base):
     __tablename__ = "fieldlist_members"
-    __table_args__ = (UniqueConstraint("fieldlist_id", "geoid", name="uq_member"),)
+    __table_args__ = (
+        UniqueConstraint("fieldlist_id", "geoid", name="uq_member"),
+        Index("ix_member_position", "fieldlist_id", "position"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     fieldlist_id: Mapped[int] = mapped_column(ForeignKey("fieldlists.id"), index=True)
     geoid: Mapped[str] = mapped_column(String(128), index=True)
+    # Leaf index in the list's Merkle tree (Python sort order, not the DB collation).
+    # NULL for rows written before positions were stored; backfilled on first use.
+    position: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     fieldlist: Mapped[FieldList] = relationship(back_populates="members")
 
 
+class FieldListRevision(Base):
+    """One membership edit (PATCH) of a FieldList; the diffs back consistency proofs.
+
+    ``fieldlist_id`` is the version row the edit created.
+    """
+
+    __tablename__ = "fieldlist_revisions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    fieldlist_id: Mapped[int] = mapped_column(ForeignKey("fieldlists.id"), index=True)
+    from_list_id: Mapped[str] = mapped_column(String(64), index=True)
+    to_list_id: Mapped[str] = mapped_column(String(64))
+    added: Mapped[list] = mapped_column(JSON, default=list)
+    removed: Mapped[list] = mapped_column(JSON, default=list)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+
 class Grant(Base):
     """An issued field-access grant credential (metadata; the credential itself is signed)."""
 
     __tablename__ = "grants"
+    __table_args__ = (
+        UniqueConstraint("status_list_shard", "status_list_index", name="uq_grant_status_slot"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     jti: Mapped[str] = mapped_column(String(64), unique=True, index=True)
@@ -86,23 +127,87 @@ class Grant(Base):
     masking_level: Mapped[str] = mapped_column(String(8), default="L1")
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     status: Mapped[str] = mapped_column(String(16), default="active")  # active | revoked
-    status_list_index: Mapped[int] = mapped_column(Integer, unique=True)
+    status_list_shard: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    status_list_index: Mapped[int] = mapped_column(Integer)
     credential: Mapped[str] = mapped_column(Text)  # SD-JWT compact serialization
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
     revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
 
 class StatusListState(Base):
-    """Single-row persistence of the issuer's revocation bitstring."""
+    """One row per status-list shard of the issuer's revocation bitstring.
+
+    ``bits`` is the raw bitmap; the published zlib/base64url form is derived
+    on demand. ``version`` increases whenever a bit changes, so processes can
+    keep a decoded copy and refresh it only when the version moves. Shard 0's
+    ``next_index`` is the allocation cursor across all shards (see
+    ``statuslist_service.slot_at``).
+    """
 
     __tablename__ = "status_list_state"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    encoded: Mapped[str] = mapped_column(Text)
+    shard: Mapped[int] = mapped_column(Integer, default=0, unique=True)
+    bits: Mapped[bytes] = mapped_column(LargeBinary)
+    version: Mapped[int] = mapped_column(Integer, default=0)
     next_index: Mapped[int] = mapped_column(Integer, default=0)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
 
+class StatusIndexBlock(Base):
+    """A range of status-list indices reserved by one worker process.
+
+    Workers hand indices out from memory. ``next_free`` is written back when a
+    worker releases the block (``owner`` cleared), so the unused tail
+    ``[next_free, end)`` can be claimed by another worker. ``claimed_at`` is
+    the owner's lease, renewed while it issues; a block whose lease lapsed
+    (the owner died) can be claimed too. Bounds are positions in the
+    allocation sequence across shards; a block never spans two shards.
+    """
+
+    __tablename__ = "status_index_blocks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    start: Mapped[int] = mapped_column(Integer)
+    end: Mapped[int] = mapped_column(Integer)  # exclusive
+    next_free: Mapped[int] = mapped_column(Integer)
+    owner: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    claimed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+
+class StatusListChange(Base):
+    """Index set at a given status-list version (feed for incremental sync)."""
+
+    __tablename__ = "status_list_changes"
+    __table_args__ = (Index("ix_status_list_changes_shard_version", "shard", "version"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    shard: Mapped[int] = mapped_column(Integer, default=0)
+    version: Mapped[int] = mapped_column(Integer)
+    status_list_index: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+
+class HubOutbox(Base):
+    """A revocation report for the hub registry, written with the revocation itself.
+
+    Drained by ``hub_outbox.HubReporter``; ``sent_at`` stays NULL until the
+    hub accepts it, and failed attempts back off via ``next_attempt_at``.
+    ``failed_at`` is set (and retries stop) when the hub rejects the report.
+    """
+
+    __tablename__ = "hub_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, index=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
 class Meal(Base):
     """MEAL root metadata (audit ledger cover page)."""
 
@@ -113,11 +218,30 @@ class Meal(Base):
     created_at_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
     last_updated_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
     primary_geoid: Mapped[str | None] = mapped_column(String(128), index=True, nullable=True)
-    participant_agents: Mapped[list] = mapped_column(JSON, default=list)
     packet_count: Mapped[int] = mapped_column(Integer, default=0)
     root_hash: Mapped[str | None] = mapped_column(String(66), nullable=True)
     last_packet_hash: Mapped[str | None] = mapped_column(String(66), nullable=True)
+    # Kept with last_packet_hash so an append needs no ORDER BY ... LIMIT 1 lookup.
+    last_packet_id: Mapped[str | None] = mapped_column(String(26), nullable=True)
     archived: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Merkle Mountain Range over the packet hashes (see mmr.py): hex peaks, and
+    # the root signed with the instance key. None until first maintained.
+    mmr_peaks: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    mmr_root: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    mmr_root_signature: Mapped[str | None] = mapped_column(String(256), nullable=True)
+
+
+class MealParticipant(Base):
+    """An agent that has authored packets in a MEAL (one row per agent)."""
+
+    __tablename__ = "meal_participants"
+    __table_args__ = (UniqueConstraint("meal_id", "agent_id", name="uq_meal_participant"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    meal_id: Mapped[str] = mapped_column(ForeignKey("meals.meal_id"))
+    agent_id: Mapped[str] = mapped_column(String(128))
+    agent_type: Mapped[str] = mapped_column(String(20), default="human")
+    joined_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
 
 class MealPacket(Base):
@@ -141,6 +265,37 @@ class MealPacket(Base):
     signature: Mapped[str | None] = mapped_column(String(256), nullable=True)
 
 
+class MealMmrNode(Base):
+    """Internal MMR node of a MEAL (height >= 1; leaves are the packet hashes)."""
+
+    __tablename__ = "meal_mmr_nodes"
+    __table_args__ = (UniqueConstraint("meal_id", "height", "node_index", name="uq_meal_mmr_node"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    meal_id: Mapped[str] = mapped_column(ForeignKey("meals.meal_id"))
+    height: Mapped[int] = mapped_column(Integer)
+    node_index: Mapped[int] = mapped_column(Integer)
+    hash: Mapped[str] = mapped_column(String(64))
+
+
+class MealCheckpoint(Base):
+    """Signed record that a MEAL's chain verified up to ``sequence_number``.
+
+    Later verifications resume after the latest checkpoint instead of
+    replaying the chain from packet 1.
+    """
+
+    __tablename__ = "meal_checkpoints"
+    __table_args__ = (UniqueConstraint("meal_id", "sequence_number", name="uq_meal_checkpoint"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    meal_id: Mapped[str] = mapped_column(ForeignKey("meals.meal_id"), index=True)
+    sequence_number: Mapped[int] = mapped_column(Integer)
+    packet_hash: Mapped[str] = mapped_column(String(66))
+    verified_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    signature: Mapped[str] = mapped_column(String(256))
+
+
 class Bite(Base):
     """Stored BITE envelope, queryable by GeoID/type/time (Cycle 6)."""
 
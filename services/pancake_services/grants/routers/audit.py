@@ -1,27 +1,28 @@
 """OpenScience Auditing API: per-GeoID provenance from the signed MEAL ledger."""
 from __future__ import annotations
 
+import json
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterator, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 from pancake_services.grants.auth import get_current_user, get_db
+from pancake_services.grants.meal_verify import ChainVerifier
 from pancake_services.grants.mealstore import MealStore
 from pancake_services.grants.models import FieldList, FieldListMember, Meal, MealPacket, User
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
+# Packets read per query when listing a GeoID's events.
+AUDIT_PAGE = 1000
 
-def _packets_for_geoid(
-    db: Session,
-    geoid: str,
-    since: Optional[datetime],
-    until: Optional[datetime],
-) -> list[MealPacket]:
-    """Events indexed directly on the geoid, plus events on any fieldlist
+
+def _geoid_keys(db: Session, geoid: str) -> List[str]:
+    """Packet index keys for a GeoID: the geoid itself plus every fieldlist
     (ListID) that contains it."""
     list_ids = set(
         db.execute(
@@ -30,13 +31,49 @@ def _packets_for_geoid(
             .where(FieldListMember.geoid == geoid)
         ).scalars()
     )
-    keys = list(list_ids | {geoid})
+    return list(list_ids | {geoid})
+
+
+def _packet_pages(
+    db: Session,
+    keys: List[str],
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    size: int = AUDIT_PAGE,
+) -> Iterator[List[MealPacket]]:
+    """Packets indexed on ``keys`` in (time_index, packet_id) order, ``size`` per
+    keyset-paginated query, so a long history is never loaded at once."""
     query = select(MealPacket).where(MealPacket.geoid.in_(keys))
     if since is not None:
         query = query.where(MealPacket.time_index >= since)
     if until is not None:
         query = query.where(MealPacket.time_index <= until)
-    return list(db.execute(query.order_by(MealPacket.time_index)).scalars())
+    query = query.order_by(MealPacket.time_index, MealPacket.packet_id).limit(size)
+    page = list(db.execute(query).scalars())
+    while page:
+        yield page
+        if len(page) < size:
+            return
+        last = page[-1]
+        after = or_(
+            MealPacket.time_index > last.time_index,
+            and_(MealPacket.time_index == last.time_index, MealPacket.packet_id > last.packet_id),
+        )
+        for p in page:
+            db.expunge(p)  # keep the identity map at one page
+        page = list(db.execute(query.where(after)).scalars())
+
+
+def _chain_verifier(request: Request) -> ChainVerifier:
+    """Verifier on the app's shared worker pool; in-process when the app has none."""
+    issuer = request.app.state.issuer
+    pool = request.app.state.worker_pool
+    return ChainVerifier(
+        issuer.public_key_pem,
+        workers=request.app.state.settings.audit_verify_workers if pool is not None else 1,
+        store=MealStore(issuer),
+        pool=pool,
+    )
 
 
 def _packet_json(p: MealPacket) -> dict:
@@ -60,46 +97,84 @@ def audit_events(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    packets = _packets_for_geoid(db, geoid, since, until)
-    return {"geoid": geoid, "event_count": len(packets), "events": [_packet_json(p) for p in packets]}
+    events = [
+        _packet_json(p) for page in _packet_pages(db, _geoid_keys(db, geoid), since, until) for p in page
+    ]
+    return {"geoid": geoid, "event_count": len(events), "events": events}
 
 
 @router.get("/{geoid}/report")
 def audit_report(
     geoid: str,
     request: Request,
+    full: bool = Query(default=False),
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Compliance report: full provenance plus chain-integrity verification
-    for every MEAL touching this GeoID."""
-    packets = _packets_for_geoid(db, geoid, None, None)
-    store = MealStore(request.app.state.issuer)
-    meal_ids = sorted({p.meal_id for p in packets})
-    chains = {meal_id: store.verify_chain(db, meal_id) for meal_id in meal_ids}
-    events_by_type: dict[str, int] = {}
-    for p in packets:
-        event_type = p.payload.get("event_type", "unknown")
-        events_by_type[event_type] = events_by_type.get(event_type, 0) + 1
-    return {
+    for every MEAL touching this GeoID. Chains are verified from their latest
+    signed checkpoint (new packets only) unless ``full=true``, in parallel
+    across a worker pool. The events stream in keyset-paginated pages, so
+    ``event_count`` and ``events_by_type`` close the JSON document."""
+    keys = _geoid_keys(db, geoid)
+    meal_ids = list(
+        db.execute(
+            select(MealPacket.meal_id).where(MealPacket.geoid.in_(keys)).distinct().order_by(MealPacket.meal_id)
+        ).scalars()
+    )
+    chains = _chain_verifier(request).verify_chains(db, meal_ids, full=full)
+    head = {
         "geoid": geoid,
         "generated_at": datetime.now(timezone.utc).isoformat(),
-        "event_count": len(packets),
-        "events_by_type": events_by_type,
         "chain_integrity": chains,
         "all_chains_valid": all(c.get("valid") for c in chains.values()) if chains else True,
-        "events": [_packet_json(p) for p in packets],
     }
 
+    def document() -> Iterator[str]:
+        yield json.dumps(head)[:-1] + ', "events": ['
+        event_count = 0
+        events_by_type: dict[str, int] = {}
+        # Own session: the response streams after request dependencies are closed.
+        with request.app.state.session_factory() as session:
+            for page in _packet_pages(session, keys):
+                for p in page:
+                    event_type = p.payload.get("event_type", "unknown")
+                    events_by_type[event_type] = events_by_type.get(event_type, 0) + 1
+                    yield ("," if event_count else "") + json.dumps(_packet_json(p))
+                    event_count += 1
+        yield f'], "event_count": {event_count}, "events_by_type": {json.dumps(events_by_type)}}}'
+
+    return StreamingResponse(document(), media_type="application/json")
+
 
 @router.get("/meals/{meal_id}/verify")
 def verify_meal_chain(
     meal_id: str,
     request: Request,
+    full: bool = Query(default=False),
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    """Chain verification from the latest signed checkpoint; ``full=true``
+    replays every packet (auditors)."""
     meal = db.execute(select(Meal).where(Meal.meal_id == meal_id)).scalar_one_or_none()
     if meal is None:
         raise HTTPException(status_code=404, detail="meal not found")
-    return MealStore(request.app.state.issuer).verify_chain(db, meal_id)
+    return _chain_verifier(request).verify_chains(db, [meal_id], full=full)[meal_id]
+
+
+@router.get("/packets/{packet_id}/proof")
+def packet_inclusion_proof(
+    packet_id: str,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """O(log n) proof that one packet belongs to its MEAL: the path to its
+    MMR peak, the peaks, and the issuer-signed root. Check it with
+    ``mealstore.verify_packet_proof`` instead of replaying the chain.
+    Read-only, like every audit endpoint."""
+    proof = MealStore(request.app.state.issuer).inclusion_proof(db, packet_id)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="packet not found")
+    return proof
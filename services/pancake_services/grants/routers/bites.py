@@ -13,7 +13,7 @@ from typing import Any, Optional
 
 from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request
 
-from pancake_services.grants import sdjwt, statuslist_service
+from pancake_services.grants import sdjwt
 from pancake_services.grants.auth import get_current_user
 from pancake_services.grants.models import User
 from pancake_services.store.bites import BiteStore
@@ -45,25 +45,34 @@ def _enforce_weather_grant(
         raise HTTPException(status_code=401, detail="missing X-Field-Grant for weather read")
 
     issuer = request.app.state.issuer
-    settings = request.app.state.settings
     try:
-        result = sdjwt.verify(field_grant, issuer.public_key_pem)
+        # Only the requested GeoID's disclosure is validated, so a large-list
+        # credential costs about the same as a one-field one. Results are cached
+        # per (presentation, GeoID) until exp; the revocation bit below is
+        # checked on every request.
+        cached = request.app.state.grant_cache.get_or_verify(
+            field_grant,
+            lambda credential: sdjwt.verify(credential, issuer.verification_key, geoids=[geoid]),
+            scope=[geoid],
+        )
     except sdjwt.VerificationError as e:
         raise HTTPException(status_code=403, detail=f"invalid field grant: {e}") from e
 
-    status = result.claims.get("status", {}).get("status_list", {})
+    status = cached.grant.claims.get("status", {}).get("status_list", {})
     idx = status.get("idx")
     if idx is not None:
+        shards = request.app.state.status_lists
+        shard = shards.shard_of(status.get("uri", ""))
+        if shard is None:
+            raise HTTPException(status_code=403, detail="field grant status list unknown")
         session = request.app.state.session_factory()
         try:
-            if statuslist_service.is_revoked(
-                session, idx, settings.status_list_size, settings.status_list_index_start
-            ):
+            if shards[shard].is_revoked(session, idx):
                 raise HTTPException(status_code=403, detail="field grant revoked")
         finally:
             session.close()
 
-    if geoid not in result.disclosed_geoids:
+    if geoid not in cached.geoids:
         raise HTTPException(
             status_code=403, detail="field grant does not cover the requested geoid"
         )
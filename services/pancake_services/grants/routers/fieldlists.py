@@ -1,15 +1,24 @@
 """FieldList endpoints: owner-scoped GeoID lists identified by Merkle ListIDs."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
-from pancake_services.grants import merkle
+from pancake_services.grants import fieldlist_service, merkle
 from pancake_services.grants.auth import get_current_user, get_db
 from pancake_services.grants.mealstore import MealStore
-from pancake_services.grants.models import FieldList, FieldListMember, User
-from pancake_services.grants.schemas import FieldListCreate, FieldListOut, InclusionProofOut
+from pancake_services.grants.models import FieldList, FieldListMember, FieldListRevision, User
+from pancake_services.grants.schemas import (
+    ConsistencyProofOut,
+    FieldListCreate,
+    FieldListOut,
+    FieldListUpdate,
+    FieldListUpdateOut,
+    InclusionProofOut,
+    MultiProofOut,
+    MultiProofRequest,
+)
 
 router = APIRouter(prefix="/fieldlists", tags=["fieldlists"])
 
@@ -28,6 +37,16 @@ def _owned(db: Session, user: User, list_id: str) -> FieldList:
     return fieldlist
 
 
+def _fieldlist_out(f: FieldList) -> FieldListOut:
+    return FieldListOut(
+        list_id=f.list_id,
+        name=f.name,
+        geoids=f.geoids,
+        created_at=f.created_at,
+        superseded_by=f.superseded_by,
+    )
+
+
 @router.post("", response_model=FieldListOut, status_code=201)
 def create_fieldlist(
     body: FieldListCreate,
@@ -35,23 +54,24 @@ def create_fieldlist(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    members = merkle.canonical_members(body.geoids)
-    list_id = merkle.merkle_root(members)
+    tree = merkle.MerkleTree(body.geoids)
+    members, list_id = tree.members, tree.list_id
 
     existing = db.execute(
         select(FieldList).where(FieldList.list_id == list_id, FieldList.owner_id == user.id)
     ).scalar_one_or_none()
     if existing:
         # Idempotent by construction: same set of GeoIDs -> same ListID.
-        return FieldListOut(
-            list_id=existing.list_id,
-            name=existing.name,
-            geoids=existing.geoids,
-            created_at=existing.created_at,
-        )
+        return _fieldlist_out(existing)
 
-    fieldlist = FieldList(list_id=list_id, name=body.name, owner_id=user.id)
-    fieldlist.members = [FieldListMember(geoid=g) for g in members]
+    fieldlist = FieldList(
+        list_id=list_id,
+        name=body.name,
+        owner_id=user.id,
+        origin_list_id=list_id,
+        merkle_levels=tree.to_bytes(),
+    )
+    fieldlist.members = fieldlist_service.member_rows(members)
     db.add(fieldlist)
     db.flush()
 
@@ -72,19 +92,113 @@ def create_fieldlist(
 
 @router.get("", response_model=list[FieldListOut])
 def list_fieldlists(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    rows = db.execute(select(FieldList).where(FieldList.owner_id == user.id)).scalars()
-    return [
-        FieldListOut(list_id=f.list_id, name=f.name, geoids=f.geoids, created_at=f.created_at)
-        for f in rows
-    ]
+    """Current versions only; superseded versions stay addressable by ListID."""
+    rows = db.execute(
+        select(FieldList).where(FieldList.owner_id == user.id, FieldList.superseded_by.is_(None))
+    ).scalars()
+    return [_fieldlist_out(f) for f in rows]
 
 
 @router.get("/{list_id}", response_model=FieldListOut)
 def get_fieldlist(
     list_id: str, user: User = Depends(get_current_user), db: Session = Depends(get_db)
 ):
+    return _fieldlist_out(_owned(db, user, list_id))
+
+
+@router.patch("/{list_id}", response_model=FieldListUpdateOut)
+def update_fieldlist(
+    list_id: str,
+    body: FieldListUpdate,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Add/remove members. The edit becomes a new version under its new ListID
+    (or, if it restores an earlier membership, makes that version current
+    again); the old version and its members are kept, since grants issued
+    against the old ListID stay bound to that membership. Only the edited part
+    of the stored Merkle tree is rehashed."""
     f = _owned(db, user, list_id)
-    return FieldListOut(list_id=f.list_id, name=f.name, geoids=f.geoids, created_at=f.created_at)
+    if f.superseded_by is not None:
+        raise HTTPException(
+            status_code=409, detail=f"fieldlist {list_id} was superseded by {f.superseded_by}"
+        )
+    tree = fieldlist_service.stored_tree(db, f)
+    try:
+        added, removed = tree.update(add=body.add, remove=body.remove)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+    new_list_id = tree.list_id
+    if not added and not removed and body.name in (None, f.name):
+        return FieldListUpdateOut(
+            list_id=list_id, previous_list_id=list_id, name=f.name,
+            geoid_count=len(tree), added=[], removed=[],
+        )
+    if new_list_id == list_id:
+        f.name = body.name  # a rename; membership and ListID are unchanged
+        version = f
+    else:
+        version = db.execute(
+            select(FieldList).where(FieldList.list_id == new_list_id, FieldList.owner_id == user.id)
+        ).scalar_one_or_none()
+        if version is None:
+            # Each version keeps its own member rows, so a new one writes all
+            # of its members; only the Merkle rehash is incremental.
+            version = FieldList(
+                list_id=new_list_id,
+                name=body.name if body.name is not None else f.name,
+                owner_id=user.id,
+                origin_list_id=f.lineage_id,
+                merkle_levels=tree.to_bytes(),
+            )
+            version.members = fieldlist_service.member_rows(tree.members)
+            db.add(version)
+            db.flush()
+        elif version.lineage_id == f.lineage_id:
+            # The edit restores an earlier membership: that version becomes current again.
+            version.superseded_by = None
+            version.name = body.name if body.name is not None else f.name
+        else:
+            raise HTTPException(status_code=409, detail=f"fieldlist {new_list_id} already exists")
+        f.superseded_by = new_list_id
+        db.add(
+            FieldListRevision(
+                fieldlist_id=version.id,
+                from_list_id=list_id,
+                to_list_id=new_list_id,
+                added=added,
+                removed=removed,
+            )
+        )
+    db.flush()
+
+    # Logged on the first version's ListID so every version shares one history.
+    _meal_store(request).append_event(
+        db,
+        meal_key=f.lineage_id,
+        event_type="fieldlist.updated",
+        author_account=user.hub_account_id,
+        payload={
+            "list_id": new_list_id,
+            "previous_list_id": list_id,
+            "added": len(added),
+            "removed": len(removed),
+            "geoid_count": len(tree),
+        },
+        geoid=new_list_id,
+    )
+    db.commit()
+
+    return FieldListUpdateOut(
+        list_id=new_list_id,
+        previous_list_id=list_id,
+        name=version.name,
+        geoid_count=len(tree),
+        added=added,
+        removed=removed,
+    )
 
 
 @router.get("/{list_id}/proof/{geoid}", response_model=InclusionProofOut)
@@ -94,9 +208,122 @@ def inclusion_proof(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    """Served from the persisted levels: an indexed lookup of the stored leaf
+    position plus one slice per tree level, so latency does not grow with
+    list size."""
     f = _owned(db, user, list_id)
-    try:
-        proof = merkle.inclusion_proof(f.geoids, geoid)
-    except ValueError:
-        raise HTTPException(status_code=404, detail="geoid not in fieldlist") from None
+    index = fieldlist_service.member_position(db, f, geoid)
+    if index is None:
+        raise HTTPException(status_code=404, detail="geoid not in fieldlist")
+    if db.dirty:
+        db.commit()  # keep positions backfilled by member_position
+    header = fieldlist_service.stored_slices(db, f, [(0, merkle.HEADER_SIZE)])[0]
+    if header is None:
+        # Stored before levels were persisted: build them once and keep them.
+        tree = fieldlist_service.stored_tree(db, f)
+        db.commit()
+        proof = tree.inclusion_proof(geoid)
+    else:
+        count = merkle.leaf_count(header)
+        path = merkle.proof_path(count, index)
+        spans = [(merkle.node_offset(count, level, i), merkle.NODE_SIZE) for level, i, _ in path]
+        nodes = fieldlist_service.stored_slices(db, f, spans) if spans else []
+        proof = [
+            {"sibling": node.hex(), "position": position}
+            for node, (_, _, position) in zip(nodes, path)
+        ]
     return InclusionProofOut(geoid=geoid, list_id=list_id, proof=proof)
+
+
+@router.post("/{list_id}/proofs", response_model=MultiProofOut)
+def multiproof(
+    list_id: str,
+    body: MultiProofRequest,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Membership proof for a batch of GeoIDs; shared upper-level nodes are sent once.
+    Served from the persisted levels like the single-GeoID proof."""
+    f = _owned(db, user, list_id)
+    try:
+        proof = fieldlist_service.multiproof(db, f, body.geoids)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from None
+    if db.dirty:
+        db.commit()  # keep positions or levels backfilled by multiproof
+    return MultiProofOut(list_id=list_id, geoids=sorted(set(body.geoids)), **proof)
+
+
+def _net_change(db: Session, fieldlist: FieldList, since_list_id: str) -> tuple[set, set] | None:
+    """Net (added, removed) GeoIDs from ``since_list_id`` to this version's
+    ListID, replayed from the revisions that led to it; None if no earlier
+    version had that ListID."""
+    # A lineage's revisions form one timeline (each starts where the previous
+    # one ended); an edit back to an earlier membership revisits its ListID.
+    lineage = fieldlist.lineage_id
+    revisions = db.execute(
+        select(FieldListRevision)
+        .join(FieldList, FieldList.id == FieldListRevision.fieldlist_id)
+        .where(
+            FieldList.owner_id == fieldlist.owner_id,
+            or_(FieldList.origin_list_id == lineage, FieldList.list_id == lineage),
+        )
+        .order_by(FieldListRevision.id.desc())
+    ).scalars()
+    chain = []
+    for revision in revisions:
+        if not chain and revision.to_list_id != fieldlist.list_id:
+            continue  # after this version was last current
+        chain.append(revision)
+        if revision.from_list_id == since_list_id:
+            break
+    else:
+        return None
+
+    added: set = set()
+    removed: set = set()
+    for revision in reversed(chain):
+        for geoid in revision.added:
+            if geoid in removed:
+                removed.discard(geoid)
+            else:
+                added.add(geoid)
+        for geoid in revision.removed:
+            if geoid in added:
+                added.discard(geoid)
+            else:
+                removed.add(geoid)
+    return added, removed
+
+
+@router.get("/{list_id}/consistency", response_model=ConsistencyProofOut)
+def consistency_proof(
+    list_id: str,
+    since: str = Query(alias="from", min_length=64, max_length=64),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Prove the list is a superset of an earlier version of itself. The proof
+    is the net set of added GeoIDs, so it is sized by the diff, not the list."""
+    f = _owned(db, user, list_id)
+    if since == list_id:
+        added: set = set()
+    else:
+        change = _net_change(db, f, since)
+        if change is None:
+            raise HTTPException(status_code=404, detail="fieldlist has no version with that ListID")
+        added, removed = change
+        if removed:
+            raise HTTPException(
+                status_code=409, detail=f"not a superset: {len(removed)} GeoID(s) removed since {since}"
+            )
+    new_count = db.execute(
+        select(func.count()).select_from(FieldListMember).where(FieldListMember.fieldlist_id == f.id)
+    ).scalar_one()
+    return ConsistencyProofOut(
+        old_list_id=since,
+        new_list_id=list_id,
+        old_count=new_count - len(added),
+        new_count=new_count,
+        added=sorted(added),
+    )
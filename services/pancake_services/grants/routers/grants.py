@@ -5,29 +5,49 @@ DPI account and retrieves credentials issued to them via GET /grants/received.
 """
 from __future__ import annotations
 
+import json
+import os
 import time
+from collections import deque
+from concurrent.futures import Executor
 from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-import httpx
-from fastapi import APIRouter, Body, Depends, HTTPException, Request
-from sqlalchemy import select
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from ulid import ULID
 
-from pancake_services.grants import sdjwt, statuslist_service
+from pancake_services.grants import fieldlist_service, hub_outbox, sdjwt, statuslist_service
 from pancake_services.grants.auth import get_current_user, get_db
-from pancake_services.grants.mealstore import MealStore
+from pancake_services.grants.issuer import public_key_from_pem
+from pancake_services.grants.mealstore import MealEvent, MealStore
 from pancake_services.grants.models import FieldList, Grant, User
 from pancake_services.grants.schemas import (
+    GrantBatchIssueRequest,
     GrantIssueRequest,
     GrantOut,
+    GrantSpec,
     GrantWithCredential,
+    PresentationOut,
+    PresentRequest,
+    RevokeBatchOut,
+    RevokeBatchRequest,
     RevokeRequest,
+    StatusListChangesOut,
     StatusListOut,
+    VerifyBatchRequest,
 )
+from pancake_services.grants.statuslist import StatusList
+from pancake_services.grants.statuslist_service import StatusSlot
 
 router = APIRouter(prefix="/grants", tags=["grants"])
 
+# Credentials per worker task in /verify-batch: large enough to amortize
+# pickling and the per-chunk key parse, small enough to start streaming early.
+VERIFY_BATCH_CHUNK = 256
+
 
 def _grant_out(g: Grant) -> GrantOut:
     return GrantOut(
@@ -37,6 +57,7 @@ def _grant_out(g: Grant) -> GrantOut:
         purpose=g.purpose,
         masking_level=g.masking_level,
         status=g.status,
+        status_list_shard=g.status_list_shard,
         status_list_index=g.status_list_index,
         expires_at=g.expires_at,
         created_at=g.created_at,
@@ -64,77 +85,139 @@ def _build_odrl(jti: str, list_id: str, purpose: str, exp: int) -> dict:
     }
 
 
-@router.post("/issue", response_model=GrantWithCredential, status_code=201)
-def issue_grant(
-    body: GrantIssueRequest,
-    request: Request,
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    settings = request.app.state.settings
-    issuer = request.app.state.issuer
-
+def _owned_fieldlist(db: Session, user: User, list_id: str) -> FieldList:
     fieldlist = db.execute(
-        select(FieldList).where(
-            FieldList.list_id == body.list_id, FieldList.owner_id == user.id
-        )
+        select(FieldList).where(FieldList.list_id == list_id, FieldList.owner_id == user.id)
     ).scalar_one_or_none()
     if fieldlist is None:
         raise HTTPException(status_code=404, detail="fieldlist not found")
+    return fieldlist
 
-    index = statuslist_service.allocate_index(
-        db, settings.status_list_size, settings.status_list_index_start
-    )
+
+def _sign_grant(
+    request: Request,
+    user: User,
+    list_id: str,
+    geoids: Optional[list[str]],
+    spec: GrantSpec,
+    slot: StatusSlot,
+) -> Grant:
+    """Build, sign, and return (unsaved) one grant over ``geoids`` at status-list ``slot``.
+
+    ``geoids=None`` issues the Merkle profile, which commits to ``list_id`` only.
+    """
+    status_uri = request.app.state.status_lists.uri(slot.shard)
+    issuer = request.app.state.issuer
     jti = str(ULID())
     now = int(time.time())
-    exp = now + body.validity_days * 86400
+    exp = now + spec.validity_days * 86400
     claims = {
         "iss": issuer.issuer_id,
-        "sub": body.list_id,
+        "sub": list_id,
         "iat": now,
         "exp": exp,
         "jti": jti,
-        "vct": sdjwt.VCT,
-        "grantee": body.grantee_account,
-        "masking_level": body.masking_level,
-        "purpose": body.purpose,
-        "odrl": _build_odrl(jti, body.list_id, body.purpose, exp),
-        "status": {"status_list": {"uri": settings.status_list_uri, "idx": index}},
+        "vct": sdjwt.VCT if geoids is not None else sdjwt.MERKLE_VCT,
+        "grantee": spec.grantee_account,
+        "masking_level": spec.masking_level,
+        "purpose": spec.purpose,
+        "odrl": _build_odrl(jti, list_id, spec.purpose, exp),
+        "status": {"status_list": {"uri": status_uri, "idx": slot.index}},
     }
-    credential = sdjwt.issue(claims, fieldlist.geoids, issuer.private_key_pem, issuer.kid)
-
-    grant = Grant(
+    if geoids is None:
+        credential = sdjwt.issue_merkle(claims, issuer.signing_key, issuer.kid)
+    else:
+        credential = sdjwt.issue(claims, geoids, issuer.signing_key, issuer.kid)
+    return Grant(
         jti=jti,
-        list_id=body.list_id,
+        list_id=list_id,
         issuer_user_id=user.id,
-        grantee_account=body.grantee_account,
-        purpose=body.purpose,
-        masking_level=body.masking_level,
+        grantee_account=spec.grantee_account,
+        purpose=spec.purpose,
+        masking_level=spec.masking_level,
         expires_at=datetime.fromtimestamp(exp, tz=timezone.utc),
         status="active",
-        status_list_index=index,
+        status_list_shard=slot.shard,
+        status_list_index=slot.index,
         credential=credential,
     )
-    db.add(grant)
-    db.flush()
 
-    MealStore(issuer).append_event(
-        db,
-        meal_key=body.list_id,
+
+def _issued_event(user: User, grant: Grant) -> MealEvent:
+    return MealEvent(
+        meal_key=grant.list_id,
         event_type="grant.issued",
         author_account=user.hub_account_id,
         payload={
-            "jti": jti,
-            "grantee": body.grantee_account,
-            "purpose": body.purpose,
-            "masking_level": body.masking_level,
+            "jti": grant.jti,
+            "grantee": grant.grantee_account,
+            "purpose": grant.purpose,
+            "masking_level": grant.masking_level,
             "expires_at": grant.expires_at.isoformat(),
         },
-        geoid=body.list_id,
+        geoid=grant.list_id,
     )
-    db.commit()
 
-    return GrantWithCredential(credential=credential, **_grant_out(grant).model_dump())
+
+@router.post("/issue", response_model=GrantWithCredential, status_code=201)
+def issue_grant(
+    body: GrantIssueRequest,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    fieldlist = _owned_fieldlist(db, user, body.list_id)
+    geoids = fieldlist.geoids if body.profile == "sd-jwt" else None
+
+    allocator = request.app.state.index_allocator
+    (slot,) = allocator.take(1)
+    try:
+        grant = _sign_grant(request, user, body.list_id, geoids, body, slot)
+        db.add(grant)
+        db.flush()
+
+        MealStore(request.app.state.issuer).append_events(db, [_issued_event(user, grant)])
+        db.commit()
+    except Exception:
+        allocator.give_back([slot])
+        raise
+
+    return GrantWithCredential(credential=grant.credential, **_grant_out(grant).model_dump())
+
+
+@router.post("/issue-batch", response_model=list[GrantWithCredential], status_code=201)
+def issue_grants_batch(
+    body: GrantBatchIssueRequest,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Issue many grants over one FieldList: the list is loaded once, status
+    indices come from this worker's reserved block in one call, and every
+    grant row and MEAL event is written in a single transaction -- all or
+    nothing (indices of a failed batch are reused)."""
+    fieldlist = _owned_fieldlist(db, user, body.list_id)
+    geoids = fieldlist.geoids if body.profile == "sd-jwt" else None
+
+    allocator = request.app.state.index_allocator
+    slots = allocator.take(len(body.grants))
+    try:
+        grants = [
+            _sign_grant(request, user, body.list_id, geoids, spec, slot)
+            for spec, slot in zip(body.grants, slots)
+        ]
+        db.add_all(grants)
+        db.flush()
+
+        MealStore(request.app.state.issuer).append_events(db, [_issued_event(user, g) for g in grants])
+        db.commit()
+    except Exception:
+        allocator.give_back(slots)
+        raise
+
+    return [
+        GrantWithCredential(credential=g.credential, **_grant_out(g).model_dump()) for g in grants
+    ]
 
 
 @router.get("/issued", response_model=list[GrantOut])
@@ -158,21 +241,114 @@ def grants_received(
             )
         ).scalars()
     )
-    issuer = request.app.state.issuer
-    store = MealStore(issuer)
-    for g in rows:
-        store.append_event(
-            db,
-            meal_key=g.list_id,
-            event_type="grant.retrieved",
-            author_account=user.hub_account_id,
-            payload={"jti": g.jti},
-            geoid=g.list_id,
-        )
+    MealStore(request.app.state.issuer).append_events(db, (
+        MealEvent(g.list_id, "grant.retrieved", user.hub_account_id, {"jti": g.jti}, geoid=g.list_id)
+        for g in rows
+    ))
     db.commit()
     return [GrantWithCredential(credential=g.credential, **_grant_out(g).model_dump()) for g in rows]
 
 
+def _present_merkle(request: Request, db: Session, credential: str, geoids: list[str]) -> str:
+    """Attach a multiproof for ``geoids``, sliced from the stored levels of the credential's FieldList.
+
+    The FieldList is the one its grant was issued from: ListIDs are unique
+    per owner only, so two owners may hold lists with the same ListID.
+    """
+    try:
+        claims = sdjwt.verify(credential, request.app.state.issuer.verification_key).claims
+    except sdjwt.VerificationError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    owner_id = db.execute(
+        select(Grant.issuer_user_id).where(Grant.jti == claims.get("jti"), Grant.list_id == claims["sub"])
+    ).scalar_one_or_none()
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="grant not found")
+    fieldlist = db.execute(
+        select(FieldList).where(FieldList.list_id == claims["sub"], FieldList.owner_id == owner_id)
+    ).scalar_one_or_none()
+    if fieldlist is None:
+        raise HTTPException(status_code=404, detail="fieldlist not found")
+    try:
+        proof = fieldlist_service.multiproof(db, fieldlist, geoids)
+        if db.dirty:
+            db.commit()  # keep positions or levels backfilled by multiproof
+        return sdjwt.present_merkle(credential, geoids, proof)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+@router.post("/present", response_model=PresentationOut)
+def present_credential(
+    body: PresentRequest,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Holder convenience: cut a credential down to the disclosures for the
+    GeoIDs a request needs (e.g. the X-Field-Grant header for one field).
+    For a Merkle-profile credential of this issuer, attach the membership
+    proof for those GeoIDs instead."""
+    try:
+        if sdjwt.profile(body.credential) == sdjwt.MERKLE_VCT:
+            presentation = _present_merkle(request, db, body.credential, body.geoids)
+        else:
+            presentation = sdjwt.present(body.credential, body.geoids)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    return PresentationOut(presentation=presentation, geoids=sorted(set(body.geoids)))
+
+
+def _revoke(request: Request, db: Session, user: User, grants: List[Grant]) -> None:
+    """Record the revocation of active ``grants`` in the open transaction:
+    status bits (one pass per shard), grant rows (one UPDATE), MEAL packets,
+    and hub outbox entries."""
+    settings = request.app.state.settings
+    statuslist_service.revoke_slots(
+        db,
+        [StatusSlot(g.status_list_shard, g.status_list_index) for g in grants],
+        settings.status_list_size,
+        settings.status_list_index_start,
+    )
+    # The ORM update also refreshes the loaded Grant objects (synchronize_session).
+    db.execute(
+        update(Grant)
+        .where(Grant.id.in_([g.id for g in grants]))
+        .values(status="revoked", revoked_at=datetime.now(timezone.utc))
+    )
+
+    MealStore(request.app.state.issuer).append_events(db, (
+        MealEvent(
+            meal_key=grant.list_id,
+            event_type="grant.revoked",
+            author_account=user.hub_account_id,
+            payload={
+                "jti": grant.jti,
+                "status_list_shard": grant.status_list_shard,
+                "status_list_index": grant.status_list_index,
+            },
+            geoid=grant.list_id,
+        )
+        for grant in grants
+    ))
+
+    # Reported to the hub by the background dispatcher once this commits.
+    if settings.hub_url:
+        hub_outbox.enqueue(db, (
+            {
+                "jti": g.jti,
+                "status_list_uri": request.app.state.status_lists.uri(g.status_list_shard),
+                "status_list_index": g.status_list_index,
+            }
+            for g in grants
+        ))
+
+
+def _wake_hub_reporter(request: Request) -> None:
+    if request.app.state.hub_reporter is not None:
+        request.app.state.hub_reporter.notify()
+
+
 @router.post("/revoke", response_model=GrantOut)
 def revoke_grant(
     body: RevokeRequest,
@@ -180,87 +356,155 @@ def revoke_grant(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    settings = request.app.state.settings
     grant = db.execute(select(Grant).where(Grant.jti == body.jti)).scalar_one_or_none()
     if grant is None or grant.issuer_user_id != user.id:
         raise HTTPException(status_code=404, detail="grant not found")
     if grant.status == "revoked":
         return _grant_out(grant)
 
-    # Guardrail: revocation is recorded (bit + row + audit packet) BEFORE this
-    # endpoint returns success.
-    statuslist_service.revoke_index(
-        db, grant.status_list_index, settings.status_list_size, settings.status_list_index_start
-    )
-    grant.status = "revoked"
-    grant.revoked_at = datetime.now(timezone.utc)
-
-    MealStore(request.app.state.issuer).append_event(
-        db,
-        meal_key=grant.list_id,
-        event_type="grant.revoked",
-        author_account=user.hub_account_id,
-        payload={"jti": grant.jti, "status_list_index": grant.status_list_index},
-        geoid=grant.list_id,
-    )
+    # Guardrail: revocation is recorded (bit + row + audit packet + hub outbox
+    # entry) BEFORE this endpoint returns success.
+    _revoke(request, db, user, [grant])
     db.commit()
+    _wake_hub_reporter(request)
+    return _grant_out(grant)
 
-    # Report to the hub revocation registry when configured.
-    if settings.hub_url:
-        try:
-            httpx.post(
-                f"{settings.hub_url.rstrip('/')}/revocations",
-                json={
-                    "jti": grant.jti,
-                    "status_list_uri": settings.status_list_uri,
-                    "status_list_index": grant.status_list_index,
-                },
-                timeout=10,
-            ).raise_for_status()
-        except httpx.HTTPError as e:
-            # Local revocation already durable; surface the reporting failure.
-            raise HTTPException(
-                status_code=502,
-                detail=f"grant revoked locally but hub report failed: {e}",
-            ) from e
 
-    return _grant_out(grant)
+@router.post("/revoke-batch", response_model=RevokeBatchOut)
+def revoke_grants_batch(
+    body: RevokeBatchRequest,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Revoke every grant I issued that matches the selectors (jtis, grantee
+    account, ListID; combined with AND) in one transaction: one status-list
+    pass per shard, one grant UPDATE, all MEAL packets, one commit."""
+    query = select(Grant).where(Grant.issuer_user_id == user.id).order_by(Grant.id)
+    if body.jtis is not None:
+        query = query.where(Grant.jti.in_(body.jtis))
+    if body.grantee_account is not None:
+        query = query.where(Grant.grantee_account == body.grantee_account)
+    if body.list_id is not None:
+        query = query.where(Grant.list_id == body.list_id)
+    matched = db.execute(query).scalars().all()
+
+    active = [g for g in matched if g.status != "revoked"]
+    already = [g.jti for g in matched if g.status == "revoked"]
+    found = {g.jti for g in matched}
+    not_found = [jti for jti in dict.fromkeys(body.jtis or []) if jti not in found]
+
+    if active:
+        _revoke(request, db, user, active)
+        db.commit()
+    _wake_hub_reporter(request)
+    return RevokeBatchOut(revoked=[g.jti for g in active], already_revoked=already, not_found=not_found)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2).
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _known_shard(db: Session, shard: int) -> int:
+    if shard >= statuslist_service.shard_count(db):
+        raise HTTPException(status_code=404, detail="status list not found")
+    return shard
+
+
+def _status_list_document(request: Request, db: Session, shard: int) -> Response:
+    settings = request.app.state.settings
+    shards = request.app.state.status_lists
 
+    def render(version: int, encoded: str) -> bytes:
+        return StatusListOut(
+            uri=shards.uri(shard), encoded=encoded, size=settings.status_list_size, version=version
+        ).model_dump_json().encode()
 
-@router.get("/status-list", response_model=StatusListOut)
-def status_list(request: Request, db: Session = Depends(get_db)):
-    """Public revocation bitstring (StatusList2021-style). No auth: it leaks
-    nothing but revocation bits."""
+    version, body = shards[shard].published(db, render)
+    headers = {
+        "ETag": f'"statuslist-{shard}-{version}"',
+        "Cache-Control": f"public, max-age={settings.status_list_max_age}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _status_list_delta(request: Request, db: Session, shard: int, since: int) -> StatusListChangesOut:
     settings = request.app.state.settings
-    encoded = statuslist_service.encoded_list(
-        db, settings.status_list_size, settings.status_list_index_start
+    cache = request.app.state.status_lists[shard]
+    version, _ = cache.snapshot(db)
+    indices = statuslist_service.changes_between(
+        db, since, version, settings.status_list_max_delta, shard
     )
-    return StatusListOut(uri=settings.status_list_uri, encoded=encoded, size=settings.status_list_size)
+    if indices is not None:
+        return StatusListChangesOut(version=version, since=since, indices=indices)
+    full = StatusListOut(
+        uri=request.app.state.status_lists.uri(shard),
+        encoded=cache.encoded(db),
+        size=settings.status_list_size,
+        version=version,
+    )
+    return StatusListChangesOut(version=version, since=since, full=full)
 
 
-@router.post("/verify")
-def verify_credential(
+@router.get("/status-list", response_model=StatusListOut)
+def status_list(request: Request, db: Session = Depends(get_db)):
+    """Public revocation bitstring (StatusList2021-style), shard 0. No auth:
+    it leaks nothing but revocation bits.
+
+    Every verifier polls this, so the serialized body is cached per list
+    version and served with a strong ETag; a matching If-None-Match gets 304.
+    """
+    return _status_list_document(request, db, 0)
+
+
+@router.get("/status-list/changes", response_model=StatusListChangesOut)
+def status_list_changes(
     request: Request,
-    credential: str = Body(..., embed=True),
+    since: int = Query(ge=0),
     db: Session = Depends(get_db),
 ):
-    """Relying-party convenience endpoint: verify a credential issued by THIS
-    instance (signature, expiry, revocation bit). AR nodes embed the same
-    logic locally via pancake_services.grants.sdjwt."""
-    settings = request.app.state.settings
-    issuer = request.app.state.issuer
+    """Revocations after version ``since`` (the ``version`` of the list a
+    verifier last fetched). Returns the indices set since then, or the full list when the
+    gap exceeds STATUS_LIST_MAX_DELTA or cannot be replayed. Apply with
+    ``pancake_services.grants.statuslist.apply_changes``."""
+    return _status_list_delta(request, db, 0, since)
+
+
+@router.get("/status-list/{shard}", response_model=StatusListOut)
+def status_list_shard(request: Request, shard: int = Path(ge=0), db: Session = Depends(get_db)):
+    """Status-list shard ``shard`` (the URI in credentials issued after rollover)."""
+    return _status_list_document(request, db, _known_shard(db, shard))
+
+
+@router.get("/status-list/{shard}/changes", response_model=StatusListChangesOut)
+def status_list_shard_changes(
+    request: Request,
+    shard: int = Path(ge=0),
+    since: int = Query(ge=0),
+    db: Session = Depends(get_db),
+):
+    """Delta feed for one shard; see GET /grants/status-list/changes."""
+    return _status_list_delta(request, db, _known_shard(db, shard), since)
+
+
+StatusRef = Optional[Tuple[str, int]]  # (status_list uri, idx) still to check
+
+
+def _verification(credential: str, key) -> Tuple[dict, StatusRef]:
+    """Signature/expiry/disclosure outcome plus the status entry still to check."""
     try:
-        result = sdjwt.verify(credential, issuer.public_key_pem)
+        result = sdjwt.verify(credential, key)
     except sdjwt.VerificationError as e:
-        return {"valid": False, "reason": str(e)}
+        return {"valid": False, "reason": str(e)}, None
 
     status = result.claims.get("status", {}).get("status_list", {})
-    idx = status.get("idx")
-    if idx is not None and statuslist_service.is_revoked(
-        db, idx, settings.status_list_size, settings.status_list_index_start
-    ):
-        return {"valid": False, "reason": "credential revoked"}
-
+    ref = (status.get("uri", ""), status["idx"]) if status.get("idx") is not None else None
     return {
         "valid": True,
         "claims": {
@@ -272,4 +516,96 @@ def verify_credential(
             "jti": result.claims["jti"],
         },
         "disclosed_geoids": result.disclosed_geoids,
-    }
+    }, ref
+
+
+def _checked_status(
+    outcome: dict, ref: StatusRef, shards, is_revoked: Callable[[int, int], bool]
+) -> dict:
+    """Apply the revocation check to a verification outcome, looking up the credential's shard."""
+    if ref is None:
+        return outcome
+    uri, idx = ref
+    shard = shards.shard_of(uri)
+    if shard is None:
+        return {"valid": False, "reason": "unknown status list"}
+    if is_revoked(shard, idx):
+        return {"valid": False, "reason": "credential revoked"}
+    return outcome
+
+
+def _verify_chunk(public_key_pem: bytes, credentials: List[str]) -> List[Tuple[dict, StatusRef]]:
+    # Runs in a worker process.
+    key = public_key_from_pem(public_key_pem)
+    return [_verification(c, key) for c in credentials]
+
+
+def _verified_in_order(
+    issuer, credentials: List[str], workers: int, pool: Optional[Executor]
+) -> Iterator[Tuple[dict, StatusRef]]:
+    """Verify ``credentials`` in input order, with at most ``2 * workers`` chunks
+    in flight on the app's shared ``pool`` (in-process without one)."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or pool is None:
+        for credential in credentials:
+            yield _verification(credential, issuer.verification_key)
+        return
+    chunks = (
+        credentials[i:i + VERIFY_BATCH_CHUNK] for i in range(0, len(credentials), VERIFY_BATCH_CHUNK)
+    )
+    pending: deque = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(_verify_chunk, issuer.public_key_pem, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # A client that disconnects mid-stream must not leave its queued chunks running.
+        for future in pending:
+            future.cancel()
+
+
+@router.post("/verify")
+def verify_credential(
+    request: Request,
+    credential: str = Body(..., embed=True),
+    db: Session = Depends(get_db),
+):
+    """Relying-party convenience endpoint: verify a credential issued by THIS
+    instance (signature, expiry, revocation bit). AR nodes embed the same
+    checks locally via pancake_services.grants.verifier.Verifier."""
+    shards = request.app.state.status_lists
+    outcome, ref = _verification(credential, request.app.state.issuer.verification_key)
+    return _checked_status(outcome, ref, shards, lambda shard, idx: shards[shard].is_revoked(db, idx))
+
+
+@router.post("/verify-batch")
+def verify_credentials_batch(request: Request, body: VerifyBatchRequest):
+    """Verify a credential portfolio in one call; same outcome per credential
+    as POST /grants/verify. Each status-list shard is read once, signatures
+    are checked by a worker pool, and results stream back as NDJSON lines
+    ``{"index": i, ...}`` in input order."""
+    settings = request.app.state.settings
+    issuer = request.app.state.issuer
+    shards = request.app.state.status_lists
+
+    def lines() -> Iterator[str]:
+        snapshots: Dict[int, StatusList] = {}
+        # Own session: the response streams after request dependencies are closed.
+        with request.app.state.session_factory() as session:
+
+            def is_revoked(shard: int, idx: int) -> bool:
+                if shard not in snapshots:
+                    snapshots[shard] = shards[shard].snapshot(session)[1]
+                return snapshots[shard].is_revoked(idx)
+
+            verified = _verified_in_order(
+                issuer, body.credentials, settings.verify_batch_workers, request.app.state.worker_pool
+            )
+            for i, (outcome, ref) in enumerate(verified):
+                outcome = _checked_status(outcome, ref, shards, is_revoked)
+                yield json.dumps({"index": i, **outcome}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
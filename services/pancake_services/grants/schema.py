@@ -0,0 +1,143 @@
+"""In-place upgrade of a grants database created by an earlier release.
+
+The service builds its schema with ``create_all``, which creates missing
+tables but never alters existing ones. ``upgrade_schema`` runs after it at
+startup and brings older tables forward:
+
+- ``status_list_state`` rows holding the encoded bitstring (``encoded``)
+  are rewritten as shard 0's raw ``bits``;
+- columns added since (``meals.last_packet_id``, the ``mmr_*`` columns,
+  FieldList versions, member leaf positions, ``hub_outbox.failed_at``,
+  ``grants.status_list_shard``) are added, with their indexes; NOT NULL ones
+  need a server default;
+- ``grants``' unique status-list index becomes unique per (shard, index):
+  the table is rebuilt on SQLite, the constraint replaced elsewhere;
+- ``meals.participant_agents`` (the JSON participant list) is copied into
+  ``meal_participants`` and dropped.
+
+Every step checks the live schema first, so running it again is a no-op.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+from sqlalchemy import DateTime, Integer, Text, column, inspect, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import AddConstraint, CreateColumn
+
+from pancake_services.common.db import Base
+from pancake_services.grants.mealstore import MealStore
+from pancake_services.grants.models import Grant, StatusListState
+from pancake_services.grants.statuslist import StatusList
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Bring every table created by an earlier release up to the current models."""
+    if "encoded" in {c["name"] for c in inspect(engine).get_columns("status_list_state")}:
+        _convert_status_list(engine)
+    _add_missing_columns(engine)
+    uniques = inspect(engine).get_unique_constraints("grants")
+    if any(u["column_names"] == ["status_list_index"] for u in uniques):
+        _widen_status_slot_constraint(engine)
+    if "participant_agents" in {c["name"] for c in inspect(engine).get_columns("meals")}:
+        _move_participants(engine)
+
+
+def _convert_status_list(engine: Engine) -> None:
+    """Rebuild ``status_list_state`` from the single encoded-bitstring row it used to hold."""
+    old = table(
+        "status_list_state",
+        column("encoded", Text),
+        column("next_index", Integer),
+        column("updated_at", DateTime(timezone=True)),
+    )
+    with engine.begin() as conn:
+        row = conn.execute(old.select().order_by(text("id")).limit(1)).one_or_none()
+        conn.execute(text("DROP TABLE status_list_state"))
+        StatusListState.__table__.create(conn)
+        if row is None:
+            return
+        status = StatusList.decode(row.encoded)
+        bits = status.to_bytes()
+        conn.execute(
+            StatusListState.__table__.insert().values(
+                shard=0,
+                bits=bits,
+                # A missing row reads as an empty list at version 0, so a list
+                # with revocations starts at 1: delta clients then fetch it whole.
+                version=1 if any(bits) else 0,
+                next_index=row.next_index,
+                updated_at=row.updated_at,
+            )
+        )
+    logger.info("converted status_list_state to raw bits (%d-bit shard 0)", status.size)
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    existing_tables = set(inspect(engine).get_table_names())
+    for model in Base.metadata.sorted_tables:
+        if model.name not in existing_tables:
+            continue
+        present = {c["name"] for c in inspect(engine).get_columns(model.name)}
+        missing = [c for c in model.columns if c.name not in present]
+        if not missing:
+            continue
+        required = [c.name for c in missing if not c.nullable and c.server_default is None]
+        if required:
+            raise RuntimeError(
+                f"cannot upgrade table {model.name}: missing NOT NULL columns {', '.join(required)}"
+            )
+        with engine.begin() as conn:
+            for added in missing:
+                ddl = CreateColumn(added).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {model.name} ADD COLUMN {ddl}"))
+                logger.info("added column %s.%s", model.name, added.name)
+        for index in model.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def _widen_status_slot_constraint(engine: Engine) -> None:
+    """Replace grants' UNIQUE (status_list_index) with UNIQUE (status_list_shard, status_list_index)."""
+    grants = Grant.__table__
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            # SQLite cannot drop a constraint: copy the rows into a rebuilt table.
+            for index in inspect(conn).get_indexes("grants"):
+                conn.execute(text(f"DROP INDEX {index['name']}"))
+            conn.execute(text("ALTER TABLE grants RENAME TO _grants_old"))
+            grants.create(conn)
+            columns = ", ".join(c.name for c in grants.columns)
+            conn.execute(text(f"INSERT INTO grants ({columns}) SELECT {columns} FROM _grants_old"))
+            conn.execute(text("DROP TABLE _grants_old"))
+        else:
+            for unique in inspect(conn).get_unique_constraints("grants"):
+                if unique["column_names"] == ["status_list_index"]:
+                    conn.execute(text(f"ALTER TABLE grants DROP CONSTRAINT {unique['name']}"))
+            slot = next(c for c in grants.constraints if c.name == "uq_grant_status_slot")
+            conn.execute(AddConstraint(slot))
+    logger.info("grants: status-list indices are now unique per shard")
+
+
+def _move_participants(engine: Engine) -> None:
+    participants: Dict[Tuple[str, str], datetime] = {}
+    with Session(engine) as db:
+        for meal_id, agents in db.execute(text("SELECT meal_id, participant_agents FROM meals")):
+            if isinstance(agents, str):
+                agents = json.loads(agents)
+            for agent in agents or []:
+                joined_at = agent.get("joined_at")
+                participants.setdefault(
+                    (meal_id, agent["agent_id"]),
+                    datetime.fromisoformat(joined_at) if joined_at else datetime.now(timezone.utc),
+                )
+        if participants:
+            MealStore.add_participants(db, participants)
+        db.execute(text("ALTER TABLE meals DROP COLUMN participant_agents"))
+        db.commit()
+    logger.info("moved %d MEAL participants out of meals.participant_agents", len(participants))
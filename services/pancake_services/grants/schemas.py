@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class FieldListCreate(BaseModel):
@@ -17,6 +17,22 @@ class FieldListOut(BaseModel):
     name: str
     geoids: List[str]
     created_at: datetime
+    superseded_by: Optional[str] = None
+
+
+class FieldListUpdate(BaseModel):
+    add: List[str] = Field(default_factory=list)
+    remove: List[str] = Field(default_factory=list)
+    name: Optional[str] = Field(default=None, min_length=1, max_length=256)
+
+
+class FieldListUpdateOut(BaseModel):
+    list_id: str
+    previous_list_id: str
+    name: str
+    geoid_count: int
+    added: List[str]
+    removed: List[str]
 
 
 class InclusionProofOut(BaseModel):
@@ -25,14 +41,48 @@ class InclusionProofOut(BaseModel):
     proof: List[dict]
 
 
-class GrantIssueRequest(BaseModel):
-    list_id: str = Field(min_length=64, max_length=64)
+class MultiProofRequest(BaseModel):
+    geoids: List[str] = Field(min_length=1, max_length=10000)
+
+
+class MultiProofOut(BaseModel):
+    list_id: str
+    geoids: List[str]
+    leaf_count: int
+    indices: List[int]
+    nodes: List[str]
+
+
+class ConsistencyProofOut(BaseModel):
+    old_list_id: str
+    new_list_id: str
+    old_count: int
+    new_count: int
+    added: List[str]
+
+
+class GrantSpec(BaseModel):
     grantee_account: str = Field(min_length=1, max_length=128)
     purpose: str = Field(min_length=1, max_length=256)
     validity_days: int = Field(default=30, ge=1, le=365)
     masking_level: str = Field(default="L1", pattern="^L[12]$")
 
 
+# "merkle": the credential commits to the ListID only; presentations carry membership proofs.
+GrantProfile = Literal["sd-jwt", "merkle"]
+
+
+class GrantIssueRequest(GrantSpec):
+    list_id: str = Field(min_length=64, max_length=64)
+    profile: GrantProfile = "sd-jwt"
+
+
+class GrantBatchIssueRequest(BaseModel):
+    list_id: str = Field(min_length=64, max_length=64)
+    profile: GrantProfile = "sd-jwt"
+    grants: List[GrantSpec] = Field(min_length=1, max_length=1000)
+
+
 class GrantOut(BaseModel):
     jti: str
     list_id: str
@@ -40,6 +90,7 @@ class GrantOut(BaseModel):
     purpose: str
     masking_level: str
     status: str
+    status_list_shard: int = 0
     status_list_index: int
     expires_at: datetime
     created_at: datetime
@@ -50,11 +101,53 @@ class GrantWithCredential(GrantOut):
     credential: str
 
 
+class PresentRequest(BaseModel):
+    credential: str
+    geoids: List[str] = Field(min_length=1)
+
+
+class PresentationOut(BaseModel):
+    presentation: str
+    geoids: List[str]
+
+
 class RevokeRequest(BaseModel):
     jti: str
 
 
+class RevokeBatchRequest(BaseModel):
+    # Selectors combine (AND); at least one is required.
+    jtis: Optional[List[str]] = Field(default=None, min_length=1, max_length=10000)
+    grantee_account: Optional[str] = Field(default=None, min_length=1, max_length=128)
+    list_id: Optional[str] = Field(default=None, min_length=64, max_length=64)
+
+    @model_validator(mode="after")
+    def _has_selector(self) -> "RevokeBatchRequest":
+        if self.jtis is None and self.grantee_account is None and self.list_id is None:
+            raise ValueError("give jtis, grantee_account, or list_id")
+        return self
+
+
+class RevokeBatchOut(BaseModel):
+    revoked: List[str]
+    already_revoked: List[str]
+    not_found: List[str]  # requested jtis that matched none of this issuer's grants
+
+
+class VerifyBatchRequest(BaseModel):
+    credentials: List[str] = Field(min_length=1, max_length=10000)
+
+
 class StatusListOut(BaseModel):
     uri: str
     encoded: str
     size: int
+    version: int  # bumped on every revocation; pass as ``since`` to /status-list/changes
+
+
+class StatusListChangesOut(BaseModel):
+    # Either ``indices`` revoked after ``since``, or the ``full`` list when the gap is too large.
+    version: int
+    since: int
+    indices: Optional[List[int]] = None
+    full: Optional[StatusListOut] = None
@@ -4,6 +4,12 @@ Implements the subset of draft-ietf-oauth-sd-jwt-vc that the field-access
 grant profile needs: EdDSA-signed JWT with SHA-256 selective-disclosure
 digests (flat `fields` claims) in compact serialization
 ``<jwt>~<disclosure1>~...~``.
+
+The Merkle profile (``MERKLE_VCT``) is the alternative for very large
+FieldLists: the JWT commits to the members only through ``sub`` (the
+ListID, i.e. the Merkle root), and a presentation carries one multiproof
+for the GeoIDs it needs, ``<jwt>~<proof>~``. Issuance is O(1) and
+verification O(k log n) instead of one disclosure per member.
 """
 from __future__ import annotations
 
@@ -13,11 +19,17 @@ import json
 import secrets
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 import jwt as pyjwt
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+from pancake_services.grants import merkle
 
 VCT = "agstack.org/credentials/field-access-grant/v1"
+MERKLE_VCT = "agstack.org/credentials/field-access-grant-merkle/v1"
+PROFILES = (VCT, MERKLE_VCT)
 CLOCK_SKEW_SECONDS = 300
 
 
@@ -51,15 +63,22 @@ class VerifiedGrant:
     def disclosed_geoids(self) -> List[str]:
         return [v for k, v in sorted(self.disclosed.items()) if k.startswith("fields.")]
 
+    @cached_property
+    def disclosed_geoid_set(self) -> FrozenSet[str]:
+        """Disclosed GeoIDs for O(1) membership checks."""
+        return frozenset(v for k, v in self.disclosed.items() if k.startswith("fields."))
+
 
 def issue(
     claims: Dict[str, Any],
     disclosable_geoids: List[str],
-    private_key_pem: bytes,
+    private_key_pem: Union[bytes, Ed25519PrivateKey],
     kid: str,
 ) -> str:
     """Issue an SD-JWT VC. GeoIDs go in as selectively disclosable claims.
 
+    The key may be PEM bytes or an already-parsed key object
+    (``IssuerIdentity.signing_key``), which skips PEM parsing per call.
     Returns the compact serialization: <jwt>~<disclosure1>~...~
     """
     payload = dict(claims)
@@ -86,6 +105,66 @@ def issue(
     return "~".join([token, *disclosures]) + "~"
 
 
+def issue_merkle(
+    claims: Dict[str, Any],
+    private_key_pem: Union[bytes, Ed25519PrivateKey],
+    kid: str,
+) -> str:
+    """Issue a Merkle-profile credential over the FieldList named by ``claims["sub"]``.
+
+    No per-GeoID work: the ListID already commits to the members. Returns
+    ``<jwt>~``; holders attach a membership proof with ``present_merkle``.
+    """
+    payload = dict(claims)
+    payload["vct"] = MERKLE_VCT
+    payload.setdefault("iat", int(time.time()))
+    token = pyjwt.encode(
+        payload,
+        private_key_pem,
+        algorithm="EdDSA",
+        headers={"typ": "vc+sd-jwt", "kid": kid},
+    )
+    return token + "~"
+
+
+def present_merkle(credential: str, geoids: Iterable[str], proof: Dict[str, Any]) -> str:
+    """Holder side: attach a multiproof (``MerkleTree.multiproof``) for ``geoids``.
+
+    Returns ``<jwt>~<b64url(JSON proof)>~``; any proof already attached is
+    replaced.
+    """
+    token, _ = _split(credential)
+    body = {
+        "geoids": sorted(set(geoids)),
+        "leaf_count": proof["leaf_count"],
+        "indices": proof["indices"],
+        "nodes": proof["nodes"],
+    }
+    return f"{token}~{_b64url(json.dumps(body, separators=(',', ':')).encode('utf-8'))}~"
+
+
+def _merkle_disclosed(
+    claims: Dict[str, Any], segments: List[str], wanted: Optional[FrozenSet[str]]
+) -> Dict[str, Any]:
+    """GeoIDs proven members of ``sub`` by the presented multiproof, as ``fields.<leaf index>``."""
+    if not segments:
+        return {}
+    if len(segments) > 1:
+        raise VerificationError("merkle presentation carries more than one proof")
+    try:
+        proof = json.loads(_b64url_decode(segments[0]))
+        geoids = sorted(set(proof["geoids"]))
+    except (ValueError, TypeError, KeyError) as e:
+        raise VerificationError(f"malformed membership proof: {e}") from e
+    if not merkle.verify_multiproof(geoids, proof, str(claims.get("sub", ""))):
+        raise VerificationError("membership proof does not verify against sub")
+    return {
+        f"fields.{i}": g
+        for i, g in zip(proof["indices"], geoids)
+        if wanted is None or g in wanted
+    }
+
+
 def _split(sd_jwt: str) -> Tuple[str, List[str]]:
     if "~" not in sd_jwt:
         return sd_jwt, []
@@ -93,20 +172,64 @@ def _split(sd_jwt: str) -> Tuple[str, List[str]]:
     return parts[0], [p for p in parts[1:] if p]
 
 
+def present(sd_jwt: str, geoids: List[str]) -> str:
+    """Holder side: keep only the disclosures for ``geoids``.
+
+    Returns ``<jwt>~<only-those-disclosures>~`` -- still verifiable with
+    ``verify`` but a fraction of the size of a large-list credential. Raises
+    ValueError if the credential discloses none of a requested GeoID.
+    """
+    token, disclosures = _split(sd_jwt)
+    wanted = set(geoids)
+    kept: List[str] = []
+    found = set()
+    for encoded in disclosures:
+        try:
+            _, claim_name, value = json.loads(_b64url_decode(encoded))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"malformed disclosure: {e}") from e
+        if str(claim_name).startswith("fields.") and value in wanted:
+            kept.append(encoded)
+            found.add(value)
+    missing = wanted - found
+    if missing:
+        raise ValueError(f"credential has no disclosure for GeoID: {min(missing)}")
+    return "~".join([token, *kept]) + "~"
+
+
 def peek_claims(sd_jwt: str) -> Dict[str, Any]:
     """Decode claims WITHOUT verification (for routing/status lookups only)."""
     token, _ = _split(sd_jwt)
     return pyjwt.decode(token, options={"verify_signature": False})
 
 
+def profile(sd_jwt: str) -> Optional[str]:
+    """The credential's ``vct`` WITHOUT verification; None if it does not decode."""
+    try:
+        return peek_claims(sd_jwt).get("vct")
+    except pyjwt.PyJWTError:
+        return None
+
+
 def verify(
     sd_jwt: str,
-    public_key_pem: bytes,
-    expected_vct: str = VCT,
+    public_key_pem: Union[bytes, Ed25519PublicKey],
+    expected_vct: Optional[str] = None,
     now: Optional[int] = None,
+    geoids: Optional[Iterable[str]] = None,
 ) -> VerifiedGrant:
     """Verify signature, temporal validity, vct, and all presented disclosures.
 
+    Like ``issue``, accepts PEM bytes or a parsed key
+    (``IssuerIdentity.verification_key``). Both credential profiles are
+    accepted unless ``expected_vct`` names one; for ``MERKLE_VCT`` the
+    GeoIDs proven by the attached multiproof are returned as disclosed.
+
+    With ``geoids``, only the disclosures for those GeoIDs are validated and
+    returned; the rest are skipped without hashing or JSON-decoding (a cheap
+    byte search on each decoded disclosure picks the candidates). Use this
+    when the caller only needs to know whether specific GeoIDs are covered.
+
     Status-list (revocation) checking is a separate step -- see statuslist.py --
     because the verifier may need to fetch the list out-of-band.
     """
@@ -134,19 +257,32 @@ def verify(
     if iat is not None and int(iat) > now + CLOCK_SKEW_SECONDS:
         raise VerificationError("credential issued in the future")
 
-    if claims.get("vct") != expected_vct:
+    if claims.get("vct") not in ((expected_vct,) if expected_vct else PROFILES):
         raise VerificationError(f"unexpected vct: {claims.get('vct')}")
 
+    wanted = None if geoids is None else frozenset(geoids)
+    if claims["vct"] == MERKLE_VCT:
+        return VerifiedGrant(claims=claims, disclosed=_merkle_disclosed(claims, disclosures, wanted))
+    needles = None if wanted is None else [json.dumps(g).encode("utf-8") for g in wanted]
     disclosed: Dict[str, Any] = {}
     if disclosures:
         sd_digests = set(claims.get("_sd", []))
         if claims.get("_sd_alg", "sha-256") != "sha-256":
             raise VerificationError("unsupported _sd_alg")
         for encoded in disclosures:
+            if needles is not None:
+                try:
+                    raw = _b64url_decode(encoded)
+                except ValueError as e:
+                    raise VerificationError(f"malformed disclosure: {e}") from e
+                if not any(needle in raw for needle in needles):
+                    continue
             digest = _b64url(hashlib.sha256(encoded.encode("ascii")).digest())
             if digest not in sd_digests:
                 raise VerificationError("disclosure digest not present in _sd")
             salt, claim_name, value = json.loads(_b64url_decode(encoded))
+            if wanted is not None and value not in wanted:
+                continue  # the needle matched elsewhere in the disclosure
             disclosed[claim_name] = value
 
     return VerifiedGrant(claims=claims, disclosed=disclosed)
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import base64
 import zlib
+from typing import Any, Dict, Optional
 
 DEFAULT_SIZE = 65536  # bits; hub-allocated range size for one issuer
 
@@ -45,12 +46,34 @@ class StatusList:
         byte, bit = divmod(index, 8)
         return bool(self._bits[byte] & (1 << bit))
 
-    def encode(self) -> str:
-        return _b64url(zlib.compress(bytes(self._bits)))
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
 
     @classmethod
-    def decode(cls, encoded: str) -> "StatusList":
-        raw = zlib.decompress(_b64url_decode(encoded))
+    def from_bytes(cls, raw: bytes) -> "StatusList":
         sl = cls(size=len(raw) * 8)
         sl._bits = bytearray(raw)
         return sl
+
+    def encode(self) -> str:
+        return _b64url(zlib.compress(bytes(self._bits)))
+
+    @classmethod
+    def decode(cls, encoded: str) -> "StatusList":
+        return cls.from_bytes(zlib.decompress(_b64url_decode(encoded)))
+
+
+def apply_changes(status: Optional[StatusList], changes: Dict[str, Any]) -> StatusList:
+    """Bring a local copy up to date from a ``GET /grants/status-list/changes`` response.
+
+    Sets the listed indices in place, or returns a freshly decoded list when the
+    server fell back to the full bitstring. Remember ``changes["version"]`` and
+    send it as ``since`` on the next poll.
+    """
+    if changes.get("full") is not None:
+        return StatusList.decode(changes["full"]["encoded"])
+    if status is None:
+        raise ValueError("delta response needs a local status list to apply to")
+    for index in changes["indices"]:
+        status.set(index, True)
+    return status
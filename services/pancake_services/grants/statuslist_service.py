@@ -1,44 +1,432 @@
-"""Persistence and index allocation for the issuer's revocation status list."""
+"""Persistence and index allocation for the issuer's revocation status lists.
+
+Indices are handed out from one allocation sequence (positions) that is cut
+into shards of ``size`` bits. Shard 0 is published at the configured
+``status_list_uri``; shard ``k`` at ``{status_list_uri}/k``. When a shard
+fills up, issuance rolls over to the next one, so every list stays small.
+"""
 from __future__ import annotations
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+import heapq
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session, sessionmaker
+from ulid import ULID
 
-from pancake_services.grants.models import StatusListState
+from pancake_services.grants.models import Grant, StatusIndexBlock, StatusListChange, StatusListState
 from pancake_services.grants.statuslist import StatusList
 
 
-def _get_or_create(db: Session, size: int, index_start: int) -> StatusListState:
-    state = db.execute(select(StatusListState)).scalar_one_or_none()
+class StatusSlot(NamedTuple):
+    shard: int
+    index: int  # the ``idx`` claim: bit position within the shard's list
+
+
+def slot_at(position: int, size: int, index_start: int) -> StatusSlot:
+    shard, offset = divmod(position - index_start, size)
+    return StatusSlot(shard, index_start + offset)
+
+
+def position_of(slot: StatusSlot, size: int) -> int:
+    """Inverse of ``slot_at``."""
+    return slot.shard * size + slot.index
+
+
+def shard_uri(base_uri: str, shard: int) -> str:
+    return base_uri if shard == 0 else f"{base_uri.rstrip('/')}/{shard}"
+
+
+def shard_of(uri: str, base_uri: str) -> Optional[int]:
+    """Shard published at ``uri``, or None if it is not one of this issuer's lists."""
+    if uri == base_uri:
+        return 0
+    prefix = base_uri.rstrip("/") + "/"
+    suffix = uri[len(prefix):] if uri.startswith(prefix) else ""
+    return int(suffix) if suffix.isdigit() and not suffix.startswith("0") else None
+
+
+def _get_or_create(
+    db: Session, size: int, index_start: int, shard: int = 0, for_update: bool = False
+) -> StatusListState:
+    query = select(StatusListState).where(StatusListState.shard == shard)
+    if for_update:
+        # populate_existing: a row already in the session must be re-read under the lock.
+        query = query.with_for_update().execution_options(populate_existing=True)
+    state = db.execute(query).scalar_one_or_none()
     if state is None:
-        state = StatusListState(encoded=StatusList(size).encode(), next_index=index_start)
+        state = StatusListState(
+            shard=shard, bits=StatusList(size).to_bytes(), version=0, next_index=index_start
+        )
         db.add(state)
         db.flush()
     return state
 
 
-def allocate_index(db: Session, size: int, index_start: int) -> int:
-    """Allocate the next status-list index within this issuer's hub-assigned range."""
-    state = _get_or_create(db, size, index_start)
-    index = state.next_index
-    if index >= index_start + size:
+def shard_count(db: Session) -> int:
+    """Shards that exist so far (shard 0 always does, even before first use)."""
+    latest = db.execute(select(StatusListState.shard).order_by(StatusListState.shard.desc())).first()
+    return (latest[0] if latest else 0) + 1
+
+
+def reserve_range(db: Session, count: int, size: int, index_start: int, max_shards: int = 1) -> range:
+    """Advance the allocation cursor by up to ``count`` positions within one shard.
+
+    Starts the next shard when the current one is full; raises once
+    ``max_shards`` (0 = unlimited) would be exceeded.
+    """
+    cursor = _get_or_create(db, size, index_start, for_update=True)
+    start = cursor.next_index
+    shard = (start - index_start) // size
+    if max_shards and shard >= max_shards:
         raise RuntimeError("status list index range exhausted; request a new range from the hub")
-    state.next_index = index + 1
+    end = min(start + count, index_start + (shard + 1) * size)
+    if shard:
+        _get_or_create(db, size, index_start, shard)
+    cursor.next_index = end
     db.flush()
-    return index
+    return range(start, end)
+
+
+class StatusIndexAllocator:
+    """Hands out status-list indices from blocks reserved by this worker.
+
+    A block of ``block_size`` indices is claimed in one short transaction of
+    its own, so concurrent issuers no longer queue on the ``StatusListState``
+    row for every grant. Indices from an issuance that rolled back are given
+    back and reused first. ``release`` (called at shutdown) writes the unused
+    tail and any given-back runs as ownerless blocks, which the next claim by
+    any worker reuses before advancing the cursor. Blocks are tracked as
+    positions and handed out as ``StatusSlot`` (shard, index) pairs.
+
+    A claim is a lease of ``lease_seconds``, renewed (one UPDATE) once half of
+    it has passed. A worker that dies without ``release`` stops renewing, and
+    once its lease lapses another worker claims the block, resuming after the
+    last index a grant was issued from.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        size: int,
+        index_start: int,
+        block_size: int = 256,
+        max_shards: int = 1,
+        lease_seconds: float = 900,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.session_factory = session_factory
+        self.size = size
+        self.index_start = index_start
+        self.block_size = block_size
+        self.max_shards = max_shards
+        self.lease = timedelta(seconds=lease_seconds)
+        self.clock = clock
+        self.owner = str(ULID())
+        self._block_id: Optional[int] = None
+        self._claimed_at: Optional[datetime] = None
+        self._next = 0
+        self._end = 0
+        self._free: List[int] = []  # heap of given-back positions
+        self._lock = threading.Lock()
+
+    def take(self, count: int) -> List[StatusSlot]:
+        """``count`` unused slots, ascending within each block; contiguous when they fit."""
+        with self._lock:
+            taken: List[int] = []
+            try:
+                while len(taken) < count:
+                    if self._free:
+                        taken.append(heapq.heappop(self._free))
+                        continue
+                    if self._next < self._end and self.clock() - self._claimed_at >= self.lease / 2:
+                        self._renew()
+                    if self._next >= self._end:
+                        self._claim()
+                    n = min(count - len(taken), self._end - self._next)
+                    taken.extend(range(self._next, self._next + n))
+                    self._next += n
+            except Exception:
+                for position in taken:
+                    heapq.heappush(self._free, position)
+                raise
+            return [slot_at(position, self.size, self.index_start) for position in taken]
+
+    def give_back(self, slots: Iterable[StatusSlot]) -> None:
+        """Return slots whose issuance did not commit."""
+        with self._lock:
+            for slot in slots:
+                heapq.heappush(self._free, position_of(slot, self.size))
+
+    def _renew(self) -> None:
+        """Extend the lease on the current block; drop the block if it was lost to another worker."""
+        now = self.clock()
+        with self.session_factory() as db:
+            renewed = db.execute(
+                update(StatusIndexBlock)
+                .where(StatusIndexBlock.id == self._block_id, StatusIndexBlock.owner == self.owner)
+                .values(claimed_at=now)
+            ).rowcount
+            db.commit()
+        if renewed:
+            self._claimed_at = now
+        else:  # the lease lapsed and another worker reclaimed the block
+            self._block_id, self._next, self._end = None, 0, 0
 
+    def _claim(self) -> None:
+        now = self.clock()
+        with self.session_factory() as db:
+            if self._block_id is not None:  # the current block is used up
+                # Unless the lease lapsed and another worker has reclaimed it since.
+                db.execute(
+                    update(StatusIndexBlock)
+                    .where(StatusIndexBlock.id == self._block_id, StatusIndexBlock.owner == self.owner)
+                    .values(next_free=self._end, owner=None)
+                )
+            block = self._reclaim(db, now)
+            if block is None:
+                reserved = reserve_range(db, self.block_size, self.size, self.index_start, self.max_shards)
+                block = StatusIndexBlock(
+                    start=reserved.start,
+                    end=reserved.stop,
+                    next_free=reserved.start,
+                    owner=self.owner,
+                    claimed_at=now,
+                )
+                db.add(block)
+                db.flush()
+            db.commit()
+            self._block_id, self._next, self._end = block.id, block.next_free, block.end
+            self._claimed_at = now
 
-def revoke_index(db: Session, index: int, size: int, index_start: int) -> None:
-    state = _get_or_create(db, size, index_start)
-    status = StatusList.decode(state.encoded)
-    status.set(index, True)
-    state.encoded = status.encode()
+    def _reclaim(self, db: Session, now: datetime) -> Optional[StatusIndexBlock]:
+        """Claim a released block, or one whose owner's lease has lapsed."""
+        claimable = or_(StatusIndexBlock.owner.is_(None), StatusIndexBlock.claimed_at < now - self.lease)
+        candidates = db.execute(
+            select(StatusIndexBlock)
+            .where(claimable, StatusIndexBlock.next_free < StatusIndexBlock.end)
+            .order_by(StatusIndexBlock.start)
+            .limit(8)
+        ).scalars().all()
+        for block in candidates:
+            abandoned = block.owner is not None
+            claimed = db.execute(
+                update(StatusIndexBlock)
+                .where(StatusIndexBlock.id == block.id, claimable)
+                .values(owner=self.owner, claimed_at=now),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            if not claimed:  # another worker may have taken it between SELECT and UPDATE
+                continue
+            if abandoned:
+                # Its owner never wrote back next_free: skip what it issued before it died.
+                block.next_free = max(block.next_free, self._first_unissued(db, block))
+                if block.next_free >= block.end:
+                    block.owner = None
+                    db.flush()
+                    continue
+                db.flush()
+            return block
+        return None
+
+    def _first_unissued(self, db: Session, block: StatusIndexBlock) -> int:
+        """Position after the last grant issued from ``block`` (its start if none)."""
+        first = slot_at(block.start, self.size, self.index_start)
+        last = slot_at(block.end - 1, self.size, self.index_start)
+        top = db.execute(
+            select(func.max(Grant.status_list_index)).where(
+                Grant.status_list_shard == first.shard,
+                Grant.status_list_index.between(first.index, last.index),
+            )
+        ).scalar_one()
+        return block.start if top is None else position_of(StatusSlot(first.shard, top), self.size) + 1
+
+    def release(self) -> None:
+        """Hand the unused remainder back to the database for other workers."""
+        with self._lock:
+            free = sorted(self._free)
+            if self._block_id is None and not free:
+                return
+            with self.session_factory() as db:
+                if self._block_id is not None:
+                    db.execute(
+                        update(StatusIndexBlock)
+                        .where(StatusIndexBlock.id == self._block_id, StatusIndexBlock.owner == self.owner)
+                        .values(next_free=self._next, owner=None)
+                    )
+                for start, end in _runs(free):
+                    db.add(StatusIndexBlock(start=start, end=end, next_free=start, owner=None))
+                db.commit()
+            self._block_id, self._next, self._end, self._free = None, 0, 0, []
+
+
+def _runs(positions: List[int]) -> Iterable[tuple[int, int]]:
+    """Sorted positions as ``[start, end)`` runs of consecutive values."""
+    i = 0
+    while i < len(positions):
+        j = i
+        while j + 1 < len(positions) and positions[j + 1] == positions[j] + 1:
+            j += 1
+        yield positions[i], positions[j] + 1
+        i = j + 1
+
+
+def revoke_index(db: Session, index: int, size: int, index_start: int, shard: int = 0) -> None:
+    """Set one bit, bump the shard's version and record the change (no-op if already set)."""
+    revoke_slots(db, [StatusSlot(shard, index)], size, index_start)
+
+
+def revoke_slots(db: Session, slots: Iterable[StatusSlot], size: int, index_start: int) -> None:
+    """Set many bits with one read and one write per shard.
+
+    Each touched shard's version is bumped once, and every newly set index is
+    recorded under that version. Bits that are already set are skipped. The
+    shard row is locked (``SELECT ... FOR UPDATE``) before its bits are read,
+    and the version is incremented in SQL and read back, so concurrent
+    revocations never publish two different bitstrings under one version.
+    """
+    by_shard: Dict[int, List[int]] = {}
+    for slot in slots:
+        by_shard.setdefault(slot.shard, []).append(slot.index)
+    for shard, indices in sorted(by_shard.items()):
+        state = _get_or_create(db, size, index_start, shard, for_update=True)
+        status = StatusList.from_bytes(state.bits)
+        changed = sorted({index for index in indices if not status.is_revoked(index)})
+        if not changed:
+            continue
+        for index in changed:
+            status.set(index, True)
+        version = db.execute(
+            update(StatusListState)
+            .where(StatusListState.id == state.id)
+            .values(bits=status.to_bytes(), version=StatusListState.version + 1)
+            .returning(StatusListState.version),
+            execution_options={"synchronize_session": False},
+        ).scalar_one()
+        db.expire(state)
+        db.add_all(
+            StatusListChange(shard=shard, version=version, status_list_index=index)
+            for index in changed
+        )
     db.flush()
 
 
-def encoded_list(db: Session, size: int, index_start: int) -> str:
-    return _get_or_create(db, size, index_start).encoded
+def changes_between(
+    db: Session, since: int, version: int, limit: int, shard: int = 0
+) -> Optional[List[int]]:
+    """Indices set in a shard's versions ``(since, version]``, or None if a full list is needed.
+
+    None means the gap exceeds ``limit`` indices, or the change log does not
+    cover every version in the range (e.g. ``since`` is from another list).
+    """
+    if not 0 <= since <= version:
+        return None
+    rows = db.execute(
+        select(StatusListChange.version, StatusListChange.status_list_index)
+        .where(
+            StatusListChange.shard == shard,
+            StatusListChange.version > since,
+            StatusListChange.version <= version,
+        )
+        .order_by(StatusListChange.id)
+        .limit(limit + 1)
+    ).all()
+    if len(rows) > limit or len({v for v, _ in rows}) != version - since:
+        return None
+    return [index for _, index in rows]
+
+
+class StatusListCache:
+    """Process-level copy of one status-list shard, tagged with its row version.
+
+    Each lookup reads only ``StatusListState.version``; the bitmap is reloaded
+    when that moves, so a revocation committed by any worker is seen on the
+    next check. The encoded form is built at most once per version, on the
+    first fetch that needs it. Use sessions that have not themselves
+    changed the list: a flushed but uncommitted revocation would otherwise be
+    cached under a version that may never commit.
+    """
+
+    def __init__(self, size: int, index_start: int, shard: int = 0):
+        self.size = size
+        self.index_start = index_start
+        self.shard = shard
+        self._version: Optional[int] = None
+        self._status: Optional[StatusList] = None
+        self._encoded: Optional[str] = None
+        self._published: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self, db: Session) -> tuple[int, StatusList]:
+        """Current ``(version, list)``. The list is shared: callers must not modify it."""
+        version = db.execute(
+            select(StatusListState.version).where(StatusListState.shard == self.shard)
+        ).scalar_one_or_none()
+        # Read paths never write: a shard nothing was issued from yet is an empty list at version 0.
+        current = 0 if version is None else version
+        with self._lock:
+            if self._version is not None and current == self._version:
+                return self._version, self._status
+        state = db.execute(
+            select(StatusListState).where(StatusListState.shard == self.shard)
+        ).scalar_one_or_none()
+        version, status = (0, StatusList(self.size)) if state is None else (
+            state.version, StatusList.from_bytes(state.bits)
+        )
+        with self._lock:
+            if self._version is None or version >= self._version:
+                self._version, self._status = version, status
+                self._encoded = self._published = None
+        return version, status
+
+    def is_revoked(self, db: Session, index: int) -> bool:
+        return self.snapshot(db)[1].is_revoked(index)
+
+    def encoded(self, db: Session) -> str:
+        version, status = self.snapshot(db)
+        with self._lock:
+            if version == self._version and self._encoded is not None:
+                return self._encoded
+        encoded = status.encode()
+        with self._lock:
+            if version == self._version:
+                self._encoded = encoded
+        return encoded
+
+    def published(self, db: Session, render: Callable[[int, str], bytes]) -> tuple[int, bytes]:
+        """``(version, body)`` of the public document; ``render`` runs once per version."""
+        version, _ = self.snapshot(db)
+        with self._lock:
+            if version == self._version and self._published is not None:
+                return version, self._published
+        body = render(version, self.encoded(db))
+        with self._lock:
+            if version == self._version:
+                self._published = body
+        return version, body
+
+
+class StatusListShards:
+    """One ``StatusListCache`` per shard, created on first use, plus the shard/URI mapping."""
+
+    def __init__(self, base_uri: str, size: int, index_start: int):
+        self.base_uri = base_uri
+        self.size = size
+        self.index_start = index_start
+        self._caches: Dict[int, StatusListCache] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, shard: int) -> StatusListCache:
+        with self._lock:
+            cache = self._caches.get(shard)
+            if cache is None:
+                cache = self._caches[shard] = StatusListCache(self.size, self.index_start, shard)
+            return cache
 
+    def uri(self, shard: int) -> str:
+        return shard_uri(self.base_uri, shard)
 
-def is_revoked(db: Session, index: int, size: int, index_start: int) -> bool:
-    return StatusList.decode(_get_or_create(db, size, index_start).encoded).is_revoked(index)
+    def shard_of(self, uri: str) -> Optional[int]:
+        return shard_of(uri, self.base_uri)
@@ -0,0 +1,233 @@
+"""Embeddable relying-party verifier for Pancake grant credentials.
+
+``Verifier`` wraps ``sdjwt.verify`` and ``StatusList.decode`` with the
+caching a high-QPS service needs:
+
+* trusted issuer keys are parsed once and picked by the JWT ``kid``;
+* status lists are cached per URI and refreshed conditionally
+  (``If-None-Match``) once their ``max-age`` has passed; when a refresh
+  fails, a stale copy is used for at most ``max_stale`` seconds, after
+  which verification fails closed;
+* successful signature/disclosure checks are kept in a bounded LRU
+  (``grant_cache.VerifiedGrantCache``) until the credential's ``exp``;
+  revocation is still checked on every call.
+
+Status lists are obtained through a pluggable fetcher: ``HttpFetcher`` for
+production, ``StaticFetcher`` as a local stand-in for the status-list URI
+(tests, air-gapped mirrors). All methods are thread-safe.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Union
+
+import httpx
+import jwt as pyjwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from pancake_services.grants import sdjwt
+from pancake_services.grants.grant_cache import VerifiedGrantCache
+from pancake_services.grants.sdjwt import VerificationError, VerifiedGrant
+from pancake_services.grants.statuslist import StatusList
+
+
+class FetchError(Exception):
+    """Raised by fetchers when a status list cannot be retrieved."""
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    document: Optional[Dict[str, Any]]  # None: not modified since ``etag``
+    etag: Optional[str] = None
+    max_age: Optional[int] = None
+
+
+# (uri, etag of the copy we hold or None) -> FetchResult
+Fetcher = Callable[[str, Optional[str]], FetchResult]
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def _max_age(headers: Mapping[str, str]) -> Optional[int]:
+    match = _MAX_AGE.search(headers.get("cache-control", ""))
+    return int(match.group(1)) if match else None
+
+
+class HttpFetcher:
+    """Conditional GET over one pooled client (any ``httpx.Client``, e.g. a TestClient)."""
+
+    def __init__(self, client: Optional[httpx.Client] = None, timeout: float = 10):
+        self.client = client or httpx.Client(timeout=timeout)
+
+    def __call__(self, uri: str, etag: Optional[str] = None) -> FetchResult:
+        headers = {"If-None-Match": etag} if etag else {}
+        try:
+            response = self.client.get(uri, headers=headers)
+            if response.status_code == 304:
+                return FetchResult(None, etag, _max_age(response.headers))
+            response.raise_for_status()
+            return FetchResult(response.json(), response.headers.get("etag"), _max_age(response.headers))
+        except (httpx.HTTPError, ValueError) as e:
+            raise FetchError(f"status list fetch failed for {uri}: {e}") from e
+
+
+class StaticFetcher:
+    """In-process stand-in for status-list URIs: serves documents handed to ``publish``."""
+
+    def __init__(
+        self, documents: Optional[Mapping[str, Dict[str, Any]]] = None, max_age: Optional[int] = None
+    ):
+        self.documents: Dict[str, Dict[str, Any]] = dict(documents or {})
+        self.max_age = max_age
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def publish(self, uri: str, document: Dict[str, Any]) -> None:
+        with self._lock:
+            self.documents[uri] = document
+
+    def __call__(self, uri: str, etag: Optional[str] = None) -> FetchResult:
+        with self._lock:
+            self.requests += 1
+            document = self.documents.get(uri)
+        if document is None:
+            raise FetchError(f"no status list published at {uri}")
+        current = f'"{document.get("version", 0)}"'
+        if etag == current:
+            return FetchResult(None, current, self.max_age)
+        return FetchResult(document, current, self.max_age)
+
+
+@dataclass
+class _CachedList:
+    status: StatusList
+    etag: Optional[str]
+    fresh_until: float
+    fetched_at: float
+
+
+def _public_key(key: Union[bytes, Ed25519PublicKey]) -> Ed25519PublicKey:
+    if isinstance(key, Ed25519PublicKey):
+        return key
+    parsed = serialization.load_pem_public_key(key)
+    if not isinstance(parsed, Ed25519PublicKey):
+        raise ValueError("trusted issuer key is not an Ed25519 key")
+    return parsed
+
+
+class Verifier:
+    def __init__(
+        self,
+        trusted_keys: Mapping[str, Union[bytes, Ed25519PublicKey]],
+        fetcher: Optional[Fetcher] = None,
+        status_ttl: int = 60,
+        max_stale: int = 3600,
+        cache_entries: int = 1024,
+        cache_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        """``trusted_keys`` maps issuer ``kid`` to its Ed25519 public key (PEM or key object).
+
+        ``status_ttl`` applies when the status-list response carries no
+        ``max-age``.
+        """
+        self._keys = {kid: _public_key(key) for kid, key in trusted_keys.items()}
+        self.fetcher = fetcher or HttpFetcher()
+        self.status_ttl = status_ttl
+        self.max_stale = max_stale
+        self.clock = clock
+        self.grants = VerifiedGrantCache(cache_entries, cache_bytes)
+        self._lists: Dict[str, _CachedList] = {}
+        self._list_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    # -- issuer keys --------------------------------------------------------
+
+    def _key_for(self, credential: str) -> Ed25519PublicKey:
+        try:
+            kid = pyjwt.get_unverified_header(credential.split("~", 1)[0]).get("kid")
+        except pyjwt.PyJWTError as e:
+            raise VerificationError(f"malformed credential: {e}") from e
+        key = self._keys.get(kid)
+        if key is None:
+            raise VerificationError(f"untrusted issuer key: {kid}")
+        return key
+
+    # -- status lists -------------------------------------------------------
+
+    def _list_lock(self, uri: str) -> threading.Lock:
+        with self._lock:
+            return self._list_locks.setdefault(uri, threading.Lock())
+
+    def status_list(self, uri: str) -> StatusList:
+        """The status list at ``uri``, refreshed if its freshness window has passed.
+
+        One refresh per URI runs at a time; other callers wait for it.
+        """
+        now = self.clock()
+        cached = self._lists.get(uri)
+        if cached is not None and now < cached.fresh_until:
+            return cached.status
+        with self._list_lock(uri):
+            cached = self._lists.get(uri)
+            now = self.clock()
+            if cached is not None and now < cached.fresh_until:
+                return cached.status
+            try:
+                result = self.fetcher(uri, cached.etag if cached else None)
+            except FetchError as e:
+                if cached is not None and now - cached.fetched_at <= self.max_stale:
+                    return cached.status
+                raise VerificationError(f"status list unavailable: {e}") from e
+            ttl = result.max_age if result.max_age is not None else self.status_ttl
+            if result.document is None:
+                if cached is None:
+                    raise VerificationError(f"status list at {uri} answered not-modified to a first fetch")
+                status = cached.status
+            else:
+                try:
+                    status = StatusList.decode(result.document["encoded"])
+                except (KeyError, ValueError) as e:
+                    raise VerificationError(f"malformed status list at {uri}: {e}") from e
+            self._lists[uri] = _CachedList(status, result.etag, now + ttl, now)
+            return status
+
+    def is_revoked(self, uri: str, idx: int) -> bool:
+        try:
+            return self.status_list(uri).is_revoked(idx)
+        except IndexError as e:
+            raise VerificationError(str(e)) from e
+
+    # -- credentials --------------------------------------------------------
+
+    def verify(self, credential: str, geoids: Optional[Iterable[str]] = None) -> VerifiedGrant:
+        """Verify a credential (or presentation) and its revocation status.
+
+        With ``geoids``, only those disclosures are checked and every one of
+        them must be covered. Raises ``VerificationError`` on any failure,
+        including revocation. ``clock`` decides credential and cache expiry
+        as well as status-list freshness.
+        """
+        scope = tuple(sorted(set(geoids))) if geoids is not None else None
+        now = int(self.clock())
+        key = self._key_for(credential)
+        cached = self.grants.get_or_verify(
+            credential,
+            lambda c: sdjwt.verify(c, key, now=now, geoids=scope),
+            scope=scope,
+            now=now,
+        )
+        status = cached.grant.claims.get("status", {}).get("status_list", {})
+        if status.get("idx") is not None:
+            if "uri" not in status:
+                raise VerificationError("credential status has no status list uri")
+            if self.is_revoked(status["uri"], int(status["idx"])):
+                raise VerificationError("credential revoked")
+        missing = [g for g in scope or () if g not in cached.geoids]
+        if missing:
+            raise VerificationError(f"credential does not cover GeoID: {missing[0]}")
+        return cached.grant
@@ -91,11 +91,15 @@ def make_app(fake_hub, dev_issuer):
 
     def _make(**overrides):
         settings = Settings(
-            database_url="sqlite:///:memory:",
+            database_url=overrides.get("database_url", "sqlite:///:memory:"),
             hub_jwks_url="http://fake-hub/jwks",
             hub_url=overrides.get("hub_url", ""),
             status_list_uri="http://pancake.test/grants/status-list",
             require_grant_for_weather=overrides.get("require_grant_for_weather", False),
+            status_list_size=overrides.get("status_list_size", 65536),
+            status_list_max_shards=overrides.get("status_list_max_shards", 1),
+            verify_batch_workers=overrides.get("verify_batch_workers", 1),
+            audit_verify_workers=overrides.get("audit_verify_workers", 1),
         )
         return create_app(
             settings=settings, issuer=dev_issuer, jwks_cache=StaticJWKSCache(fake_hub)
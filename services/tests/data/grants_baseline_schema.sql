@@ -0,0 +1,141 @@
+-- Schema of a grants database created by the baseline release (commit f763184):
+-- Base.metadata.create_all on SQLite, dumped from sqlite_master. Used by
+-- tests/test_schema.py to check that such a database still starts.
+
+CREATE TABLE users (
+    id INTEGER NOT NULL,
+    hub_account_id VARCHAR(128) NOT NULL,
+    email VARCHAR(256),
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_users_hub_account_id ON users (hub_account_id);
+
+CREATE TABLE status_list_state (
+    id INTEGER NOT NULL,
+    encoded TEXT NOT NULL,
+    next_index INTEGER NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE meals (
+    meal_id VARCHAR(26) NOT NULL,
+    meal_type VARCHAR(50) NOT NULL,
+    created_at_time DATETIME NOT NULL,
+    last_updated_time DATETIME NOT NULL,
+    primary_geoid VARCHAR(128),
+    participant_agents JSON NOT NULL,
+    packet_count INTEGER NOT NULL,
+    root_hash VARCHAR(66),
+    last_packet_hash VARCHAR(66),
+    archived BOOLEAN NOT NULL,
+    PRIMARY KEY (meal_id)
+);
+
+CREATE INDEX ix_meals_primary_geoid ON meals (primary_geoid);
+
+CREATE TABLE bites (
+    id INTEGER NOT NULL,
+    bite_id VARCHAR(64) NOT NULL,
+    geoid VARCHAR(128) NOT NULL,
+    bite_type VARCHAR(64) NOT NULL,
+    vendor VARCHAR(64),
+    timestamp DATETIME NOT NULL,
+    content_hash VARCHAR(66) NOT NULL,
+    envelope JSON NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (content_hash)
+);
+
+CREATE INDEX ix_bites_geoid ON bites (geoid);
+
+CREATE INDEX ix_bites_vendor ON bites (vendor);
+
+CREATE INDEX ix_bites_bite_id ON bites (bite_id);
+
+CREATE INDEX ix_bites_timestamp ON bites (timestamp);
+
+CREATE INDEX ix_bites_bite_type ON bites (bite_type);
+
+CREATE TABLE fieldlists (
+    id INTEGER NOT NULL,
+    list_id VARCHAR(64) NOT NULL,
+    name VARCHAR(256) NOT NULL,
+    owner_id INTEGER NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_fieldlist_owner UNIQUE (list_id, owner_id),
+    FOREIGN KEY(owner_id) REFERENCES users (id)
+);
+
+CREATE INDEX ix_fieldlists_owner_id ON fieldlists (owner_id);
+
+CREATE INDEX ix_fieldlists_list_id ON fieldlists (list_id);
+
+CREATE TABLE grants (
+    id INTEGER NOT NULL,
+    jti VARCHAR(64) NOT NULL,
+    list_id VARCHAR(64) NOT NULL,
+    issuer_user_id INTEGER NOT NULL,
+    grantee_account VARCHAR(128) NOT NULL,
+    purpose VARCHAR(256) NOT NULL,
+    masking_level VARCHAR(8) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    status VARCHAR(16) NOT NULL,
+    status_list_index INTEGER NOT NULL,
+    credential TEXT NOT NULL,
+    created_at DATETIME NOT NULL,
+    revoked_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(issuer_user_id) REFERENCES users (id),
+    UNIQUE (status_list_index)
+);
+
+CREATE INDEX ix_grants_issuer_user_id ON grants (issuer_user_id);
+
+CREATE INDEX ix_grants_list_id ON grants (list_id);
+
+CREATE INDEX ix_grants_grantee_account ON grants (grantee_account);
+
+CREATE UNIQUE INDEX ix_grants_jti ON grants (jti);
+
+CREATE TABLE meal_packets (
+    packet_id VARCHAR(26) NOT NULL,
+    meal_id VARCHAR(26) NOT NULL,
+    packet_type VARCHAR(10) NOT NULL,
+    sequence_number INTEGER NOT NULL,
+    previous_packet_id VARCHAR(26),
+    previous_packet_hash VARCHAR(66),
+    time_index DATETIME NOT NULL,
+    geoid VARCHAR(128),
+    author JSON NOT NULL,
+    payload JSON NOT NULL,
+    content_hash VARCHAR(66) NOT NULL,
+    packet_hash VARCHAR(66) NOT NULL,
+    signature VARCHAR(256),
+    PRIMARY KEY (packet_id),
+    CONSTRAINT uq_meal_seq UNIQUE (meal_id, sequence_number),
+    FOREIGN KEY(meal_id) REFERENCES meals (meal_id)
+);
+
+CREATE INDEX ix_meal_packets_time_index ON meal_packets (time_index);
+
+CREATE INDEX ix_meal_packets_geoid ON meal_packets (geoid);
+
+CREATE INDEX ix_meal_packets_meal_id ON meal_packets (meal_id);
+
+CREATE TABLE fieldlist_members (
+    id INTEGER NOT NULL,
+    fieldlist_id INTEGER NOT NULL,
+    geoid VARCHAR(128) NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_member UNIQUE (fieldlist_id, geoid),
+    FOREIGN KEY(fieldlist_id) REFERENCES fieldlists (id)
+);
+
+CREATE INDEX ix_fieldlist_members_geoid ON fieldlist_members (geoid);
+
+CREATE INDEX ix_fieldlist_members_fieldlist_id ON fieldlist_members (fieldlist_id);
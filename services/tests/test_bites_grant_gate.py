@@ -26,14 +26,14 @@ def _headers(fake_hub, account="acct-owner"):
     return {"Authorization": f"Bearer {fake_hub.token(account, email='o@x.org')}"}
 
 
-def _issue_owner_grant(client, headers, geoids, account="acct-owner"):
+def _issue_owner_grant(client, headers, geoids, account="acct-owner", profile="sd-jwt"):
     fl = client.post("/fieldlists", json={"name": "Demo", "geoids": geoids}, headers=headers)
     assert fl.status_code == 201, fl.text
     list_id = fl.json()["list_id"]
     issued = client.post(
         "/grants/issue",
         json={"list_id": list_id, "grantee_account": account, "purpose": "owner",
-              "validity_days": 30},
+              "validity_days": 30, "profile": profile},
         headers=headers,
     )
     assert issued.status_code == 201, issued.text
@@ -79,6 +79,64 @@ def test_weather_read_allowed_with_valid_grant(make_app, fake_hub):
     assert resp.json()["count"] == 1
 
 
+def test_single_field_presentation_accepted(make_app, fake_hub):
+    app = make_app(require_grant_for_weather=True)
+    client = TestClient(app)
+    headers = _headers(fake_hub)
+    credential = _issue_owner_grant(client, headers, [GEOID, OTHER_GEOID])
+    BiteStore(app.state.session_factory).save(_weather_bite())
+
+    presentation = client.post(
+        "/grants/present", json={"credential": credential, "geoids": [GEOID]}, headers=headers
+    ).json()["presentation"]
+    params = {"geoid": GEOID, "type": "weather_historical"}
+    resp = client.get("/bites", params=params, headers={**headers, "X-Field-Grant": presentation})
+    assert resp.status_code == 200, resp.text
+
+    # The presentation discloses GEOID only, so it cannot unlock OTHER_GEOID.
+    other = client.get(
+        "/bites", params={**params, "geoid": OTHER_GEOID},
+        headers={**headers, "X-Field-Grant": presentation},
+    )
+    assert other.status_code == 403
+
+
+def test_merkle_profile_presentation_accepted(make_app, fake_hub):
+    app = make_app(require_grant_for_weather=True)
+    client = TestClient(app)
+    headers = _headers(fake_hub)
+    credential = _issue_owner_grant(client, headers, [GEOID, OTHER_GEOID], profile="merkle")
+    BiteStore(app.state.session_factory).save(_weather_bite())
+    params = {"geoid": GEOID, "type": "weather_historical"}
+
+    # The bare credential proves no membership.
+    bare = client.get("/bites", params=params, headers={**headers, "X-Field-Grant": credential})
+    assert bare.status_code == 403
+
+    presentation = client.post(
+        "/grants/present", json={"credential": credential, "geoids": [GEOID]}, headers=headers
+    ).json()["presentation"]
+    resp = client.get("/bites", params=params, headers={**headers, "X-Field-Grant": presentation})
+    assert resp.status_code == 200, resp.text
+    other = client.get(
+        "/bites", params={**params, "geoid": OTHER_GEOID},
+        headers={**headers, "X-Field-Grant": presentation},
+    )
+    assert other.status_code == 403
+
+
+def test_same_credential_covers_each_listed_geoid(make_app, fake_hub):
+    app = make_app(require_grant_for_weather=True)
+    client = TestClient(app)
+    headers = _headers(fake_hub)
+    credential = _issue_owner_grant(client, headers, [GEOID, OTHER_GEOID])
+    grant_headers = {**headers, "X-Field-Grant": credential}
+    for geoid in (GEOID, OTHER_GEOID, GEOID):
+        resp = client.get("/bites", params={"geoid": geoid, "type": "weather_historical"},
+                          headers=grant_headers)
+        assert resp.status_code == 200, resp.text
+
+
 def test_grant_for_other_field_rejected(make_app, fake_hub):
     app = make_app(require_grant_for_weather=True)
     client = TestClient(app)
@@ -101,3 +159,33 @@ def test_non_weather_reads_never_gated(make_app, fake_hub):
     resp = client.get("/bites", params={"geoid": GEOID, "type": "soil_profile"},
                       headers=_headers(fake_hub))
     assert resp.status_code == 200
+
+
+def test_cached_grant_still_checks_revocation(make_app, fake_hub, monkeypatch):
+    app = make_app(require_grant_for_weather=True)
+    client = TestClient(app)
+    headers = _headers(fake_hub)
+    credential = _issue_owner_grant(client, headers, [GEOID])
+    BiteStore(app.state.session_factory).save(_weather_bite())
+
+    import pancake_services.grants.routers.bites as bites_router
+
+    calls = []
+    real_verify = bites_router.sdjwt.verify
+
+    def counting_verify(*args, **kwargs):
+        calls.append(1)
+        return real_verify(*args, **kwargs)
+
+    monkeypatch.setattr(bites_router.sdjwt, "verify", counting_verify)
+    params = {"geoid": GEOID, "type": "weather_historical"}
+    grant_headers = {**headers, "X-Field-Grant": credential}
+    for _ in range(3):
+        assert client.get("/bites", params=params, headers=grant_headers).status_code == 200
+    assert len(calls) == 1
+
+    jti = client.get("/grants/issued", headers=headers).json()[0]["jti"]
+    client.post("/grants/revoke", json={"jti": jti}, headers=headers)
+    resp = client.get("/bites", params=params, headers=grant_headers)
+    assert resp.status_code == 403
+    assert resp.json()["detail"] == "field grant revoked"
@@ -1,5 +1,14 @@
 """FieldList endpoints: idempotent creation, owner scoping, proofs."""
-from pancake_services.grants.merkle import merkle_root, verify_inclusion
+from sqlalchemy import select, update
+
+from pancake_services.grants.merkle import (
+    MerkleTree,
+    merkle_root,
+    verify_consistency,
+    verify_inclusion,
+    verify_multiproof,
+)
+from pancake_services.grants.models import FieldList, FieldListMember
 
 
 def test_create_returns_merkle_listid(client, owner_headers, geoids):
@@ -54,7 +63,226 @@ def test_inclusion_proof_endpoint(client, owner_headers, fieldlist, geoids):
     assert verify_inclusion(body["geoid"], body["proof"], body["list_id"])
 
 
+def test_proofs_served_from_persisted_levels(client, owner_headers):
+    members = [f"geo-{i:02d}" for i in range(13)]
+    list_id = client.post(
+        "/fieldlists", json={"name": "Coop", "geoids": members}, headers=owner_headers
+    ).json()["list_id"]
+    for geoid in members:
+        body = client.get(f"/fieldlists/{list_id}/proof/{geoid}", headers=owner_headers).json()
+        assert verify_inclusion(geoid, body["proof"], list_id)
+
+
+def test_multiproofs_read_only_their_nodes(client, owner_headers, monkeypatch):
+    members = [f"geo-{i:02d}" for i in range(13)]
+    list_id = client.post(
+        "/fieldlists", json={"name": "Coop", "geoids": members}, headers=owner_headers
+    ).json()["list_id"]
+
+    def restore(*args):
+        raise AssertionError("the whole tree was loaded")
+
+    monkeypatch.setattr(MerkleTree, "from_bytes", restore)
+    for subset in (members[:1], members[3:6], members[::4], members):
+        body = client.post(
+            f"/fieldlists/{list_id}/proofs", json={"geoids": subset}, headers=owner_headers
+        ).json()
+        assert verify_multiproof(subset, body, list_id)
+
+
+def test_proof_backfills_missing_levels(app, client, owner_headers, fieldlist, geoids):
+    session = app.state.session_factory()
+    try:
+        row = session.execute(select(FieldList)).scalar_one()
+        row.merkle_levels = None
+        session.commit()
+    finally:
+        session.close()
+
+    list_id = fieldlist["list_id"]
+    body = client.get(f"/fieldlists/{list_id}/proof/{geoids[2]}", headers=owner_headers).json()
+    assert verify_inclusion(geoids[2], body["proof"], list_id)
+
+    session = app.state.session_factory()
+    try:
+        assert session.execute(select(FieldList.merkle_levels)).scalar_one() is not None
+    finally:
+        session.close()
+
+
+def test_proof_backfills_missing_leaf_positions(app, client, owner_headers, fieldlist, geoids):
+    session = app.state.session_factory()
+    try:
+        stored = dict(session.execute(select(FieldListMember.geoid, FieldListMember.position)).all())
+        assert stored == {g: i for i, g in enumerate(sorted(geoids))}
+        session.execute(update(FieldListMember).values(position=None))
+        session.commit()
+    finally:
+        session.close()
+
+    list_id = fieldlist["list_id"]
+    body = client.get(f"/fieldlists/{list_id}/proof/{geoids[1]}", headers=owner_headers).json()
+    assert verify_inclusion(geoids[1], body["proof"], list_id)
+
+    session = app.state.session_factory()
+    try:
+        assert dict(session.execute(select(FieldListMember.geoid, FieldListMember.position)).all()) == stored
+    finally:
+        session.close()
+
+
+def test_multiproof_endpoint(client, owner_headers, fieldlist, geoids):
+    list_id = fieldlist["list_id"]
+    response = client.post(
+        f"/fieldlists/{list_id}/proofs", json={"geoids": geoids[:2]}, headers=owner_headers
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["geoids"] == sorted(geoids[:2])
+    assert verify_multiproof(body["geoids"], body, body["list_id"])
+
+    missing = client.post(
+        f"/fieldlists/{list_id}/proofs", json={"geoids": [geoids[0], "unknown"]}, headers=owner_headers
+    )
+    assert missing.status_code == 404
+
+
 def test_proof_for_nonmember_404(client, owner_headers, fieldlist):
     list_id = fieldlist["list_id"]
     response = client.get(f"/fieldlists/{list_id}/proof/unknown-geoid", headers=owner_headers)
     assert response.status_code == 404
+
+
+def test_patch_creates_new_version_under_new_listid(client, owner_headers, fieldlist, geoids):
+    list_id = fieldlist["list_id"]
+    new_geoid = "0" * 64
+    response = client.patch(
+        f"/fieldlists/{list_id}",
+        json={"add": [new_geoid], "remove": [geoids[1]]},
+        headers=owner_headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    expected = sorted([new_geoid, geoids[0], geoids[2]])
+    assert body["list_id"] == merkle_root(expected)
+    assert body["previous_list_id"] == list_id
+    assert (body["added"], body["removed"], body["geoid_count"]) == ([new_geoid], [geoids[1]], 3)
+
+    # The old version keeps its membership for grants bound to its ListID.
+    old = client.get(f"/fieldlists/{list_id}", headers=owner_headers).json()
+    assert (old["geoids"], old["superseded_by"]) == (sorted(geoids), body["list_id"])
+    moved = client.get(f"/fieldlists/{body['list_id']}", headers=owner_headers).json()
+    assert (moved["geoids"], moved["superseded_by"]) == (expected, None)
+    listed = client.get("/fieldlists", headers=owner_headers).json()
+    assert [f["list_id"] for f in listed] == [body["list_id"]]
+    proof = client.get(
+        f"/fieldlists/{body['list_id']}/proof/{new_geoid}", headers=owner_headers
+    ).json()
+    assert verify_inclusion(new_geoid, proof["proof"], body["list_id"])
+
+
+def test_superseded_version_is_read_only_but_proofs_still_served(client, owner_headers, fieldlist, geoids):
+    list_id = fieldlist["list_id"]
+    client.patch(f"/fieldlists/{list_id}", json={"remove": [geoids[0]]}, headers=owner_headers)
+    again = client.patch(f"/fieldlists/{list_id}", json={"add": ["x"]}, headers=owner_headers)
+    assert again.status_code == 409
+    proof = client.get(f"/fieldlists/{list_id}/proof/{geoids[0]}", headers=owner_headers).json()
+    assert verify_inclusion(geoids[0], proof["proof"], list_id)
+
+
+def test_list_history_stays_on_one_meal_across_versions(client, owner_headers, fieldlist, geoids):
+    list_id = fieldlist["list_id"]
+    new_id = client.patch(
+        f"/fieldlists/{list_id}", json={"add": ["geo-new"]}, headers=owner_headers
+    ).json()["list_id"]
+    events = client.get(f"/audit/{geoids[0]}", headers=owner_headers).json()["events"]
+    updated = [e for e in events if e["event"]["event_type"] == "fieldlist.updated"]
+    assert updated[0]["event"]["list_id"] == new_id
+    assert {e["meal_id"] for e in events} == {updated[0]["meal_id"]}
+
+
+def test_patch_rejects_invalid_edits(client, owner_headers, fieldlist, geoids):
+    list_id = fieldlist["list_id"]
+    missing = client.patch(
+        f"/fieldlists/{list_id}", json={"remove": ["unknown-geoid"]}, headers=owner_headers
+    )
+    emptied = client.patch(f"/fieldlists/{list_id}", json={"remove": geoids}, headers=owner_headers)
+    assert missing.status_code == emptied.status_code == 422
+
+
+def test_patch_conflicting_listid_409(client, owner_headers, fieldlist, geoids):
+    client.post("/fieldlists", json={"name": "Two", "geoids": geoids[:2]}, headers=owner_headers)
+    response = client.patch(
+        f"/fieldlists/{fieldlist['list_id']}", json={"remove": [geoids[2]]}, headers=owner_headers
+    )
+    assert response.status_code == 409
+
+
+def test_patch_back_to_an_earlier_membership_reactivates_it(client, owner_headers, fieldlist, geoids):
+    list_id = fieldlist["list_id"]
+    added = client.patch(f"/fieldlists/{list_id}", json={"add": ["geo-x"]}, headers=owner_headers).json()
+    response = client.patch(
+        f"/fieldlists/{added['list_id']}", json={"remove": ["geo-x"]}, headers=owner_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["list_id"] == list_id
+
+    restored = client.get(f"/fieldlists/{list_id}", headers=owner_headers).json()
+    assert (restored["geoids"], restored["superseded_by"]) == (sorted(geoids), None)
+    left = client.get(f"/fieldlists/{added['list_id']}", headers=owner_headers).json()
+    assert left["superseded_by"] == list_id
+    listed = client.get("/fieldlists", headers=owner_headers).json()
+    assert [f["list_id"] for f in listed] == [list_id]
+
+    again = client.patch(f"/fieldlists/{list_id}", json={"add": ["geo-y"]}, headers=owner_headers).json()
+    proof = client.get(
+        f"/fieldlists/{again['list_id']}/consistency", params={"from": added["list_id"]},
+        headers=owner_headers,
+    )
+    assert proof.status_code == 409  # geo-x was removed on the way
+    proof = client.get(
+        f"/fieldlists/{again['list_id']}/consistency", params={"from": list_id}, headers=owner_headers
+    ).json()
+    assert proof["added"] == ["geo-y"]
+
+
+def test_patch_is_owner_scoped(client, buyer_headers, fieldlist):
+    response = client.patch(
+        f"/fieldlists/{fieldlist['list_id']}", json={"add": ["x"]}, headers=buyer_headers
+    )
+    assert response.status_code == 404
+
+
+def test_consistency_proof_across_edits(client, owner_headers, fieldlist, geoids):
+    old_id = fieldlist["list_id"]
+
+    def patch(list_id, **edit):
+        response = client.patch(f"/fieldlists/{list_id}", json=edit, headers=owner_headers)
+        assert response.status_code == 200, response.text
+        return response.json()["list_id"]
+
+    mid_id = patch(old_id, add=["geo-new-1", "geo-new-2"])
+    current_id = patch(mid_id, add=["geo-new-3"], remove=["geo-new-1"])
+
+    response = client.get(
+        f"/fieldlists/{current_id}/consistency", params={"from": old_id}, headers=owner_headers
+    )
+    assert response.status_code == 200, response.text
+    proof = response.json()
+    assert proof["added"] == ["geo-new-2", "geo-new-3"]
+    assert verify_consistency(MerkleTree(geoids), proof, current_id)
+
+    same = client.get(
+        f"/fieldlists/{current_id}/consistency", params={"from": current_id}, headers=owner_headers
+    ).json()
+    assert same["added"] == [] and same["old_count"] == same["new_count"] == 5
+
+    shrunk_id = patch(current_id, remove=[geoids[0]])
+    removed = client.get(
+        f"/fieldlists/{shrunk_id}/consistency", params={"from": old_id}, headers=owner_headers
+    )
+    assert removed.status_code == 409
+    unknown = client.get(
+        f"/fieldlists/{shrunk_id}/consistency", params={"from": "f" * 64}, headers=owner_headers
+    )
+    assert unknown.status_code == 404
@@ -0,0 +1,102 @@
+"""Verified-credential LRU used by the grant-gated BITE read path."""
+import time
+
+import pytest
+
+from pancake_services.grants import sdjwt
+from pancake_services.grants.grant_cache import VerifiedGrantCache
+from pancake_services.grants.issuer import generate_keypair_pem
+
+GEOIDS = ["geoid-aaa", "geoid-bbb"]
+
+
+@pytest.fixture(scope="module")
+def keypair():
+    return generate_keypair_pem()
+
+
+def _credential(priv, exp_offset=3600, jti="01TESTJTI0000000000000000"):
+    now = int(time.time())
+    claims = {"iss": "did:web:test", "sub": "a" * 64, "iat": now, "exp": now + exp_offset, "jti": jti}
+    return sdjwt.issue(claims, GEOIDS, priv, "kid-1")
+
+
+def test_verifies_once_then_hits(keypair):
+    priv, pub = keypair
+    credential = _credential(priv)
+    cache = VerifiedGrantCache()
+    calls = []
+
+    def verify(c):
+        calls.append(c)
+        return sdjwt.verify(c, pub)
+
+    first = cache.get_or_verify(credential, verify)
+    second = cache.get_or_verify(credential, verify)
+    assert len(calls) == 1
+    assert first is second
+    assert first.geoids == frozenset(GEOIDS)
+
+
+def test_failures_are_not_cached(keypair):
+    priv, _ = keypair
+    _, other_pub = generate_keypair_pem()
+    cache = VerifiedGrantCache()
+    for _ in range(2):
+        with pytest.raises(sdjwt.VerificationError):
+            cache.get_or_verify(_credential(priv), lambda c: sdjwt.verify(c, other_pub))
+    assert len(cache) == 0
+
+
+def test_entry_dropped_after_exp(keypair):
+    priv, pub = keypair
+    credential = _credential(priv, exp_offset=60)
+    cache = VerifiedGrantCache()
+    entry = cache.put(credential, sdjwt.verify(credential, pub))
+    assert cache.get(credential, now=entry.exp) is entry
+    assert cache.get(credential, now=entry.exp + 1) is None
+    assert len(cache) == 0
+
+
+def test_lru_bounds_entries_and_bytes(keypair):
+    priv, pub = keypair
+    credentials = [_credential(priv, jti=f"01TESTJTI{i:016d}") for i in range(3)]
+    grants = [sdjwt.verify(c, pub) for c in credentials]
+
+    by_count = VerifiedGrantCache(max_entries=2)
+    for c, g in zip(credentials, grants):
+        by_count.put(c, g)
+    assert by_count.get(credentials[0]) is None
+    assert by_count.get(credentials[2]) is not None
+
+    by_bytes = VerifiedGrantCache(max_bytes=len(credentials[0]) * 2)
+    by_bytes.put(credentials[0], grants[0])
+    by_bytes.put(credentials[1], grants[1])
+    by_bytes.get(credentials[0])  # refresh: credentials[1] is now least recent
+    by_bytes.put(credentials[2], grants[2])
+    assert by_bytes.get(credentials[1]) is None
+    assert by_bytes.get(credentials[0]) is not None
+
+    too_small = VerifiedGrantCache(max_bytes=10)
+    assert too_small.put(credentials[0], grants[0]).geoids == frozenset(GEOIDS)
+    assert len(too_small) == 0
+
+
+def test_targeted_results_are_scoped_to_their_geoids(keypair):
+    priv, pub = keypair
+    credential = _credential(priv)
+    cache = VerifiedGrantCache()
+
+    def targeted(geoid):
+        return lambda c: sdjwt.verify(c, pub, geoids=[geoid])
+
+    first = cache.get_or_verify(credential, targeted(GEOIDS[0]), scope=[GEOIDS[0]])
+    second = cache.get_or_verify(credential, targeted(GEOIDS[1]), scope=[GEOIDS[1]])
+    assert first.geoids == frozenset({GEOIDS[0]})
+    assert second.geoids == frozenset({GEOIDS[1]})
+    assert cache.get(credential) is None  # unscoped lookups never see targeted results
+    assert len(cache) == 2
+
+    nothing = cache.get_or_verify(credential, lambda c: sdjwt.verify(c, pub, geoids=[]), scope=[])
+    assert nothing.geoids == frozenset()
+    assert cache.get(credential) is None  # an empty scope is still a targeted result
@@ -1,8 +1,17 @@
 """Grant lifecycle: issue -> retrieve -> verify -> revoke -> verify fails."""
+import json
+import time
+from datetime import datetime, timezone
+
+import httpx
 import pytest
+from fastapi.testclient import TestClient
 
 from pancake_services.grants import sdjwt
-from pancake_services.grants.statuslist import StatusList
+from pancake_services.grants.merkle import MerkleTree
+from pancake_services.grants.statuslist import StatusList, apply_changes
+from pancake_services.grants.statuslist_service import StatusIndexAllocator
+from pancake_services.grants.testkit.mint_test_credentials import base_claims
 
 
 @pytest.fixture()
@@ -74,6 +83,95 @@ def test_verify_endpoint_accepts_active(client, issued):
     assert len(body["disclosed_geoids"]) == 3
 
 
+def test_present_endpoint_builds_verifiable_subset(client, buyer_headers, issued, fieldlist):
+    geoid = fieldlist["geoids"][1]
+    response = client.post(
+        "/grants/present",
+        json={"credential": issued["credential"], "geoids": [geoid]},
+        headers=buyer_headers,
+    )
+    assert response.status_code == 200, response.text
+    presentation = response.json()["presentation"]
+    assert len(presentation) < len(issued["credential"])
+
+    verify = client.post("/grants/verify", json={"credential": presentation}).json()
+    assert verify["valid"] is True
+    assert verify["disclosed_geoids"] == [geoid]
+
+    missing = client.post(
+        "/grants/present",
+        json={"credential": issued["credential"], "geoids": ["not-granted"]},
+        headers=buyer_headers,
+    )
+    assert missing.status_code == 422
+
+
+def test_merkle_grant_still_presents_after_its_list_is_edited(
+    client, owner_headers, buyer_headers, fieldlist, geoids
+):
+    issued = client.post(
+        "/grants/issue",
+        json={"list_id": fieldlist["list_id"], "grantee_account": "hub-acct-buyer",
+              "purpose": "p", "profile": "merkle"},
+        headers=owner_headers,
+    ).json()
+    client.patch(f"/fieldlists/{fieldlist['list_id']}", json={"remove": [geoids[0]]}, headers=owner_headers)
+
+    response = client.post(
+        "/grants/present",
+        json={"credential": issued["credential"], "geoids": [geoids[0]]},
+        headers=buyer_headers,
+    )
+    assert response.status_code == 200, response.text
+    verify = client.post("/grants/verify", json={"credential": response.json()["presentation"]}).json()
+    assert verify["valid"] is True
+
+
+def test_merkle_presentation_uses_the_grant_owners_list(
+    client, fake_hub, owner_headers, buyer_headers, fieldlist, geoids
+):
+    other = {"Authorization": f"Bearer {fake_hub.token('hub-acct-other', email='other@x.org')}"}
+    copy = client.post("/fieldlists", json={"name": "Same plots", "geoids": geoids}, headers=other).json()
+    assert copy["list_id"] == fieldlist["list_id"]
+    issued = client.post(
+        "/grants/issue",
+        json={"list_id": fieldlist["list_id"], "grantee_account": "hub-acct-buyer",
+              "purpose": "p", "profile": "merkle"},
+        headers=owner_headers,
+    ).json()
+
+    response = client.post(
+        "/grants/present",
+        json={"credential": issued["credential"], "geoids": [geoids[1]]},
+        headers=buyer_headers,
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_merkle_presentation_reads_only_its_proof_nodes(
+    client, owner_headers, buyer_headers, fieldlist, geoids, monkeypatch
+):
+    issued = client.post(
+        "/grants/issue",
+        json={"list_id": fieldlist["list_id"], "grantee_account": "hub-acct-buyer",
+              "purpose": "p", "profile": "merkle"},
+        headers=owner_headers,
+    ).json()
+
+    def restore(*args):
+        raise AssertionError("the whole tree was loaded")
+
+    monkeypatch.setattr(MerkleTree, "from_bytes", restore)
+    response = client.post(
+        "/grants/present",
+        json={"credential": issued["credential"], "geoids": geoids[:2]},
+        headers=buyer_headers,
+    )
+    assert response.status_code == 200, response.text
+    verify = client.post("/grants/verify", json={"credential": response.json()["presentation"]}).json()
+    assert verify["valid"] is True and sorted(verify["disclosed_geoids"]) == sorted(geoids[:2])
+
+
 def test_revoke_then_verify_fails(client, owner_headers, issued):
     revoke = client.post("/grants/revoke", json={"jti": issued["jti"]}, headers=owner_headers)
     assert revoke.status_code == 200
@@ -133,36 +231,369 @@ def test_tampered_credential_rejected_by_verify(client, issued):
     assert response.json()["valid"] is False
 
 
-def test_hub_report_called_on_revoke(fake_hub, make_app, geoids, monkeypatch):
-    """When HUB_URL is configured, revocation is reported to the hub."""
+def _hub_app(make_app, fake_hub, geoids, handler):
+    """App with HUB_URL set whose outbox dispatcher talks to ``handler``."""
+    app = make_app(hub_url="http://hub.test")
+    app.state.hub_reporter.client = httpx.Client(transport=httpx.MockTransport(handler))
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {fake_hub.token('hub-acct-owner')}"}
+    list_id = client.post(
+        "/fieldlists", json={"name": "x", "geoids": geoids}, headers=headers
+    ).json()["list_id"]
+    return app, client, headers, list_id
+
+
+def test_hub_report_queued_on_revoke_and_sent_by_dispatcher(fake_hub, make_app, geoids):
+    """When HUB_URL is configured, revocation is reported to the hub via the outbox."""
+    calls = []
+
+    def handler(request):
+        calls.append((str(request.url), json.loads(request.content)))
+        return httpx.Response(200)
+
+    app, client, headers, list_id = _hub_app(make_app, fake_hub, geoids, handler)
+    grants = _issue_to(client, headers, list_id, ["b1", "b2", "b3"])
+    client.post("/grants/revoke", json={"jti": grants[0]["jti"]}, headers=headers)
+    client.post("/grants/revoke-batch", json={"jtis": [g["jti"] for g in grants[1:]]}, headers=headers)
+    assert calls == []  # the request path never talks to the hub
+    assert client.get("/healthz").json()["hub_report_backlog"] == 3
+
+    reporter = app.state.hub_reporter
+    assert [reporter.drain_once() for _ in range(4)] == [1, 1, 1, 0]
+    assert [url for url, _ in calls] == ["http://hub.test/revocations"] * 3  # the hub's per-report contract
+    assert [body["jti"] for _, body in calls] == [g["jti"] for g in grants]
+    assert calls[0][1]["status_list_uri"] == "http://pancake.test/grants/status-list"
+    assert client.get("/healthz").json()["hub_report_backlog"] == 0
+
+
+def test_hub_outage_does_not_fail_revocation(fake_hub, make_app, geoids):
+    hub_up = []
+
+    def handler(request):
+        return httpx.Response(200 if hub_up else 503)
+
+    app, client, headers, list_id = _hub_app(make_app, fake_hub, geoids, handler)
+    (grant,) = _issue_to(client, headers, list_id, ["b"])
+    response = client.post("/grants/revoke", json={"jti": grant["jti"]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "revoked"
+
+    reporter = app.state.hub_reporter
+    now = datetime.now(timezone.utc)
+    assert reporter.drain_once(now) == 0
+    assert reporter.drain_once(now) == 0  # backing off: not due again yet
+    assert reporter.backlog() == 1
+
+    hub_up.append(True)
+    assert reporter.drain_once(now + reporter.backoff(1)) == 1
+    assert reporter.backlog() == 0
+
+
+def test_issue_batch_all_verify_with_contiguous_indexes(client, owner_headers, buyer_headers, fieldlist):
+    response = client.post(
+        "/grants/issue-batch",
+        json={
+            "list_id": fieldlist["list_id"],
+            "grants": [
+                {"grantee_account": "hub-acct-buyer", "purpose": "eudr"},
+                {"grantee_account": "hub-acct-b2", "purpose": "eudr", "validity_days": 7},
+                {"grantee_account": "hub-acct-b3", "purpose": "audit", "masking_level": "L2"},
+            ],
+        },
+        headers=owner_headers,
+    )
+    assert response.status_code == 201, response.text
+    grants = response.json()
+    indexes = [g["status_list_index"] for g in grants]
+    assert indexes == list(range(indexes[0], indexes[0] + 3))
+    assert len({g["jti"] for g in grants}) == 3
+    for g in grants:
+        assert client.post("/grants/verify", json={"credential": g["credential"]}).json()["valid"]
+    assert grants[2]["masking_level"] == "L2"
+    assert [g["jti"] for g in client.get("/grants/received", headers=buyer_headers).json()] == [
+        grants[0]["jti"]
+    ]
+
+
+def test_issue_batch_is_all_or_nothing(make_app, fake_hub, geoids):
     from fastapi.testclient import TestClient
 
-    client = TestClient(make_app(hub_url="http://hub.test"))
+    client = TestClient(make_app(status_list_size=8, status_list_max_shards=1), raise_server_exceptions=False)
     headers = {"Authorization": f"Bearer {fake_hub.token('hub-acct-owner')}"}
-
-    fieldlist = client.post(
+    list_id = client.post(
         "/fieldlists", json={"name": "x", "geoids": geoids}, headers=headers
-    ).json()
-    issued = client.post(
-        "/grants/issue",
-        json={"list_id": fieldlist["list_id"], "grantee_account": "b", "purpose": "p"},
+    ).json()["list_id"]
+
+    too_many = client.post(
+        "/grants/issue-batch",
+        json={"list_id": list_id, "grants": [{"grantee_account": f"b{i}", "purpose": "p"} for i in range(9)]},
         headers=headers,
-    ).json()
+    )
+    assert too_many.status_code == 500  # status index range exhausted
+    invalid = client.post(
+        "/grants/issue-batch",
+        json={"list_id": list_id, "grants": [{"grantee_account": "b", "purpose": "p"},
+                                             {"grantee_account": "", "purpose": "p"}]},
+        headers=headers,
+    )
+    assert invalid.status_code == 422
+    assert client.get("/grants/issued", headers=headers).json() == []
 
-    calls = []
+    fits = client.post(
+        "/grants/issue-batch",
+        json={"list_id": list_id, "grants": [{"grantee_account": f"b{i}", "purpose": "p"} for i in range(8)]},
+        headers=headers,
+    )
+    assert fits.status_code == 201
+    assert sorted(g["status_list_index"] for g in fits.json()) == list(range(8))
+
+
+def test_issue_batch_requires_list_ownership(client, buyer_headers, fieldlist):
+    response = client.post(
+        "/grants/issue-batch",
+        json={"list_id": fieldlist["list_id"], "grants": [{"grantee_account": "x", "purpose": "y"}]},
+        headers=buyer_headers,
+    )
+    assert response.status_code == 404
+
+
+def _portfolio(client, owner_headers, fieldlist, dev_issuer):
+    """One credential per verify outcome: valid, revoked, expired, tampered, wrong GeoID."""
+    issued = []
+    for grantee in ("hub-acct-buyer", "hub-acct-revoked"):
+        response = client.post(
+            "/grants/issue",
+            json={"list_id": fieldlist["list_id"], "grantee_account": grantee, "purpose": "eudr"},
+            headers=owner_headers,
+        )
+        issued.append(response.json())
+    client.post("/grants/revoke", json={"jti": issued[1]["jti"]}, headers=owner_headers)
+
+    now = int(time.time())
+    key, kid, list_id = dev_issuer.private_key_pem, dev_issuer.kid, fieldlist["list_id"]
+    expired = sdjwt.issue(base_claims(dev_issuer.issuer_id, list_id, now - 60, idx=100),
+                          fieldlist["geoids"], key, kid)
+    token, rest = issued[0]["credential"].split("~", 1)
+    header, payload, sig = token.split(".")
+    tampered = ".".join([header, payload[:-4] + "AAAA", sig]) + "~" + rest
+    foreign, _ = sdjwt._disclosure("fields.9", "not-a-granted-geoid")
+    wrong_geoid = issued[0]["credential"] + foreign + "~"
+    return [issued[0]["credential"], issued[1]["credential"], expired, tampered, wrong_geoid]
 
-    class FakeResponse:
-        def raise_for_status(self):
-            return None
 
-    def fake_post(url, json=None, timeout=None):
-        calls.append((url, json))
-        return FakeResponse()
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_batch_matches_single_verify(make_app, owner_headers, geoids, dev_issuer, workers):
+    with TestClient(make_app(verify_batch_workers=workers)) as client:
+        _check_verify_batch(client, owner_headers, geoids, dev_issuer)
 
-    import pancake_services.grants.routers.grants as grants_router
 
-    monkeypatch.setattr(grants_router.httpx, "post", fake_post)
-    response = client.post("/grants/revoke", json={"jti": issued["jti"]}, headers=headers)
+def _check_verify_batch(client, owner_headers, geoids, dev_issuer):
+    fieldlist = client.post("/fieldlists", json={"name": "F", "geoids": geoids}, headers=owner_headers).json()
+    credentials = _portfolio(client, owner_headers, fieldlist, dev_issuer)
+
+    response = client.post("/grants/verify-batch", json={"credentials": credentials})
     assert response.status_code == 200
-    assert calls and calls[0][0] == "http://hub.test/revocations"
-    assert calls[0][1]["jti"] == issued["jti"]
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [line.pop("index") for line in lines] == list(range(len(credentials)))
+    for credential, line in zip(credentials, lines):
+        assert line == client.post("/grants/verify", json={"credential": credential}).json()
+    assert [line["valid"] for line in lines] == [True, False, False, False, False]
+    assert lines[1]["reason"] == "credential revoked"
+
+
+def test_worker_pool_is_shared_and_closed_with_the_app(make_app):
+    app = make_app(verify_batch_workers=2)
+    with TestClient(app):
+        pool = app.state.worker_pool
+        assert pool is not None
+        assert pool._mp_context.get_start_method() != "fork"  # the app runs threads
+    assert app.state.worker_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+
+
+def test_verify_batch_rejects_empty_request(client):
+    assert client.post("/grants/verify-batch", json={"credentials": []}).status_code == 422
+
+
+def test_status_list_etag_and_conditional_get(client, owner_headers, issued):
+    first = client.get("/grants/status-list")
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert first.headers["cache-control"] == "public, max-age=60"
+
+    unchanged = client.get("/grants/status-list", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+
+    client.post("/grants/revoke", json={"jti": issued["jti"]}, headers=owner_headers)
+    changed = client.get("/grants/status-list", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert StatusList.decode(changed.json()["encoded"]).is_revoked(issued["status_list_index"])
+
+
+def test_status_list_changes_feed_syncs_a_local_copy(client, owner_headers, fieldlist):
+    jtis, indexes = [], []
+    for _ in range(3):
+        g = client.post(
+            "/grants/issue",
+            json={"list_id": fieldlist["list_id"], "grantee_account": "hub-acct-buyer", "purpose": "p"},
+            headers=owner_headers,
+        ).json()
+        jtis.append(g["jti"])
+        indexes.append(g["status_list_index"])
+
+    snapshot = client.get("/grants/status-list").json()
+    local = StatusList.decode(snapshot["encoded"])
+    for jti in jtis[:2]:
+        client.post("/grants/revoke", json={"jti": jti}, headers=owner_headers)
+
+    changes = client.get("/grants/status-list/changes", params={"since": snapshot["version"]}).json()
+    assert changes["version"] == snapshot["version"] + 2
+    assert changes["indices"] == indexes[:2]
+    assert changes["full"] is None
+    local = apply_changes(local, changes)
+    assert [local.is_revoked(i) for i in indexes] == [True, True, False]
+
+    caught_up = client.get("/grants/status-list/changes", params={"since": changes["version"]}).json()
+    assert caught_up["indices"] == []
+
+
+def test_status_list_changes_falls_back_to_full_list(client, owner_headers, issued):
+    client.post("/grants/revoke", json={"jti": issued["jti"]}, headers=owner_headers)
+    ahead = client.get("/grants/status-list/changes", params={"since": 99}).json()
+    assert ahead["indices"] is None
+    assert ahead["full"]["version"] == ahead["version"]
+    assert StatusList.decode(ahead["full"]["encoded"]).is_revoked(issued["status_list_index"])
+    assert client.get("/grants/status-list/changes", params={"since": -1}).status_code == 422
+
+
+def test_shutdown_releases_reserved_status_indices(make_app, owner_headers, geoids):
+    app = make_app()
+    with TestClient(app) as client:
+        list_id = client.post(
+            "/fieldlists", json={"name": "F", "geoids": geoids}, headers=owner_headers
+        ).json()["list_id"]
+        issued = client.post(
+            "/grants/issue",
+            json={"list_id": list_id, "grantee_account": "hub-acct-buyer", "purpose": "p"},
+            headers=owner_headers,
+        ).json()
+
+    replacement = StatusIndexAllocator(app.state.session_factory, 65536, 0)
+    assert replacement.take(1) == [(0, issued["status_list_index"] + 1)]
+
+
+def test_issuance_rolls_over_to_a_new_status_list_shard(make_app, owner_headers, geoids):
+    client = TestClient(make_app(status_list_size=8, status_list_max_shards=0))
+    list_id = client.post(
+        "/fieldlists", json={"name": "F", "geoids": geoids}, headers=owner_headers
+    ).json()["list_id"]
+    grants = client.post(
+        "/grants/issue-batch",
+        json={
+            "list_id": list_id,
+            "grants": [{"grantee_account": f"b{i}", "purpose": "p"} for i in range(10)],
+        },
+        headers=owner_headers,
+    ).json()
+    assert [(g["status_list_shard"], g["status_list_index"]) for g in grants[7:]] == [(0, 7), (1, 0), (1, 1)]
+    claims = sdjwt.verify(grants[9]["credential"], client.app.state.issuer.public_key_pem).claims
+    assert claims["status"]["status_list"] == {"uri": "http://pancake.test/grants/status-list/1", "idx": 1}
+
+    client.post("/grants/revoke", json={"jti": grants[9]["jti"]}, headers=owner_headers)
+    shard1 = client.get("/grants/status-list/1").json()
+    assert shard1["uri"] == "http://pancake.test/grants/status-list/1"
+    assert StatusList.decode(shard1["encoded"]).is_revoked(1)
+    assert not StatusList.decode(client.get("/grants/status-list").json()["encoded"]).is_revoked(1)
+    assert client.get("/grants/status-list/1/changes", params={"since": 0}).json()["indices"] == [1]
+    assert client.get("/grants/status-list/2").status_code == 404
+
+    verdicts = [client.post("/grants/verify", json={"credential": g["credential"]}).json() for g in grants]
+    assert [v["valid"] for v in verdicts] == [True] * 9 + [False]
+    assert verdicts[9]["reason"] == "credential revoked"
+    batch = client.post("/grants/verify-batch", json={"credentials": [g["credential"] for g in grants]})
+    assert [json.loads(line)["valid"] for line in batch.text.splitlines()] == [True] * 9 + [False]
+
+
+def test_verify_rejects_status_list_of_another_issuer(client, fieldlist, dev_issuer):
+    claims = base_claims(dev_issuer.issuer_id, fieldlist["list_id"], int(time.time()) + 600, idx=1)
+    credential = sdjwt.issue(claims, fieldlist["geoids"], dev_issuer.private_key_pem, dev_issuer.kid)
+    assert client.post("/grants/verify", json={"credential": credential}).json() == {
+        "valid": False,
+        "reason": "unknown status list",
+    }
+
+
+def _issue_to(client, owner_headers, list_id, grantees):
+    return [
+        client.post(
+            "/grants/issue",
+            json={"list_id": list_id, "grantee_account": grantee, "purpose": "p"},
+            headers=owner_headers,
+        ).json()
+        for grantee in grantees
+    ]
+
+
+def test_revoke_batch_by_grantee_in_one_status_list_write(client, owner_headers, fieldlist, geoids):
+    grantees = ["hub-acct-gone"] * 3 + ["hub-acct-stays"]
+    grants = _issue_to(client, owner_headers, fieldlist["list_id"], grantees)
+    before = client.get("/grants/status-list").json()
+
+    response = client.post(
+        "/grants/revoke-batch", json={"grantee_account": "hub-acct-gone"}, headers=owner_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "revoked": [g["jti"] for g in grants[:3]], "already_revoked": [], "not_found": [],
+    }
+
+    after = client.get("/grants/status-list").json()
+    assert after["version"] == before["version"] + 1
+    bits = StatusList.decode(after["encoded"])
+    assert [bits.is_revoked(g["status_list_index"]) for g in grants] == [True, True, True, False]
+    assert client.get(
+        "/grants/status-list/changes", params={"since": before["version"]}
+    ).json()["indices"] == [g["status_list_index"] for g in grants[:3]]
+    statuses = {g["jti"]: g["status"] for g in client.get("/grants/issued", headers=owner_headers).json()}
+    assert [statuses[g["jti"]] for g in grants] == ["revoked"] * 3 + ["active"]
+
+    report = client.get(f"/audit/{geoids[0]}/report", headers=owner_headers).json()
+    assert report["events_by_type"]["grant.revoked"] == 3
+    assert report["all_chains_valid"] is True
+
+
+def test_revoke_batch_by_jtis_reports_unknown_and_repeat(client, owner_headers, fieldlist, fake_hub):
+    grants = _issue_to(client, owner_headers, fieldlist["list_id"], ["a", "b"])
+    client.post("/grants/revoke", json={"jti": grants[0]["jti"]}, headers=owner_headers)
+    stranger = {"Authorization": f"Bearer {fake_hub.token('hub-acct-stranger')}"}
+    jtis = [g["jti"] for g in grants] + ["no-such-jti"]
+
+    assert client.post("/grants/revoke-batch", json={"jtis": jtis}, headers=stranger).json() == {
+        "revoked": [], "already_revoked": [], "not_found": jtis,
+    }
+    assert client.post("/grants/revoke-batch", json={"jtis": jtis}, headers=owner_headers).json() == {
+        "revoked": [grants[1]["jti"]], "already_revoked": [grants[0]["jti"]], "not_found": ["no-such-jti"],
+    }
+
+
+def test_revoke_batch_filters_combine_and_need_a_selector(client, owner_headers, fieldlist, geoids):
+    other_list = client.post(
+        "/fieldlists", json={"name": "Other", "geoids": geoids[:2]}, headers=owner_headers
+    ).json()["list_id"]
+    on_first = _issue_to(client, owner_headers, fieldlist["list_id"], ["hub-acct-x"])
+    _issue_to(client, owner_headers, other_list, ["hub-acct-x"])
+
+    response = client.post(
+        "/grants/revoke-batch",
+        json={"grantee_account": "hub-acct-x", "list_id": fieldlist["list_id"]},
+        headers=owner_headers,
+    )
+    assert response.json()["revoked"] == [on_first[0]["jti"]]
+    assert client.post("/grants/revoke-batch", json={}, headers=owner_headers).status_code == 422
+    assert client.post("/grants/revoke-batch", json={"list_id": fieldlist["list_id"]}).status_code == 401
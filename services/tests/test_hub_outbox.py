@@ -0,0 +1,101 @@
+"""Outbox dispatcher for hub revocation reports."""
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from pancake_services.common.db import Base, make_engine, make_session_factory
+from pancake_services.grants import hub_outbox
+from pancake_services.grants.hub_outbox import HubReporter
+
+
+@pytest.fixture()
+def session_factory():
+    engine = make_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return make_session_factory(engine)
+
+
+def _queue(session_factory, *jtis):
+    with session_factory() as db:
+        hub_outbox.enqueue(db, ({"jti": jti} for jti in jtis))
+        db.commit()
+
+
+def _reporter(session_factory, calls, status=200, **kwargs):
+    def handler(request):
+        calls.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(status)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return HubReporter(session_factory, "http://hub.test/", client=client, **kwargs)
+
+
+def test_default_keeps_single_report_contract(session_factory):
+    calls = []
+    _queue(session_factory, "a", "b")
+    reporter = _reporter(session_factory, calls)
+    assert reporter.drain_once() == 1
+    assert reporter.drain_once() == 1
+    assert calls == [("/revocations", {"jti": "a"}), ("/revocations", {"jti": "b"})]
+
+
+def test_batches_are_capped_and_sent_in_order(session_factory):
+    calls = []
+    _queue(session_factory, "a", "b", "c")
+    reporter = _reporter(session_factory, calls, batch_size=2)
+    assert reporter.drain_once() == 2
+    assert reporter.drain_once() == 1
+    assert reporter.drain_once() == 0
+    assert [[r["jti"] for r in body["revocations"]] for _, body in calls] == [["a", "b"], ["c"]]
+
+
+def test_rejected_report_is_marked_failed_not_retried(session_factory):
+    calls = []
+    _queue(session_factory, "a")
+    reporter = _reporter(session_factory, calls, status=404)
+    now = datetime.now(timezone.utc)
+    assert reporter.drain_once(now) == 0
+    assert reporter.drain_once(now + timedelta(days=1)) == 0
+    assert len(calls) == 1
+    assert (reporter.backlog(), reporter.failed()) == (0, 1)
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttled_or_unavailable_hub_is_retried(session_factory, status):
+    calls = []
+    _queue(session_factory, "a")
+    reporter = _reporter(session_factory, calls, status=status)
+    now = datetime.now(timezone.utc)
+    assert reporter.drain_once(now) == 0
+    assert reporter.drain_once(now + reporter.backoff(1)) == 0
+    assert len(calls) == 2
+    assert (reporter.backlog(), reporter.failed()) == (1, 0)
+
+
+def test_backoff_doubles_up_to_the_ceiling(session_factory):
+    reporter = HubReporter(session_factory, "http://hub.test", interval=1.0, max_backoff=5.0)
+    assert [reporter.backoff(n).total_seconds() for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+    reporter.client.close()
+
+
+def test_background_thread_drains_after_notify(tmp_path):
+    # File-backed: the in-memory fixture shares one connection, which two threads cannot use.
+    engine = make_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = make_session_factory(engine)
+    calls = []
+    reporter = _reporter(session_factory, calls, interval=30.0)
+    reporter.start()
+    try:
+        _queue(session_factory, "a")
+        reporter.notify()
+        deadline = time.monotonic() + 5
+        while reporter.backlog() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert reporter.backlog() == 0
+    finally:
+        reporter.stop()
+    assert calls == [("/revocations", {"jti": "a"})]
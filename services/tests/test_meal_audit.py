@@ -1,7 +1,10 @@
 """MEAL ledger persistence, signatures, chain verification, and the audit API."""
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 
-from pancake_services.grants.models import MealPacket
+from pancake_services.grants import mealstore
+from pancake_services.grants.mealstore import MealEvent, MealStore, verify_packet_proof
+from pancake_services.grants.models import Meal, MealCheckpoint, MealMmrNode, MealPacket, MealParticipant
+from pancake_services.grants.routers import audit
 
 
 def _issue(client, owner_headers, fieldlist, grantee="hub-acct-buyer"):
@@ -49,15 +52,34 @@ def test_packets_are_signed_and_chained(app, client, owner_headers, fieldlist):
         session.close()
 
 
-def test_chain_verification_endpoint(client, owner_headers, fieldlist, geoids):
+def test_chain_verification_endpoint(app, client, owner_headers, fieldlist, geoids):
     _issue(client, owner_headers, fieldlist)
     report = client.get(f"/audit/{geoids[0]}/report", headers=owner_headers).json()
     assert report["all_chains_valid"] is True
     assert report["events_by_type"]["grant.issued"] == 1
+    assert report["event_count"] == len(report["events"]) == 2
     meal_id = report["events"][0]["meal_id"]
 
     verify = client.get(f"/audit/meals/{meal_id}/verify", headers=owner_headers).json()
-    assert verify == {"valid": True, "packet_count": 2}
+    assert verify == {"valid": True, "packet_count": 2, "resumed_from": 0}
+    # Audit reads leave nothing behind.
+    session = app.state.session_factory()
+    try:
+        assert session.execute(select(MealCheckpoint)).first() is None
+    finally:
+        session.close()
+
+
+def test_report_streams_events_in_pages(client, owner_headers, fieldlist, geoids, monkeypatch):
+    monkeypatch.setattr(audit, "AUDIT_PAGE", 2)
+    for i in range(4):
+        _issue(client, owner_headers, fieldlist, grantee=f"hub-acct-{i}")
+    listed = client.get(f"/audit/{geoids[0]}", headers=owner_headers).json()
+    report = client.get(f"/audit/{geoids[0]}/report", headers=owner_headers).json()
+    assert report["event_count"] == listed["event_count"] == 5
+    assert [e["packet_id"] for e in report["events"]] == [e["packet_id"] for e in listed["events"]]
+    assert report["events_by_type"] == {"fieldlist.created": 1, "grant.issued": 4}
+    assert report["all_chains_valid"] is True
 
 
 def test_tampered_payload_detected(app, client, owner_headers, fieldlist, geoids):
@@ -96,3 +118,189 @@ def test_time_range_filter(client, owner_headers, fieldlist, geoids):
 def test_unknown_meal_verify_404(client, owner_headers):
     response = client.get("/audit/meals/01UNKNOWNMEAL000000000000/verify", headers=owner_headers)
     assert response.status_code == 404
+
+
+def test_batch_issuance_logs_one_event_per_grant(client, owner_headers, fieldlist, geoids):
+    client.post(
+        "/grants/issue-batch",
+        json={"list_id": fieldlist["list_id"],
+              "grants": [{"grantee_account": f"hub-acct-{i}", "purpose": "p"} for i in range(3)]},
+        headers=owner_headers,
+    )
+    report = client.get(f"/audit/{geoids[0]}/report", headers=owner_headers).json()
+    assert report["events_by_type"]["grant.issued"] == 3
+    assert report["all_chains_valid"] is True
+
+
+def _tamper(app, sequence_number):
+    session = app.state.session_factory()
+    try:
+        packet = session.execute(
+            select(MealPacket).where(MealPacket.sequence_number == sequence_number)
+        ).scalar_one()
+        packet.payload = {**packet.payload, "grantee": "hub-acct-attacker"}
+        session.commit()
+        return packet.meal_id
+    finally:
+        session.close()
+
+
+def test_verification_resumes_from_signed_checkpoint(
+    app, client, owner_headers, fieldlist, geoids, monkeypatch
+):
+    monkeypatch.setattr(mealstore, "CHECKPOINT_INTERVAL", 2)
+    # Packet 2 takes the MEAL to 2 packets: the append checkpoints packet 1 first.
+    _issue(client, owner_headers, fieldlist)
+    meal_id = client.get(f"/audit/{geoids[0]}", headers=owner_headers).json()["events"][0]["meal_id"]
+    first = client.get(f"/audit/meals/{meal_id}/verify", headers=owner_headers).json()
+    assert first == {"valid": True, "packet_count": 2, "resumed_from": 1}
+
+    _issue(client, owner_headers, fieldlist, grantee="hub-acct-other")
+    _issue(client, owner_headers, fieldlist, grantee="hub-acct-third")
+    second = client.get(f"/audit/meals/{meal_id}/verify", headers=owner_headers).json()
+    assert second == {"valid": True, "packet_count": 4, "resumed_from": 3}
+
+    # History before the checkpoint is only replayed in full mode.
+    _tamper(app, 1)
+    assert client.get(f"/audit/meals/{meal_id}/verify", headers=owner_headers).json()["valid"] is True
+    full = client.get(f"/audit/meals/{meal_id}/verify", params={"full": True}, headers=owner_headers).json()
+    assert full["valid"] is False
+    assert "content hash mismatch at packet 1" in full["error"]
+
+
+def test_forged_checkpoint_is_ignored(app, client, owner_headers, fieldlist):
+    _issue(client, owner_headers, fieldlist)
+    meal_id = _tamper(app, 2)
+    session = app.state.session_factory()
+    try:
+        anchor = session.execute(select(MealPacket).where(MealPacket.sequence_number == 2)).scalar_one()
+        session.add(MealCheckpoint(
+            meal_id=meal_id, sequence_number=2, packet_hash=anchor.packet_hash, signature="00" * 64
+        ))
+        session.commit()
+    finally:
+        session.close()
+
+    verify = client.get(f"/audit/meals/{meal_id}/verify", headers=owner_headers).json()
+    assert verify["valid"] is False
+    assert "content hash mismatch at packet 2" in verify["error"]
+
+
+def test_packet_inclusion_proof_checks_against_signed_root(app, client, owner_headers, fieldlist, geoids):
+    for i in range(4):
+        issued = _issue(client, owner_headers, fieldlist, grantee=f"hub-acct-{i}")
+    client.post("/grants/revoke", json={"jti": issued["jti"]}, headers=owner_headers)
+    events = client.get(f"/audit/{geoids[0]}", headers=owner_headers).json()["events"]
+    revoked = next(e for e in events if e["event"]["event_type"] == "grant.revoked")
+
+    proof = client.get(f"/audit/packets/{revoked['packet_id']}/proof", headers=owner_headers).json()
+    assert proof["leaf_count"] == len(events) == 6
+    assert len(proof["siblings"]) <= 3
+    key = app.state.issuer.verification_key
+    assert verify_packet_proof(proof, key)
+    assert not verify_packet_proof({**proof, "packet_hash": events[0]["packet_hash"]}, key)
+    assert not verify_packet_proof({**proof, "signature": "00" * 64}, key)
+
+    missing = client.get("/audit/packets/01UNKNOWNPACKET0000000000/proof", headers=owner_headers)
+    assert missing.status_code == 404
+
+
+def test_mmr_backfilled_for_meals_written_without_one(app, client, owner_headers, fieldlist, geoids):
+    _issue(client, owner_headers, fieldlist)
+    packet_id = client.get(f"/audit/{geoids[0]}", headers=owner_headers).json()["events"][0]["packet_id"]
+    before = client.get(f"/audit/packets/{packet_id}/proof", headers=owner_headers).json()
+    session = app.state.session_factory()
+    try:
+        session.execute(delete(MealMmrNode))
+        for meal in session.execute(select(Meal)).scalars():
+            meal.mmr_peaks = meal.mmr_root = meal.mmr_root_signature = None
+        session.commit()
+    finally:
+        session.close()
+
+    after = client.get(f"/audit/packets/{packet_id}/proof", headers=owner_headers).json()
+    assert after["mmr_root"] == before["mmr_root"]
+    assert verify_packet_proof(after, app.state.issuer.verification_key)
+    session = app.state.session_factory()
+    try:
+        assert session.execute(select(Meal.mmr_peaks)).scalar_one() is None  # the read wrote nothing
+    finally:
+        session.close()
+
+    # The next append stores the MMR.
+    _issue(client, owner_headers, fieldlist, grantee="hub-acct-other")
+    stored = client.get(f"/audit/packets/{packet_id}/proof", headers=owner_headers).json()
+    assert stored["leaf_count"] == 3
+    assert verify_packet_proof(stored, app.state.issuer.verification_key)
+    session = app.state.session_factory()
+    try:
+        assert session.execute(select(Meal.mmr_root)).scalar_one() == stored["mmr_root"]
+    finally:
+        session.close()
+
+
+def test_append_checkpoints_an_intact_chain_every_interval(app, monkeypatch):
+    monkeypatch.setattr(mealstore, "CHECKPOINT_INTERVAL", 4)
+    store = MealStore(app.state.issuer)
+    session = app.state.session_factory()
+    try:
+        store.append_events(session, [MealEvent("meal-a", "e", "acct", {"n": n}) for n in range(3)])
+        store.append_events(session, [MealEvent("meal-a", "e", "acct", {"n": n}) for n in range(3, 6)])
+        session.commit()
+        checkpoints = session.execute(select(MealCheckpoint.sequence_number)).scalars().all()
+        assert checkpoints == [3]  # the tip before the batch that crossed 4 packets
+
+        session.execute(update(MealPacket).where(MealPacket.sequence_number == 5).values(payload={"n": -1}))
+        store.append_events(session, [MealEvent("meal-a", "e", "acct", {"n": n}) for n in range(6, 9)])
+        session.commit()
+        # A chain broken since the last checkpoint does not get a new one.
+        assert session.execute(select(MealCheckpoint.sequence_number)).scalars().all() == [3]
+    finally:
+        session.close()
+
+
+def test_append_events_batch_links_chains_and_registers_participants_once(app):
+    store = MealStore(app.state.issuer)
+    session = app.state.session_factory()
+    try:
+        store.append_event(session, "meal-a", "e", "acct-1", {"n": 0})
+        events = [
+            MealEvent(key, "e", f"acct-{n % 2}", {"n": n})
+            for n in range(1, 5)
+            for key in ("meal-a", "meal-b")
+        ]
+        store.append_events(session, events)
+        session.commit()
+
+        for key in ("meal-a", "meal-b"):
+            meal = session.execute(select(Meal).where(Meal.primary_geoid == key)).scalar_one()
+            packets = list(session.execute(
+                select(MealPacket)
+                .where(MealPacket.meal_id == meal.meal_id)
+                .order_by(MealPacket.sequence_number)
+            ).scalars())
+            assert [p.payload["n"] for p in packets] == ([0, 1, 2, 3, 4] if key == "meal-a" else [1, 2, 3, 4])
+            assert all(b.previous_packet_id == a.packet_id for a, b in zip(packets, packets[1:]))
+            assert meal.last_packet_id == packets[-1].packet_id
+            participants = session.execute(
+                select(MealParticipant.agent_id).where(MealParticipant.meal_id == meal.meal_id)
+            ).scalars()
+            assert sorted(participants) == ["acct-0", "acct-1"]
+            assert store.verify_chain(session, meal.meal_id)["valid"] is True
+    finally:
+        session.close()
+
+
+def test_append_recovers_last_packet_id_for_meals_written_without_one(app):
+    store = MealStore(app.state.issuer)
+    session = app.state.session_factory()
+    try:
+        first = store.append_event(session, "meal-a", "e", "acct", {"n": 0})
+        session.execute(update(Meal).values(last_packet_id=None))
+        session.commit()
+        second = store.append_event(session, "meal-a", "e", "acct", {"n": 1})
+        session.commit()
+        assert second.previous_packet_id == first.packet_id
+        assert store.verify_chain(session, second.meal_id)["valid"] is True
+    finally:
+        session.close()
@@ -0,0 +1,137 @@
+"""Parallel MEAL chain verification engine and its offline CLI."""
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+from pancake_services.common.db import Base, make_engine, make_session_factory
+from pancake_services.grants.issuer import IssuerIdentity, generate_keypair_pem
+from pancake_services.grants.meal_verify import ChainVerifier, main
+from pancake_services.grants.mealstore import MealStore
+from pancake_services.grants.models import Meal, MealCheckpoint, MealPacket
+
+
+@pytest.fixture(scope="module")
+def issuer():
+    priv, pub = generate_keypair_pem()
+    return IssuerIdentity("did:web:pancake.test", "kid-1", priv, pub)
+
+
+def _ledger(session_factory, issuer, chains):
+    """Append ``chains[key]`` events to one MEAL per key; returns meal_ids in key order."""
+    store = MealStore(issuer)
+    with session_factory() as db:
+        for key, count in chains.items():
+            for i in range(count):
+                store.append_event(db, key, "grant.issued", "acct", {"n": i}, geoid=key)
+        db.commit()
+        return [db.execute(select(Meal.meal_id).where(Meal.primary_geoid == k)).scalar_one() for k in chains]
+
+
+def _tamper(session_factory, meal_id, sequence_number):
+    with session_factory() as db:
+        packet = db.execute(
+            select(MealPacket).where(
+                MealPacket.meal_id == meal_id, MealPacket.sequence_number == sequence_number
+            )
+        ).scalar_one()
+        packet.payload = {**packet.payload, "n": -1}
+        db.commit()
+
+
+@pytest.fixture()
+def session_factory():
+    engine = make_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return make_session_factory(engine)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verdicts_match_verify_chain(session_factory, issuer, workers):
+    meal_ids = _ledger(session_factory, issuer, {"a": 11, "b": 3, "c": 9})
+    _tamper(session_factory, meal_ids[2], 6)
+    _tamper(session_factory, meal_ids[2], 8)  # later failure in another segment
+
+    verifier = ChainVerifier(issuer.public_key_pem, workers=workers, segment_size=4)
+    with session_factory() as db:
+        verdicts = verifier.verify_chains(db, meal_ids)
+        expected = {m: MealStore(issuer).verify_chain(db, m, full=True) for m in meal_ids}
+    assert verdicts == expected
+    assert verdicts[meal_ids[0]] == {"valid": True, "packet_count": 11, "resumed_from": 0}
+    assert verdicts[meal_ids[2]] == {"valid": False, "error": "content hash mismatch at packet 6"}
+
+
+def test_shared_pool_is_used_and_left_open(session_factory, issuer):
+    meal_ids = _ledger(session_factory, issuer, {"a": 9, "b": 5})
+    _tamper(session_factory, meal_ids[1], 4)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        verifier = ChainVerifier(issuer.public_key_pem, workers=2, segment_size=2, pool=pool)
+        with session_factory() as db:
+            verdicts = verifier.verify_chains(db, meal_ids)
+            again = verifier.verify_chains(db, meal_ids)  # the pool survived the first call
+    assert verdicts == again
+    assert verdicts[meal_ids[0]]["valid"] is True
+    assert verdicts[meal_ids[1]] == {"valid": False, "error": "content hash mismatch at packet 4"}
+
+
+def test_resumes_from_checkpoints_without_writing_any(session_factory, issuer):
+    (meal_id,) = _ledger(session_factory, issuer, {"a": 5})
+    verifier = ChainVerifier(issuer.public_key_pem, workers=1, segment_size=2, store=MealStore(issuer))
+    with session_factory() as db:
+        assert verifier.verify_chains(db, [meal_id])[meal_id]["resumed_from"] == 0
+        assert db.execute(select(MealCheckpoint)).first() is None
+        MealStore(issuer).verify_chain(db, meal_id)  # what the append path records
+        db.commit()
+    _ledger(session_factory, issuer, {"a": 2})
+    with session_factory() as db:
+        assert verifier.verify_chains(db, [meal_id])[meal_id] == {
+            "valid": True, "packet_count": 7, "resumed_from": 5,
+        }
+        assert db.execute(select(MealCheckpoint.sequence_number)).scalars().all() == [5]
+
+
+def test_cli_audits_whole_ledger_read_only(tmp_path, issuer, capsys):
+    url = f"sqlite:///{tmp_path / 'ledger.db'}"
+    engine = make_engine(url)
+    Base.metadata.create_all(engine)
+    factory = make_session_factory(engine)
+    meal_ids = _ledger(factory, issuer, {"a": 3, "b": 2})
+    _tamper(factory, meal_ids[1], 2)
+    key_file = tmp_path / "issuer.pem"
+    key_file.write_bytes(issuer.public_key_pem)
+
+    assert main(["--database-url", url, "--public-key", str(key_file), "--workers", "1"]) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {line["meal_id"]: line["valid"] for line in lines} == {meal_ids[0]: True, meal_ids[1]: False}
+
+
+def test_verify_chain_streams_in_chunks_with_progress(session_factory, issuer):
+    (meal_id,) = _ledger(session_factory, issuer, {"a": 5})
+    calls = []
+    with session_factory() as db:
+        result = MealStore(issuer).verify_chain(
+            db, meal_id, progress=lambda *p: calls.append(p), chunk_size=2
+        )
+    assert result == {"valid": True, "packet_count": 5, "resumed_from": 0}
+    assert calls == [(2, 5), (4, 5), (5, 5)]
+
+    _tamper(session_factory, meal_id, 4)
+    calls.clear()
+    with session_factory() as db:
+        result = MealStore(issuer).verify_chain(
+            db, meal_id, full=True, progress=lambda *p: calls.append(p), chunk_size=2
+        )
+    assert result == {"valid": False, "error": "content hash mismatch at packet 4"}
+    assert calls == [(2, 5)]
+
+
+def test_engine_reports_progress_per_segment(session_factory, issuer):
+    meal_ids = _ledger(session_factory, issuer, {"a": 3, "b": 2})
+    calls = []
+    verifier = ChainVerifier(
+        issuer.public_key_pem, workers=1, segment_size=2, progress=lambda *p: calls.append(p)
+    )
+    with session_factory() as db:
+        verifier.verify_chains(db, meal_ids)
+    assert calls == [(meal_ids[0], 2, 3), (meal_ids[0], 3, 3), (meal_ids[1], 2, 2)]
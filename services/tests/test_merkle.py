@@ -1,13 +1,24 @@
 """Known-answer and property tests for the Merkle ListID (MERKLE_LISTID.md)."""
 import hashlib
+import random
 
 import pytest
 
 from pancake_services.grants.merkle import (
+    NODE_SIZE,
+    MerkleTree,
     canonical_members,
+    consistency_proof,
     inclusion_proof,
+    leaf_count,
     merkle_root,
+    merkle_root_from_file,
+    node_offset,
+    parallel_merkle_root,
+    proof_path,
+    verify_consistency,
     verify_inclusion,
+    verify_multiproof,
 )
 
 # Normative test vectors from services/specs/MERKLE_LISTID.md
@@ -86,3 +97,180 @@ def test_odd_promotion_structure():
     proof = inclusion_proof(members, "geo-c")
     assert len(proof) == 1
     assert proof[0]["position"] == "left"
+
+
+@pytest.mark.parametrize("members", [VECTOR_1[0], VECTOR_2[0], VECTOR_3[0], VECTOR_4[0]])
+def test_tree_matches_merkle_root(members):
+    tree = MerkleTree(members)
+    assert tree.list_id == merkle_root(members)
+    assert tree.members == canonical_members(members)
+
+
+def test_tree_serialization_roundtrip():
+    members = VECTOR_4[0]
+    tree = MerkleTree(members)
+    restored = MerkleTree.from_bytes(tree.members, tree.to_bytes())
+    assert restored.levels == tree.levels
+    assert restored.list_id == VECTOR_4[1]
+    with pytest.raises(ValueError):
+        MerkleTree.from_bytes(tree.members[:-1], tree.to_bytes())
+
+
+def test_incremental_insert_and_remove_match_full_rebuild():
+    """Every edit position, including the promoted tail node, matches a rebuild."""
+    base = [f"geo-{i:02d}" for i in range(0, 26, 2)]  # 13 members: odd at several levels
+    for candidate in [f"geo-{i:02d}" for i in range(-1, 27)]:
+        tree = MerkleTree(base)
+        if candidate in tree:
+            tree.update(remove=[candidate])
+            expected = [g for g in base if g != candidate]
+        else:
+            tree.update(add=[candidate])
+            expected = base + [candidate]
+        assert tree.list_id == merkle_root(expected), candidate
+        assert tree.levels == MerkleTree(expected).levels
+
+
+def test_incremental_batches_match_full_rebuild():
+    rng = random.Random(7)
+    universe = [f"geo-{i:04d}" for i in range(300)]
+    current = set(rng.sample(universe, 120))
+    tree = MerkleTree(current)
+    for _ in range(40):
+        add = set(rng.sample(universe, rng.randint(0, 5)))
+        remove = set(rng.sample(sorted(current - add), rng.randint(0, 5)))
+        tree.update(add=add, remove=remove)
+        current = (current | add) - remove
+        assert tree.list_id == merkle_root(list(current))
+
+
+def test_update_reports_effective_changes():
+    tree = MerkleTree(["geo-a", "geo-b"])
+    added, removed = tree.update(add=["geo-b", "geo-c"], remove=["geo-a"])
+    assert (added, removed) == (["geo-c"], ["geo-a"])
+    assert tree.list_id == merkle_root(["geo-b", "geo-c"])
+
+
+@pytest.mark.parametrize("add,remove", [
+    ([], ["geo-z"]),  # not a member
+    (["geo-a"], ["geo-a"]),  # ambiguous
+    ([], ["geo-a", "geo-b"]),  # would empty the list
+])
+def test_invalid_update_leaves_tree_untouched(add, remove):
+    tree = MerkleTree(["geo-a", "geo-b"])
+    before = tree.list_id
+    with pytest.raises(ValueError):
+        tree.update(add=add, remove=remove)
+    assert tree.list_id == before
+    assert tree.members == ["geo-a", "geo-b"]
+
+
+def test_proof_path_slices_match_in_memory_proof():
+    """Proofs sliced from serialized levels equal proofs from the restored tree."""
+    tree = MerkleTree([f"geo-{i:02d}" for i in range(13)])
+    data = tree.to_bytes()
+    assert leaf_count(data) == 13
+    for index, geoid in enumerate(tree.members):
+        sliced = [
+            {"sibling": data[off:off + NODE_SIZE].hex(), "position": position}
+            for off, position in (
+                (node_offset(13, level, i), position) for level, i, position in proof_path(13, index)
+            )
+        ]
+        assert sliced == tree.inclusion_proof(geoid)
+        assert verify_inclusion(geoid, sliced, tree.list_id)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 12, 13, 33])
+def test_multiproofs_verify_for_every_subset_shape(size):
+    rng = random.Random(size)
+    members = [f"geo-{i:02d}" for i in range(size)]
+    tree = MerkleTree(members)
+    for _ in range(20):
+        subset = rng.sample(members, rng.randint(1, size))
+        proof = tree.multiproof(subset)
+        assert verify_multiproof(subset, proof, tree.list_id)
+
+
+def test_multiproof_shares_upper_levels():
+    members = [f"geo-{i:02d}" for i in range(32)]
+    tree = MerkleTree(members)
+    proof = tree.multiproof(members[:16])
+    assert proof["nodes"] == [tree.levels[4][1].hex()]  # only the other half's root
+    assert tree.multiproof(members)["nodes"] == []
+
+
+def test_multiproof_rejects_tampering():
+    members = [f"geo-{i:02d}" for i in range(13)]
+    tree = MerkleTree(members)
+    subset = ["geo-01", "geo-07", "geo-12"]
+    proof = tree.multiproof(subset)
+    assert not verify_multiproof(["geo-01", "geo-07", "geo-11"], proof, tree.list_id)
+    assert not verify_multiproof(subset[:2], proof, tree.list_id)
+    assert not verify_multiproof(subset, {**proof, "nodes": proof["nodes"][:-1]}, tree.list_id)
+    assert not verify_multiproof(subset, {**proof, "nodes": proof["nodes"] + ["00" * 32]}, tree.list_id)
+    assert not verify_multiproof(subset, {**proof, "leaf_count": 14}, tree.list_id)
+    assert not verify_multiproof(subset, {**proof, "indices": [1, 7, 13]}, tree.list_id)
+    assert not verify_multiproof(subset, {"nodes": []}, tree.list_id)
+    with pytest.raises(ValueError):
+        tree.multiproof(["geo-99"])
+
+
+@pytest.mark.parametrize("size", [1, 7, 8, 9, 33, 100])
+@pytest.mark.parametrize("chunk_size", [1, 4, 8])
+def test_parallel_root_matches_serial(size, chunk_size):
+    members = [f"geo-{i:03d}" for i in range(size)]
+    assert parallel_merkle_root(members, workers=1, chunk_size=chunk_size) == merkle_root(members)
+
+
+def test_parallel_root_in_process_pool():
+    members = [f"geo-{i:03d}" for i in range(101)]
+    assert parallel_merkle_root(members[::-1], workers=2, chunk_size=16) == merkle_root(members)
+
+
+def test_streaming_root_from_sorted_file(tmp_path):
+    members = [f"geo-{i:03d}" for i in range(45)]
+    path = tmp_path / "geoids.txt"
+    path.write_text("\n".join(members[:10] + members[9:]) + "\n\n")  # duplicate + blank lines
+    assert merkle_root_from_file(str(path), workers=2, chunk_size=8) == merkle_root(members)
+    assert merkle_root_from_file(str(path), workers=1, chunk_size=64) == merkle_root(members)
+
+
+def test_streaming_root_rejects_unsorted_or_empty_input(tmp_path):
+    unsorted = tmp_path / "unsorted.txt"
+    unsorted.write_text("geo-b\ngeo-a\n")
+    empty = tmp_path / "empty.txt"
+    empty.write_text("\n")
+    for path in (unsorted, empty):
+        with pytest.raises(ValueError):
+            merkle_root_from_file(str(path), workers=1)
+
+
+def test_chunk_size_must_be_power_of_two():
+    with pytest.raises(ValueError):
+        parallel_merkle_root(["geo-a"], chunk_size=6)
+
+
+def test_consistency_proof_roundtrip():
+    old = [f"geo-{i:02d}" for i in range(0, 30, 3)]
+    new = old + ["geo-01", "geo-29", "geo-99"]
+    proof = consistency_proof(old, new)
+    assert proof["added"] == ["geo-01", "geo-29", "geo-99"]
+    tree = MerkleTree(old)
+    assert verify_consistency(tree, proof, merkle_root(new))
+    assert tree.list_id == merkle_root(old)  # verification does not advance the caller's tree
+
+
+def test_consistency_proof_rejects_removal_and_tampering():
+    old = ["geo-a", "geo-b", "geo-c"]
+    with pytest.raises(ValueError):
+        consistency_proof(old, ["geo-a", "geo-b", "geo-d"])
+
+    new = old + ["geo-d"]
+    proof = consistency_proof(old, new)
+    tree = MerkleTree(old)
+    assert not verify_consistency(tree, proof, merkle_root(["geo-a", "geo-b", "geo-e"]))
+    assert not verify_consistency(tree, {**proof, "added": ["geo-e"]}, merkle_root(new))
+    assert not verify_consistency(tree, {**proof, "added": ["geo-a", "geo-d"]}, merkle_root(new))
+    assert not verify_consistency(MerkleTree(["geo-a", "geo-b"]), proof, merkle_root(new))
+    assert not verify_consistency(tree, {"added": []}, merkle_root(new))
@@ -0,0 +1,61 @@
+"""Merkle Mountain Range accumulator over MEAL packet hashes."""
+import hashlib
+
+import pytest
+
+from pancake_services.grants import mmr
+
+
+def _leaf(i):
+    return hashlib.sha256(f"packet-{i}".encode()).digest()
+
+
+def _subtree(leaves):
+    level = list(leaves)
+    while len(level) > 1:
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def _build(n):
+    peaks, nodes = [], {}
+    for i in range(n):
+        peaks, created = mmr.append(peaks, i, _leaf(i))
+        nodes.update({(h, j): node for h, j, node in created})
+    nodes.update({(0, i): _leaf(i) for i in range(n)})
+    return peaks, nodes
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 8, 13])
+def test_peaks_are_roots_of_perfect_mountains(n):
+    peaks, _ = _build(n)
+    start, expected = 0, []
+    for height in mmr.peak_heights(n):
+        expected.append(_subtree([_leaf(i) for i in range(start, start + (1 << height))]))
+        start += 1 << height
+    assert peaks == expected
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 8, 11])
+def test_every_leaf_proves_against_the_root(n):
+    peaks, nodes = _build(n)
+    root = mmr.root(peaks, n)
+    for i in range(n):
+        _, path = mmr.proof_path(n, i)
+        assert len(path) <= n.bit_length()
+        siblings = [{"sibling": nodes[(h, j)].hex(), "position": pos} for h, j, pos in path]
+        assert mmr.verify_inclusion(_leaf(i), i, n, siblings, peaks, root)
+        assert not mmr.verify_inclusion(_leaf(i + 1), i, n, siblings, peaks, root)
+
+
+def test_root_binds_leaf_count_and_rejects_bad_proofs():
+    peaks, nodes = _build(6)
+    assert mmr.root(peaks, 6) != mmr.root(peaks, 7)
+    _, path = mmr.proof_path(6, 1)
+    siblings = [{"sibling": nodes[(h, j)].hex(), "position": pos} for h, j, pos in path]
+    root = mmr.root(peaks, 6)
+    assert not mmr.verify_inclusion(_leaf(1), 0, 6, siblings, peaks, root)  # wrong position
+    assert not mmr.verify_inclusion(_leaf(1), 1, 6, siblings[:-1], peaks, root)
+    assert not mmr.verify_inclusion(_leaf(1), 9, 6, siblings, peaks, root)
+    with pytest.raises(IndexError):
+        mmr.proof_path(6, 6)
@@ -0,0 +1,12 @@
+"""The committed API catalog (openapi.json) matches the app."""
+import json
+from pathlib import Path
+
+CATALOG = Path(__file__).resolve().parents[1] / "openapi.json"
+
+
+def test_committed_openapi_matches_the_app(app):
+    committed = json.loads(CATALOG.read_text())
+    assert committed == json.loads(json.dumps(app.openapi())), (
+        "openapi.json is stale: run `python export_openapi.py`"
+    )
@@ -0,0 +1,155 @@
+"""Upgrading a grants database created by an earlier release."""
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from pancake_services.common.db import Base, make_engine
+from pancake_services.grants.mealstore import _content_hash, _packet_hash
+from pancake_services.grants.merkle import merkle_root
+from pancake_services.grants.models import Grant, MealParticipant, StatusListState
+from pancake_services.grants.schema import upgrade_schema
+from pancake_services.grants.statuslist import StatusList
+
+
+BASELINE_SCHEMA = Path(__file__).parent / "data" / "grants_baseline_schema.sql"
+OLD = "2026-01-01 00:00:00.000000"
+
+
+def _baseline_database(path, issuer, list_id, geoids):
+    """A database as the baseline release left it: one list, one revoked grant, one MEAL packet."""
+    status = StatusList(65536)
+    status.set(0)
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    author = {"agent_id": "hub-acct-owner", "agent_type": "human"}
+    body = {"event_type": "fieldlist.created", "list_id": list_id, "name": "Finca", "geoid_count": 3}
+    content_hash = _content_hash(body)
+    packet_hash = _packet_hash("P1", "M1", 1, created.isoformat(), author, content_hash, None)
+    signature = issuer.signing_key.sign(bytes.fromhex(packet_hash)).hex()
+    participants = [{"agent_id": "hub-acct-owner", "agent_type": "human", "joined_at": created.isoformat()}]
+
+    con = sqlite3.connect(path)
+    con.executescript(BASELINE_SCHEMA.read_text())
+    con.execute("INSERT INTO users VALUES (1, 'hub-acct-owner', 'owner@x.org', ?)", (OLD,))
+    con.execute("INSERT INTO fieldlists VALUES (1, ?, 'Finca', 1, ?)", (list_id, OLD))
+    con.executemany(
+        "INSERT INTO fieldlist_members (fieldlist_id, geoid) VALUES (1, ?)", [(g,) for g in geoids]
+    )
+    con.execute("INSERT INTO status_list_state VALUES (1, ?, 1, ?)", (status.encode(), OLD))
+    con.execute(
+        "INSERT INTO grants VALUES (1, 'jti-old', ?, 1, 'hub-acct-buyer', 'p', 'L1', ?, 'revoked', 0,"
+        " 'credential', ?, ?)",
+        (list_id, "2027-01-01 00:00:00.000000", OLD, OLD),
+    )
+    con.execute(
+        "INSERT INTO meals VALUES ('M1', 'grant_lifecycle', ?, ?, ?, ?, 1, NULL, ?, 0)",
+        (OLD, OLD, list_id, json.dumps(participants), packet_hash),
+    )
+    con.execute(
+        "INSERT INTO meal_packets VALUES ('P1', 'M1', 'sip', 1, NULL, NULL, ?, ?, ?, ?, ?, ?, ?)",
+        (OLD, list_id, json.dumps(author), json.dumps(body), content_hash, packet_hash, signature),
+    )
+    con.commit()
+    con.close()
+
+
+def test_baseline_database_starts_and_keeps_its_data(tmp_path, make_app, dev_issuer, owner_headers, geoids):
+    path = tmp_path / "grants.db"
+    list_id = merkle_root(geoids)
+    _baseline_database(path, dev_issuer, list_id, geoids)
+
+    client = TestClient(make_app(database_url=f"sqlite:///{path}"))
+
+    listed = client.get("/fieldlists", headers=owner_headers).json()
+    assert [(f["list_id"], f["geoids"]) for f in listed] == [(list_id, sorted(geoids))]
+    issued = client.get("/grants/issued", headers=owner_headers).json()
+    assert [(g["jti"], g["status"]) for g in issued] == [("jti-old", "revoked")]
+    encoded = client.get("/grants/status-list").json()["encoded"]
+    assert StatusList.decode(encoded).is_revoked(0)
+
+    new = client.post(
+        "/grants/issue",
+        json={"list_id": list_id, "grantee_account": "hub-acct-buyer", "purpose": "p"},
+        headers=owner_headers,
+    )
+    assert new.status_code == 201, new.text
+    assert new.json()["status_list_index"] == 1
+    edit = client.patch(f"/fieldlists/{list_id}", json={"add": ["geo-new"]}, headers=owner_headers)
+    assert edit.status_code == 200, edit.text
+
+    report = client.get(f"/audit/{geoids[0]}/report", params={"full": True}, headers=owner_headers).json()
+    assert report["all_chains_valid"] is True
+    assert report["events"][0]["packet_id"] == "P1"
+    engine = make_engine(f"sqlite:///{path}")
+    with Session(engine) as db:
+        rows = db.execute(select(MealParticipant.meal_id, MealParticipant.agent_id)).all()
+        assert rows == [("M1", "hub-acct-owner")]
+
+    make_app(database_url=f"sqlite:///{path}")  # a second start finds nothing to upgrade
+
+
+def test_upgrade_converts_the_encoded_status_list(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'grants.db'}")
+    status = StatusList(64)
+    status.set(5)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE status_list_state (id INTEGER NOT NULL, encoded TEXT NOT NULL,"
+            " next_index INTEGER NOT NULL, updated_at DATETIME NOT NULL, PRIMARY KEY (id))"
+        ))
+        conn.execute(
+            text("INSERT INTO status_list_state VALUES (1, :encoded, 7, '2026-01-01 00:00:00')"),
+            {"encoded": status.encode()},
+        )
+    Base.metadata.create_all(engine)
+
+    upgrade_schema(engine)
+
+    assert "encoded" not in {c["name"] for c in inspect(engine).get_columns("status_list_state")}
+    with Session(engine) as db:
+        state = db.execute(select(StatusListState)).scalar_one()
+        assert (state.shard, state.version, state.next_index) == (0, 1, 7)
+        assert StatusList.from_bytes(state.bits).is_revoked(5)
+
+
+def test_upgrade_makes_status_indices_unique_per_shard(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'grants.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE grants (id INTEGER NOT NULL, jti VARCHAR(64) NOT NULL,"
+            " list_id VARCHAR(64) NOT NULL, issuer_user_id INTEGER NOT NULL,"
+            " grantee_account VARCHAR(128) NOT NULL, purpose VARCHAR(256) NOT NULL,"
+            " masking_level VARCHAR(8) NOT NULL, expires_at DATETIME NOT NULL,"
+            " status VARCHAR(16) NOT NULL, status_list_index INTEGER NOT NULL,"
+            " credential TEXT NOT NULL, created_at DATETIME NOT NULL, revoked_at DATETIME,"
+            " PRIMARY KEY (id), UNIQUE (status_list_index))"
+        ))
+        conn.execute(text("CREATE UNIQUE INDEX ix_grants_jti ON grants (jti)"))
+        conn.execute(text(
+            "INSERT INTO grants VALUES (1, 'jti-1', 'L', 1, 'buyer', 'p', 'L1',"
+            " '2027-01-01 00:00:00', 'active', 0, 'cred', '2026-01-01 00:00:00', NULL)"
+        ))
+    Base.metadata.create_all(engine)
+
+    upgrade_schema(engine)
+
+    def grant(jti, shard):
+        return insert(Grant).values(
+            jti=jti, list_id="L", issuer_user_id=1, grantee_account="buyer", purpose="p",
+            masking_level="L1", expires_at=datetime(2027, 1, 1), status="active",
+            status_list_shard=shard, status_list_index=0, credential="cred",
+        )
+
+    with Session(engine) as db:
+        assert db.execute(select(Grant.jti, Grant.status_list_shard)).all() == [("jti-1", 0)]
+        db.execute(grant("jti-2", 1))
+        db.commit()
+        with pytest.raises(IntegrityError):
+            db.execute(grant("jti-3", 0))
+    upgrade_schema(engine)  # idempotent
@@ -3,7 +3,7 @@ import time
 
 import pytest
 
-from pancake_services.grants import sdjwt
+from pancake_services.grants import merkle, sdjwt
 from pancake_services.grants.issuer import generate_keypair_pem
 
 GEOIDS = ["geoid-aaa", "geoid-bbb", "geoid-ccc"]
@@ -123,8 +123,91 @@ def test_selective_disclosure_subset(keypair):
     assert result.disclosed_geoids[0] in GEOIDS
 
 
+def test_present_keeps_only_requested_disclosures(keypair):
+    priv, pub = keypair
+    cred = sdjwt.issue(make_claims(), GEOIDS, priv, "kid-1")
+    presentation = sdjwt.present(cred, [GEOIDS[1]])
+    assert presentation.startswith(cred.split("~", 1)[0] + "~")
+    assert presentation.endswith("~")
+    assert len([p for p in presentation.split("~") if p]) == 2
+    assert sdjwt.verify(presentation, pub).disclosed_geoids == [GEOIDS[1]]
+
+    both = sdjwt.verify(sdjwt.present(cred, GEOIDS[::2]), pub)
+    assert sorted(both.disclosed_geoids) == sorted(GEOIDS[::2])
+
+
+def test_present_rejects_undisclosed_geoid(keypair):
+    priv, _ = keypair
+    cred = sdjwt.issue(make_claims(), GEOIDS[:2], priv, "kid-1")
+    with pytest.raises(ValueError, match="no disclosure"):
+        sdjwt.present(cred, [GEOIDS[0], GEOIDS[2]])
+    with pytest.raises(ValueError, match="malformed"):
+        sdjwt.present(cred + "not-base64-json~", [GEOIDS[0]])
+
+
+def test_targeted_verify_checks_only_requested_geoids(keypair):
+    priv, pub = keypair
+    cred = sdjwt.issue(make_claims(), GEOIDS, priv, "kid-1")
+    result = sdjwt.verify(cred, pub, geoids=[GEOIDS[2]])
+    assert result.disclosed_geoids == [GEOIDS[2]]
+    assert result.disclosed_geoid_set == frozenset({GEOIDS[2]})
+    assert sdjwt.verify(cred, pub, geoids=["geoid-zzz"]).disclosed_geoid_set == frozenset()
+
+    # A forged disclosure for the requested GeoID is still rejected ...
+    forged, _ = sdjwt._disclosure("fields.9", "geoid-zzz")
+    with pytest.raises(sdjwt.VerificationError, match="not present in _sd"):
+        sdjwt.verify(cred + forged + "~", pub, geoids=["geoid-zzz"])
+    # ... while one for a GeoID the caller does not rely on is skipped, not disclosed.
+    skipped = sdjwt.verify(cred + forged + "~", pub, geoids=[GEOIDS[0]])
+    assert skipped.disclosed_geoids == [GEOIDS[0]]
+
+
 def test_peek_claims_without_verification(keypair):
     priv, _ = keypair
     cred = sdjwt.issue(make_claims(), GEOIDS, priv, "kid-1")
     claims = sdjwt.peek_claims(cred)
     assert claims["status"]["status_list"]["idx"] == 5
+
+
+def test_parsed_issuer_keys_interoperate_with_pem(keypair):
+    from pancake_services.grants.issuer import IssuerIdentity
+
+    priv, pub = keypair
+    identity = IssuerIdentity("did:web:test", "kid-1", priv, pub)
+    assert identity.signing_key is identity.signing_key  # parsed once
+    cred = sdjwt.issue(make_claims(), GEOIDS, identity.signing_key, identity.kid)
+    assert sorted(sdjwt.verify(cred, pub).disclosed_geoids) == sorted(GEOIDS)
+    pem_cred = sdjwt.issue(make_claims(), GEOIDS, priv, identity.kid)
+    assert sdjwt.verify(pem_cred, identity.verification_key).claims["grantee"] == "hub-acct-1"
+
+
+def _merkle_credential(priv, members):
+    tree = merkle.MerkleTree(members)
+    return sdjwt.issue_merkle({**make_claims(), "sub": tree.list_id}, priv, "kid-1"), tree
+
+
+def test_merkle_profile_proves_only_presented_geoids(keypair):
+    priv, pub = keypair
+    members = [f"geoid-{i:04d}" for i in range(1000)]
+    cred, tree = _merkle_credential(priv, members)
+    assert sdjwt.profile(cred) == sdjwt.MERKLE_VCT
+    assert len(cred) < 1000  # independent of list size
+
+    assert sdjwt.verify(cred, pub).disclosed_geoid_set == frozenset()
+    wanted = [members[7], members[500]]
+    presentation = sdjwt.present_merkle(cred, wanted, tree.multiproof(wanted))
+    assert sdjwt.verify(presentation, pub).disclosed_geoid_set == frozenset(wanted)
+    assert sdjwt.verify(presentation, pub, geoids=[members[7]]).disclosed_geoids == [members[7]]
+    with pytest.raises(sdjwt.VerificationError, match="unexpected vct"):
+        sdjwt.verify(presentation, pub, expected_vct=sdjwt.VCT)
+
+
+def test_merkle_proof_for_another_list_rejected(keypair):
+    priv, pub = keypair
+    cred, _ = _merkle_credential(priv, GEOIDS)
+    other = merkle.MerkleTree(GEOIDS + ["geoid-ddd"])
+    forged = sdjwt.present_merkle(cred, ["geoid-ddd"], other.multiproof(["geoid-ddd"]))
+    with pytest.raises(sdjwt.VerificationError, match="does not verify against sub"):
+        sdjwt.verify(forged, pub)
+    with pytest.raises(sdjwt.VerificationError, match="malformed membership proof"):
+        sdjwt.verify(cred + "not-base64-json~", pub)
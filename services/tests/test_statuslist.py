@@ -1,7 +1,15 @@
 """Tests for the StatusList2021-style revocation bitstring."""
+from datetime import datetime, timedelta, timezone
+
 import pytest
+from sqlalchemy import select
 
-from pancake_services.grants.statuslist import StatusList
+from pancake_services.common.db import Base, make_engine, make_session_factory
+from pancake_services.grants import models  # noqa: F401  (registers tables)
+from pancake_services.grants import statuslist_service
+from pancake_services.grants.statuslist import StatusList, apply_changes
+from pancake_services.grants.models import StatusIndexBlock, StatusListState
+from pancake_services.grants.statuslist_service import StatusIndexAllocator, StatusListCache
 
 
 def test_default_all_unrevoked():
@@ -54,3 +62,260 @@ def test_invalid_size_rejected():
 def test_encoding_is_compact():
     sl = StatusList()  # 64K bits, all zero
     assert len(sl.encode()) < 100  # zlib collapses the zero run
+
+
+def test_bytes_roundtrip():
+    sl = StatusList(size=16)
+    sl.set(9)
+    assert StatusList.from_bytes(sl.to_bytes()).is_revoked(9)
+
+
+@pytest.fixture()
+def session_factory():
+    engine = make_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return make_session_factory(engine)
+
+
+def _revoke(session_factory, index):
+    with session_factory() as db:
+        statuslist_service.revoke_index(db, index, 1024, 0)
+        db.commit()
+
+
+def test_cache_reuses_bitmap_until_version_changes(session_factory):
+    cache = StatusListCache(1024, 0)
+    with session_factory() as db:
+        version, first = cache.snapshot(db)
+        assert not cache.is_revoked(db, 5)
+        assert cache.snapshot(db) == (version, first)  # same object, no reload
+
+    _revoke(session_factory, 5)
+    with session_factory() as db:
+        new_version, status = cache.snapshot(db)
+        assert new_version == version + 1
+        assert status is not first
+        assert cache.is_revoked(db, 5)
+
+
+def test_reads_never_create_shard_rows(session_factory):
+    cache = StatusListCache(1024, 0, shard=3)
+    with session_factory() as db:
+        version, status = cache.snapshot(db)
+        assert (version, status.is_revoked(5)) == (0, False)
+        assert cache.snapshot(db)[1] is status
+        db.commit()
+        assert db.execute(select(StatusListState)).first() is None
+
+
+def test_revoking_a_set_bit_keeps_the_version(session_factory):
+    _revoke(session_factory, 3)
+    cache = StatusListCache(1024, 0)
+    with session_factory() as db:
+        version, _ = cache.snapshot(db)
+    _revoke(session_factory, 3)
+    with session_factory() as db:
+        assert cache.snapshot(db)[0] == version
+
+
+def test_concurrent_revocations_each_get_their_own_version(session_factory):
+    _revoke(session_factory, 1)
+    with session_factory() as stale:
+        copy = stale.execute(select(StatusListState)).scalar_one()  # this worker's copy: version 1
+        _revoke(session_factory, 5)  # another worker publishes version 2 meanwhile
+        statuslist_service.revoke_index(stale, 6, 1024, 0)
+        stale.commit()
+        assert copy.version == 3
+
+    with session_factory() as db:
+        state = db.execute(select(StatusListState)).scalar_one()
+        assert state.version == 3
+        assert all(StatusList.from_bytes(state.bits).is_revoked(i) for i in (1, 5, 6))
+        assert statuslist_service.changes_between(db, 0, 3, limit=10) == [1, 5, 6]
+
+
+def test_encoded_form_built_once_per_version(session_factory, monkeypatch):
+    cache = StatusListCache(1024, 0)
+    calls = []
+    real_encode = StatusList.encode
+    monkeypatch.setattr(StatusList, "encode", lambda self: calls.append(1) or real_encode(self))
+
+    with session_factory() as db:
+        encoded = cache.encoded(db)
+        assert cache.encoded(db) == encoded
+    assert len(calls) == 1
+
+    _revoke(session_factory, 7)
+    with session_factory() as db:
+        assert StatusList.decode(cache.encoded(db)).is_revoked(7)
+    assert len(calls) == 2
+
+
+def test_published_body_rendered_once_per_version(session_factory):
+    cache = StatusListCache(1024, 0)
+    renders = []
+
+    def render(version, encoded):
+        renders.append(version)
+        return encoded.encode()
+
+    with session_factory() as db:
+        version, body = cache.published(db, render)
+        assert cache.published(db, render) == (version, body)
+    _revoke(session_factory, 1)
+    with session_factory() as db:
+        assert cache.published(db, render)[0] == version + 1
+    assert len(renders) == 2
+
+
+def test_changes_between_covers_each_version(session_factory):
+    for index in (4, 9, 4, 11):
+        _revoke(session_factory, index)
+    with session_factory() as db:
+        assert statuslist_service.changes_between(db, 0, 3, limit=10) == [4, 9, 11]
+        assert statuslist_service.changes_between(db, 2, 3, limit=10) == [11]
+        assert statuslist_service.changes_between(db, 3, 3, limit=10) == []
+        assert statuslist_service.changes_between(db, 0, 3, limit=2) is None  # gap too large
+        assert statuslist_service.changes_between(db, 5, 3, limit=10) is None  # unknown version
+
+
+def test_apply_changes_delta_and_full():
+    local = StatusList(size=64)
+    assert apply_changes(local, {"version": 2, "since": 0, "indices": [3, 5]}) is local
+    assert local.is_revoked(3) and local.is_revoked(5)
+
+    remote = StatusList(size=64)
+    remote.set(40)
+    full = {"uri": "u", "encoded": remote.encode(), "size": 64, "version": 9}
+    replaced = apply_changes(local, {"version": 9, "since": 2, "full": full})
+    assert replaced.is_revoked(40) and not replaced.is_revoked(3)
+
+    with pytest.raises(ValueError):
+        apply_changes(None, {"version": 1, "since": 0, "indices": [1]})
+
+
+def _blocks(session_factory):
+    with session_factory() as db:
+        rows = db.execute(select(StatusIndexBlock).order_by(StatusIndexBlock.start)).scalars().all()
+        return [(b.start, b.end, b.next_free, b.owner) for b in rows]
+
+
+def _indices(slots):
+    assert {slot.shard for slot in slots} <= {0}
+    return [slot.index for slot in slots]
+
+
+def test_workers_claim_disjoint_blocks(session_factory):
+    a = StatusIndexAllocator(session_factory, 1024, 0, block_size=4)
+    b = StatusIndexAllocator(session_factory, 1024, 0, block_size=4)
+    assert _indices(a.take(3)) == [0, 1, 2]
+    assert _indices(b.take(2)) == [4, 5]
+    assert _indices(a.take(3)) == [3, 8, 9]  # finishes its block, then claims the next free one
+    assert _blocks(session_factory) == [(0, 4, 4, None), (4, 8, 4, b.owner), (8, 12, 8, a.owner)]
+
+
+def test_allocator_enforces_hub_range_and_reuses_given_back(session_factory):
+    alloc = StatusIndexAllocator(session_factory, 8, 0, block_size=4, max_shards=1)
+    taken = alloc.take(6)
+    assert _indices(taken) == [0, 1, 2, 3, 4, 5]
+    with pytest.raises(RuntimeError, match="exhausted"):
+        alloc.take(3)
+    alloc.give_back(taken[1:3])
+    assert _indices(alloc.take(4)) == [1, 2, 6, 7]
+
+
+def test_release_lets_another_worker_reclaim_unused_indices(session_factory):
+    first = StatusIndexAllocator(session_factory, 16, 0, block_size=8)
+    used = first.take(5)
+    first.give_back(used[1:3])  # an issuance that rolled back
+    first.release()
+    assert _blocks(session_factory) == [(0, 8, 5, None), (1, 3, 1, None)]
+
+    second = StatusIndexAllocator(session_factory, 16, 0, block_size=8)
+    assert _indices(second.take(6)) == [5, 6, 7, 1, 2, 8]
+
+
+class _Clock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+def _issued(session_factory, *indices):
+    with session_factory() as db:
+        db.add_all(
+            models.Grant(
+                jti=f"jti-{i}", list_id="L", issuer_user_id=1, grantee_account="g", purpose="p",
+                expires_at=datetime(2030, 1, 1, tzinfo=timezone.utc), status_list_index=i, credential="c",
+            )
+            for i in indices
+        )
+        db.commit()
+
+
+def test_block_of_a_crashed_worker_is_reclaimed_after_its_lease(session_factory):
+    clock = _Clock()
+    crashed = StatusIndexAllocator(session_factory, 1024, 0, block_size=8, lease_seconds=60, clock=clock)
+    assert _indices(crashed.take(3)) == [0, 1, 2]
+    _issued(session_factory, 0, 1)  # index 2 was in flight when the worker died; no release()
+
+    other = StatusIndexAllocator(session_factory, 1024, 0, block_size=8, lease_seconds=60, clock=clock)
+    assert _indices(other.take(1)) == [8]  # lease still live: a fresh block
+    other.release()
+    clock.now += timedelta(seconds=61)
+    survivor = StatusIndexAllocator(session_factory, 1024, 0, block_size=8, lease_seconds=60, clock=clock)
+    assert _indices(survivor.take(2)) == [2, 3]  # resumes after the last issued grant
+    assert _blocks(session_factory)[0] == (0, 8, 2, survivor.owner)
+
+
+def test_worker_whose_lease_lapsed_leaves_the_reclaimed_block_alone(session_factory):
+    clock = _Clock()
+    slow = StatusIndexAllocator(session_factory, 1024, 0, block_size=8, lease_seconds=60, clock=clock)
+    assert _indices(slow.take(8)) == list(range(8))  # block used up, not yet written back
+    _issued(session_factory, *range(6))
+    clock.now += timedelta(seconds=61)
+    survivor = StatusIndexAllocator(session_factory, 1024, 0, block_size=8, lease_seconds=60, clock=clock)
+    assert _indices(survivor.take(1)) == [6]
+
+    assert _indices(slow.take(1)) == [8]  # moves on without releasing the block it lost
+    assert _blocks(session_factory)[0] == (0, 8, 6, survivor.owner)
+
+
+def test_live_worker_renews_its_lease(session_factory):
+    clock = _Clock()
+    alloc = StatusIndexAllocator(session_factory, 1024, 0, block_size=8, lease_seconds=60, clock=clock)
+    alloc.take(1)
+    clock.now += timedelta(seconds=40)
+    alloc.take(1)  # past half the lease: renewed
+    clock.now += timedelta(seconds=40)  # 80s after the claim, 40s after the renewal
+    other = StatusIndexAllocator(session_factory, 1024, 0, block_size=8, lease_seconds=60, clock=clock)
+    assert _indices(other.take(1)) == [8]
+    assert _indices(alloc.take(1)) == [2]
+
+
+def test_slot_positions_and_shard_uris():
+    assert statuslist_service.slot_at(19, 8, 0) == (2, 3)
+    assert statuslist_service.position_of(statuslist_service.slot_at(19, 8, 0), 8) == 19
+    base = "https://issuer.example/grants/status-list"
+    assert statuslist_service.shard_uri(base, 0) == base
+    assert statuslist_service.shard_of(statuslist_service.shard_uri(base, 12), base) == 12
+    assert statuslist_service.shard_of(base, base) == 0
+    for foreign in ("https://other.example/status", base + "/x", base + "/01", base + "/-1"):
+        assert statuslist_service.shard_of(foreign, base) is None
+
+
+def test_allocator_rolls_over_to_a_new_shard(session_factory):
+    alloc = StatusIndexAllocator(session_factory, 8, 0, block_size=4, max_shards=0)
+    slots = alloc.take(10)
+    assert slots[:8] == [(0, i) for i in range(8)]
+    assert slots[8:] == [(1, 0), (1, 1)]
+    with session_factory() as db:
+        assert statuslist_service.shard_count(db) == 2
+        statuslist_service.revoke_index(db, 1, 8, 0, shard=1)
+        db.commit()
+        shard0, shard1 = StatusListCache(8, 0, shard=0), StatusListCache(8, 0, shard=1)
+        assert shard1.is_revoked(db, 1) and not shard0.is_revoked(db, 1)
+        assert statuslist_service.changes_between(db, 0, 1, 10, shard=1) == [1]
+        assert statuslist_service.changes_between(db, 0, 0, 10, shard=0) == []
@@ -0,0 +1,161 @@
+"""Offline relying-party verifier: cached keys, status lists and verified credentials."""
+import threading
+import time
+
+import pytest
+
+from pancake_services.grants import sdjwt
+from pancake_services.grants.sdjwt import VerificationError
+from pancake_services.grants.statuslist import StatusList
+from pancake_services.grants.testkit.mint_test_credentials import base_claims
+from pancake_services.grants.verifier import FetchError, HttpFetcher, StaticFetcher, Verifier
+
+URI = "https://issuer.test/grants/status-list"
+GEOIDS = ["geo-a", "geo-b", "geo-c"]
+
+
+class Clock:
+    def __init__(self, now=None):
+        self.now = time.time() if now is None else now
+
+    def __call__(self):
+        return self.now
+
+
+def _document(status, version=0):
+    return {"uri": URI, "encoded": status.encode(), "size": status.size, "version": version}
+
+
+@pytest.fixture()
+def credential(dev_issuer):
+    claims = base_claims(dev_issuer.issuer_id, "urn:pancake:fieldlist:test", int(time.time()) + 3600, idx=5)
+    claims["status"]["status_list"]["uri"] = URI
+    return sdjwt.issue(claims, GEOIDS, dev_issuer.private_key_pem, dev_issuer.kid)
+
+
+@pytest.fixture()
+def fetcher():
+    return StaticFetcher({URI: _document(StatusList(size=64))})
+
+
+def _verifier(dev_issuer, fetcher, **kwargs):
+    return Verifier({dev_issuer.kid: dev_issuer.public_key_pem}, fetcher=fetcher, **kwargs)
+
+
+def test_verifies_and_caches_the_credential(dev_issuer, fetcher, credential):
+    verifier = _verifier(dev_issuer, fetcher)
+    assert verifier.verify(credential).disclosed_geoids == GEOIDS
+    verifier.verify(credential)
+    assert len(verifier.grants) == 1
+    assert fetcher.requests == 1  # status list still fresh
+
+
+def test_untrusted_kid_rejected(dev_issuer, fetcher, credential):
+    with pytest.raises(VerificationError, match="untrusted issuer key"):
+        Verifier({"other-kid": dev_issuer.public_key_pem}, fetcher=fetcher).verify(credential)
+
+
+def test_revocation_seen_after_conditional_refresh(dev_issuer, fetcher, credential):
+    clock = Clock()
+    verifier = _verifier(dev_issuer, fetcher, status_ttl=60, clock=clock)
+    verifier.verify(credential)
+
+    clock.now += 61
+    verifier.verify(credential)  # 304: same version, served from the cached list
+    assert fetcher.requests == 2
+
+    revoked = StatusList(size=64)
+    revoked.set(5)
+    fetcher.publish(URI, _document(revoked, version=1))
+    verifier.verify(credential)  # still fresh, not refetched
+    clock.now += 61
+    with pytest.raises(VerificationError, match="credential revoked"):
+        verifier.verify(credential)
+
+
+def test_targeted_verification_requires_coverage(dev_issuer, fetcher, credential):
+    verifier = _verifier(dev_issuer, fetcher)
+    assert verifier.verify(credential, geoids=["geo-b"]).disclosed_geoids == ["geo-b"]
+    with pytest.raises(VerificationError, match="does not cover GeoID"):
+        verifier.verify(credential, geoids=["geo-z"])
+
+
+def test_empty_geoid_scope_is_not_a_full_verification(dev_issuer, fetcher, credential):
+    verifier = _verifier(dev_issuer, fetcher)
+    assert verifier.verify(credential, geoids=[]).disclosed_geoids == []
+    assert verifier.verify(credential).disclosed_geoids == GEOIDS
+    assert len(verifier.grants) == 2
+
+
+def test_clock_drives_credential_and_cache_expiry(dev_issuer, fetcher, credential):
+    clock = Clock()
+    verifier = _verifier(dev_issuer, fetcher, clock=clock)
+    verifier.verify(credential)
+    clock.now += 7200  # past exp, though the cached verification has not been evicted
+    with pytest.raises(VerificationError, match="expired"):
+        verifier.verify(credential)
+    with pytest.raises(VerificationError, match="expired"):
+        _verifier(dev_issuer, fetcher, clock=clock).verify(credential)
+
+
+def test_fails_closed_once_stale_list_is_too_old(dev_issuer, credential):
+    class Flaky(StaticFetcher):
+        down = False
+
+        def __call__(self, uri, etag=None):
+            if self.down:
+                raise FetchError("offline")
+            return super().__call__(uri, etag)
+
+    fetcher = Flaky({URI: _document(StatusList(size=64))})
+    clock = Clock()
+    verifier = _verifier(dev_issuer, fetcher, status_ttl=60, max_stale=600, clock=clock)
+    verifier.verify(credential)
+
+    fetcher.down = True
+    clock.now += 300
+    verifier.verify(credential)  # stale copy within max_stale
+    clock.now += 301
+    with pytest.raises(VerificationError, match="status list unavailable"):
+        verifier.verify(credential)
+
+
+def test_concurrent_callers_share_one_status_list_fetch(dev_issuer, fetcher, credential):
+    verifier = _verifier(dev_issuer, fetcher)
+    errors = []
+
+    def run():
+        try:
+            for _ in range(20):
+                verifier.verify(credential)
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert fetcher.requests == 1
+
+
+def test_http_fetcher_against_service_status_list(client, owner_headers, fieldlist, dev_issuer):
+    issued = client.post(
+        "/grants/issue",
+        json={
+            "list_id": fieldlist["list_id"],
+            "grantee_account": "hub-acct-buyer",
+            "purpose": "eudr-due-diligence",
+            "validity_days": 30,
+        },
+        headers=owner_headers,
+    ).json()
+    clock = Clock()
+    verifier = _verifier(dev_issuer, HttpFetcher(client), clock=clock)
+    verifier.verify(issued["credential"])
+
+    client.post("/grants/revoke", json={"jti": issued["jti"]}, headers=owner_headers)
+    clock.now += 3600
+    with pytest.raises(VerificationError, match="credential revoked"):
+        verifier.verify(issued["credential"])